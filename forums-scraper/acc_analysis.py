@@ -10,6 +10,7 @@ Usage:
 
 Requirements:
     pip install pandas matplotlib seaborn
+    pip install pyarrow  # optional, to read Parquet/Feather exports
 """
 
 import pandas as pd
@@ -20,6 +21,8 @@ from datetime import datetime
 from pathlib import Path
 import re
 
+from forum_columnar import is_columnar, read_columnar
+
 
 # Topic categories for classification
 TOPIC_KEYWORDS = {
@@ -56,12 +59,28 @@ PAIN_PATTERNS = {
 }
 
 
-def load_data(filepath: str) -> pd.DataFrame:
-    """Load and preprocess the CSV data."""
-    df = pd.read_csv(filepath)
-    
-    # Parse dates
-    df['post_date'] = pd.to_datetime(df['post_date'])
+def load_data(filepath: str, since: str = None, columns: list = None) -> pd.DataFrame:
+    """
+    Load and preprocess the scraped data.
+    
+    CSV is parsed in full; Parquet/Feather exports (files or partitioned
+    directories) are read with their stored types, and ``since``/``columns``
+    are pushed down so only the needed row groups and columns are read.
+    """
+    if Path(filepath).is_dir() or is_columnar(filepath):
+        filters = [('post_date', '>=', pd.Timestamp(since, tz='UTC'))] if since else None
+        df = read_columnar(filepath, columns=columns, filters=filters)
+    else:
+        df = pd.read_csv(filepath, usecols=columns)
+        # Offsets differ across DST, so normalize to UTC like the columnar schema
+        df['post_date'] = pd.to_datetime(df['post_date'], utc=True)
+        if since:
+            df = df[df['post_date'] >= pd.Timestamp(since, tz='UTC')]
+    
+    # Analysis works on naive UTC timestamps
+    df['post_date'] = df['post_date'].dt.tz_convert(None)
+    
+    # Derived date columns
     df['year'] = df['post_date'].dt.year
     df['year_month'] = df['post_date'].dt.to_period('M')
     
@@ -188,7 +207,7 @@ def get_keyword_frequency(df: pd.DataFrame, top_n: int = 30) -> dict:
 
 def analyze_japanese_market(df: pd.DataFrame) -> dict:
     """Analyze Japanese language submissions."""
-    jp_pattern = r'[\u3000-\u9fff]'
+    jp_pattern = '[\u3000-\u9fff]'  # real characters: pyarrow's regex engine has no \u escapes
     jp_ideas = df[df['title'].str.contains(jp_pattern, regex=True, na=False)]
     
     jp_dates = jp_ideas['post_date'].dt.strftime('%Y-%m-%d').value_counts().head(5).to_dict()
@@ -199,10 +218,10 @@ def analyze_japanese_market(df: pd.DataFrame) -> dict:
     }
 
 
-def run_full_analysis(input_path: str, output_dir: str = None) -> dict:
+def run_full_analysis(input_path: str, output_dir: str = None, since: str = None) -> dict:
     """Run complete analysis and optionally save results."""
     print(f"Loading data from {input_path}...")
-    df = load_data(input_path)
+    df = load_data(input_path, since=since)
     
     print(f"Analyzing {len(df)} ideas...")
     
@@ -284,13 +303,15 @@ def print_summary(results: dict):
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Analyze ACC Forum Ideas')
-    parser.add_argument('--input', '-i', required=True, help='Input CSV file path')
+    parser.add_argument('--input', '-i', required=True,
+                        help='Input CSV, or Parquet/Feather export (file or partitioned directory)')
+    parser.add_argument('--since', help='Only ideas posted on or after this date (YYYY-MM-DD)')
     parser.add_argument('--output', '-o', help='Output directory for results')
     parser.add_argument('--quiet', '-q', action='store_true', help='Suppress summary output')
     
     args = parser.parse_args()
     
-    results = run_full_analysis(args.input, args.output)
+    results = run_full_analysis(args.input, args.output, since=args.since)
     
     if not args.quiet:
         print_summary(results)
@@ -8,6 +8,8 @@ import requests
 from urllib.parse import quote
 import json
 
+from forum_html import html_to_text
+
 API_URL = "https://forums.autodesk.com/api/2.0/search"
 BOARD_ID = "acc-ideas-en"
 
@@ -49,8 +51,7 @@ for i, idea in enumerate(result['data']['items'], 1):
     print(f"   URL: {idea['view_href']}")
     
     # Show first 200 chars of body (strip HTML for readability)
-    import re, html
-    body = html.unescape(re.sub(r'<[^>]+>', '', idea.get('body', '')))[:200]
+    body = html_to_text(idea.get('body', ''))[:200]
     print(f"   Body: {body}...")
 
 
@@ -75,7 +76,7 @@ replies_result = liql(f"""
 for reply in replies_result['data']['items']:
     author = reply.get('author', {}).get('login', 'Unknown')
     kudos = reply.get('kudos', {}).get('sum', {}).get('weight', 0)
-    body = html.unescape(re.sub(r'<[^>]+>', '', reply.get('body', '')))[:150]
+    body = html_to_text(reply.get('body', ''))[:150]
     print(f"\n  [{author}] (+{kudos} kudos)")
     print(f"  {body}...")
 
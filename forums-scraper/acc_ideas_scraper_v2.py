@@ -10,41 +10,108 @@ Features:
 - Full message body content
 - Fetch first N replies per idea
 - Filter by reply count (min/max)
-- Export to JSON/CSV
+- Deadline / request budget: list everything first, then enrich the most voted ideas
+- Export to JSON/JSON Lines/CSV (optionally gzip/zstd compressed), or typed Parquet/Feather (needs pyarrow)
+- Responses decoded into declared types (forum_schema; fastest with msgspec)
+- Optional on-disk response cache (--cache): off by default, so a run always sees the live board
 
 Author: For RAPS Marketing research
 """
 
 import requests
-import json
 import time
-import csv
 import argparse
-import html
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Optional, Iterator, List, Dict, Any, Callable
+from typing import Optional, Iterable, Iterator, List, Dict, Any, Callable, Mapping
 from urllib.parse import quote
 
-from bs4 import BeautifulSoup
-
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from forum_budget import Budget, BudgetExhausted, PriorityScheduler, parse_duration
+from forum_checkpoint import CheckpointMismatch, CrawlCheckpoint
+from forum_cache import DEFAULT_CACHE_PATH, ResponseCache, classify_liql, liql_key
+from forum_html import html_to_text
+from forum_metrics import RequestMetrics
+from forum_columnar import PARTITION_KEYS, ColumnarSink, idea_schema, is_columnar, require_pyarrow
+from forum_paging import MAX_PAGE_SIZE, PageSizer, is_page_timeout
+from forum_transport import PAGE_TIMEOUT_STATUSES
+from forum_pipeline import WriteBehindSink, map_stage, prefetch
+from forum_projections import PROFILES, Projection, label_texts
+from forum_records import idea_store
+from forum_schema import CountResponse, Message, MessageResponse, Reply, ReplyResponse, response_status
+from forum_sinks import CsvSink, RunningStats, open_sink, read_records, require_zstandard
+from forum_ratelimit import RateLimiter, default_state_path, parse_retry_after
+
 # Configuration
 BASE_URL = "https://forums.autodesk.com/api/2.0/search"
 BOARD_ID = "acc-ideas-en"
 OUTPUT_DIR = Path("acc_ideas_data")
-BATCH_SIZE = 100  # Max 100 per request
-DELAY_BETWEEN_REQUESTS = 0.5  # seconds
+BATCH_SIZE = 100  # ideas per request (listings: the first page's, with --adaptive-pages)
+IDEA_FIELDS = [
+    "id",
+    "subject",
+    "body",
+    "view_href",
+    "post_time",
+    "author.login",
+    "author.id",
+    "kudos.sum(weight)",
+    "metrics.views",
+    "conversation.messages_count",
+    "conversation.id",
+    "status.key",
+    "status.name",
+    "labels",
+]
+# Output column -> the IDEA_FIELDS field it is read from (selected by the --profile projection)
+IDEA_COLUMNS = {
+    "id": "id",
+    "title": "subject",
+    "body_html": "body",
+    "body_text": "body",
+    "url": "view_href",
+    "post_date": "post_time",
+    "author_username": "author.login",
+    "author_id": "author.id",
+    "kudos": "kudos.sum(weight)",
+    "views": "metrics.views",
+    "reply_count": "conversation.messages_count",
+    "status_key": "status.key",
+    "status_name": "status.name",
+    "conversation_id": "conversation.id",
+    "labels": "labels",
+}
+DEFAULT_PROFILE = "full"  # everything but labels
+# Cheap sweep used to detect which ideas changed since a previous snapshot
+METADATA_FIELDS = [
+    "id",
+    "kudos.sum(weight)",
+    "metrics.views",
+    "conversation.messages_count",
+    "status.key",
+]
+REPLY_PARENTS_PER_QUERY = 100  # idea ids per `parent.id IN (...)` reply query
+REQUESTS_PER_SECOND = 2.0  # sustained rate, shared with other scraper processes
+BURST = 4  # requests allowed back-to-back after idling
+MAX_THROTTLE_RETRIES = 5  # attempts per query while the API keeps answering 429
+REQUEST_TIMEOUT = 30  # seconds per HTTP request
 
 
 class KhorosApiError(RuntimeError):
     """Raised when the Khoros API returns a non-success status payload."""
 
 
-def create_session() -> requests.Session:
-    """Create a requests Session with retries/backoff for common transient errors."""
+def create_session(retry_timeouts: bool = True) -> requests.Session:
+    """Create a requests Session with retries/backoff for common transient errors.
+    
+    ``retry_timeouts=False`` leaves read timeouts and 502/504 to the caller (adaptive
+    listing pages are re-requested smaller instead).
+    """
     session = requests.Session()
     session.headers.update(
         {
@@ -57,12 +124,14 @@ def create_session() -> requests.Session:
     retry = Retry(
         total=6,
         connect=6,
-        read=6,
+        read=6 if retry_timeouts else 0,
         status=6,
         backoff_factor=0.8,
-        status_forcelist=(429, 500, 502, 503, 504),
+        # 429/Retry-After is handled by the rate limiter so every process backs off together
+        status_forcelist=tuple(code for code in (500, 502, 503, 504)
+                               if retry_timeouts or code not in PAGE_TIMEOUT_STATUSES),
         allowed_methods=("GET",),
-        respect_retry_after_header=True,
+        respect_retry_after_header=False,
         raise_on_status=False,
     )
 
@@ -73,129 +142,327 @@ def create_session() -> requests.Session:
 
 
 SESSION = create_session()
+PAGE_SESSION = create_session(retry_timeouts=False)  # listing pages that can still shrink
+LIMITER = RateLimiter(rate=REQUESTS_PER_SECOND, burst=BURST, state_path=default_state_path(BASE_URL))
+CACHE: Optional[ResponseCache] = None  # enabled by configure_cache() / the CLI
+BUDGET: Optional[Budget] = None  # set by configure_budget() / --deadline, --max-requests
+ADAPTIVE_PAGES = False  # set by configure_paging() / --adaptive-pages
+METRICS = RequestMetrics("acc_ideas_scraper")
+PROJECTION = Projection(DEFAULT_PROFILE, IDEA_FIELDS)  # replaced by configure_profile() / --profile
+
+
+def configure_rate_limit(rate: float, burst: int, state_path: Optional[str] = None):
+    """Replace the module rate limiter (e.g. from CLI flags)."""
+    global LIMITER
+    LIMITER = RateLimiter(rate=rate, burst=burst, state_path=state_path or None)
+
+
+def configure_base_url(base_url: str):
+    """Query another Khoros site (e.g. a local forum_stub_server) instead of forums.autodesk.com."""
+    global BASE_URL
+    BASE_URL = f"{base_url.rstrip('/')}/api/2.0/search"
+
+
+def configure_profile(profile: str):
+    """Select and normalize only the fields of ``profile`` (see forum_projections.PROFILES)."""
+    global PROJECTION
+    PROJECTION = Projection(profile, IDEA_FIELDS)
 
 
-def liql_query(query: str) -> dict:
-    """Execute a LiQL query against the Khoros API."""
+def configure_cache(path: Optional[str] = str(DEFAULT_CACHE_PATH), refresh: bool = False):
+    """Enable (path) or disable (None) the on-disk response cache for liql_query."""
+    global CACHE
+    CACHE = ResponseCache(path, refresh=refresh) if path else None
+
+
+def configure_paging(adaptive: bool):
+    """Size listing pages by observed response time and payload (forum_paging) instead of BATCH_SIZE."""
+    global ADAPTIVE_PAGES
+    ADAPTIVE_PAGES = adaptive
+
+
+def listing_sizer() -> PageSizer:
+    """Page sizer for one kudos-ordered listing (fixed at BATCH_SIZE unless adaptive)."""
+    if ADAPTIVE_PAGES:
+        return PageSizer(BATCH_SIZE, maximum=MAX_PAGE_SIZE, metrics=METRICS)
+    return PageSizer.fixed(BATCH_SIZE, metrics=METRICS)
+
+
+def configure_budget(deadline: Optional[float] = None, max_requests: Optional[int] = None) -> Optional[Budget]:
+    """Cap the HTTP requests sent from now on (None, None = unlimited); cached answers are free."""
+    global BUDGET
+    BUDGET = Budget(deadline, max_requests) if deadline or max_requests else None
+    return BUDGET
+
+
+def _download(query: str, schema: Optional[type] = None,
+              on_response: Optional[Callable[[requests.Response], None]] = None,
+              retry_timeouts: bool = True) -> tuple:
+    """Send one LiQL query; (raw body, body decoded into ``schema``) of a successful response,
+    which is also handed to ``on_response``. ``retry_timeouts=False`` sends it without
+    retrying read timeouts and 502/504."""
+    session = SESSION if retry_timeouts else PAGE_SESSION
     url = f"{BASE_URL}?q={quote(query)}"
+    kind = classify_liql(query)
 
-    response = SESSION.get(url, timeout=30)
+    for attempt in range(MAX_THROTTLE_RETRIES):
+        if attempt:
+            METRICS.observe_retry(kind)
+        if BUDGET:
+            BUDGET.charge()
+        METRICS.observe_wait(kind, LIMITER.acquire())
+        started = time.perf_counter()
+        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        METRICS.observe_response(kind, response, time.perf_counter() - started)
+        if response.status_code != 429:
+            LIMITER.reward()
+            break
+        LIMITER.penalize(parse_retry_after(response.headers.get("Retry-After")))
     response.raise_for_status()
 
-    data = response.json()
-    if data.get("status") != "success":
+    data = METRICS.decode(kind, response.content, schema)
+    status, message = response_status(data)
+    if status != "success":
         raise KhorosApiError(
-            f"API error: {data.get('message', 'Unknown error')} (query={query[:200]!r})"
+            f"API error: {message or 'Unknown error'} (query={query[:200]!r})"
         )
+    if on_response:
+        on_response(response)
 
-    return data
+    return response.content, data
+
+
+def liql_query(query: str, cacheable: bool = True, schema: Optional[type] = None,
+               on_response: Optional[Callable[[requests.Response], None]] = None,
+               retry_timeouts: bool = True) -> Any:
+    """Execute a LiQL query against the Khoros API.
+
+    The response is decoded into ``schema`` (a forum_schema response type; plain
+    JSON if None) - a field of the wrong type raises ``SchemaError``.
+    ``cacheable=False`` bypasses the response cache (for change detection).
+    ``on_response`` gets the HTTP response (not called when served from the cache).
+    ``retry_timeouts=False`` raises a read timeout or 502/504 at once and leaves
+    counting it as an error to the caller (adaptive listing pages shrink instead).
+    """
+    kind = classify_liql(query)
+    downloaded = []
+    
+    def download() -> bytes:
+        body, data = _download(query, schema, on_response, retry_timeouts)
+        downloaded.append(data)
+        return body
+    
+    try:
+        if CACHE is None or not cacheable:
+            download()
+        else:
+            body = CACHE.fetch(liql_key(query), kind, download)
+            if not downloaded:  # served from the cache
+                downloaded.append(METRICS.decode(kind, body, schema))
+    except BudgetExhausted:
+        raise  # nothing was sent
+    except Exception as e:
+        if retry_timeouts or not is_page_timeout(e):
+            METRICS.observe_error(kind)
+        raise
+    return downloaded[0]
 
 
 def strip_html(html_content: str) -> str:
     """Convert Khoros HTML content to readable plain text.
 
-    Uses BeautifulSoup for correctness (nested tags, lists, links, etc.).
+    Uses the shared streaming converter (forum_html): block elements on their
+    own lines, script/style dropped, entities unescaped.
     """
     if not html_content:
         return ""
 
-    # Khoros content is HTML; unescape first so soup sees real characters.
-    decoded = html.unescape(html_content)
-    soup = BeautifulSoup(decoded, "lxml")
-
-    # Remove non-content elements
-    for tag in soup(["script", "style"]):
-        tag.decompose()
-
-    # Improve line breaks for common block elements
-    for br in soup.find_all("br"):
-        br.replace_with("\n")
-    for p in soup.find_all("p"):
-        # Ensure paragraphs separate
-        if p.contents:
-            p.append("\n")
-
-    text = soup.get_text(separator=" ")
-    # Normalize whitespace a bit (keep it readable, not perfect)
-    text = " ".join(text.split())
-    return text.strip()
+    # The parser decodes entities itself; unescaping first would decode them twice.
+    return html_to_text(html_content)
 
 
 def get_total_count() -> int:
     """Get total count of ideas in the board."""
     query = f"SELECT count(*) FROM messages WHERE board.id = '{BOARD_ID}' AND depth = 0"
-    result = liql_query(query)
-    return result["data"]["count"]
+    result = liql_query(query, schema=CountResponse)
+    return result.data.count
 
 
-def fetch_replies(message_id: Optional[str], limit: int = 10) -> List[dict]:
-    """Fetch replies for a specific idea using parent.id."""
+def normalize_reply(item: Reply) -> dict:
+    """Convert a raw reply item to the reply dict stored under idea["replies"]."""
+    return {
+        "id": item.id,
+        "author": item.author.login,
+        "author_id": item.author.id,
+        "body_html": item.body,
+        "body_text": strip_html(item.body),
+        "post_time": item.post_time,
+        "kudos": item.kudos.sum.weight,
+    }
+
+
+def fetch_replies(message_id: Optional[str], limit: int = 10, cacheable: bool = True) -> List[dict]:
+    """Fetch the first ``limit`` replies (oldest first) for a specific idea using parent.id."""
     if not message_id:
         return []
     query = f"""
         SELECT id, body, post_time, author.login, author.id, kudos.sum(weight)
         FROM messages 
         WHERE parent.id = '{message_id}'
+        ORDER BY post_time ASC
         LIMIT {limit}
     """
     
-    result = liql_query(query.strip())
-    replies = []
+    result = liql_query(query.strip(), cacheable=cacheable, schema=ReplyResponse)
+    return [normalize_reply(item) for item in result.data.items]
+
+
+def fetch_replies_batch(
+    expected: Dict[str, int],
+    limit: int = 10,
+    cacheable: bool = True,
+    replies: Optional[Dict[str, List[dict]]] = None,
+    complete: Optional[set] = None,
+) -> Dict[str, List[dict]]:
+    """
+    Fetch up to ``limit`` replies for many ideas with `parent.id IN (...)` queries.
+
+    Replies come oldest first, like fetch_replies, so both return the same ones.
+    An idea is done once it has its share, or once a page arrives without its
+    replies after earlier pages had some (its count from messages_count also
+    includes nested replies, so the share may never be reached); pagination of
+    a chunk stops when every idea in it is done.
+
+    Args:
+        expected: Map of idea id -> known reply count (from conversation.messages_count);
+            ideas with no replies are skipped
+        limit: Maximum replies kept per idea
+        cacheable: False to bypass the response cache
+        replies: Optional dict filled in place (keeps what was fetched if a
+            request raises, e.g. BudgetExhausted)
+        complete: Optional set filled with the ids of ideas that are done
+
+    Returns:
+        Map of idea id -> list of reply dicts (same shape as fetch_replies)
+    """
+    replies = replies if replies is not None else {}
+    replies.update((message_id, []) for message_id in expected)
+    complete = complete if complete is not None else set()
+    wanted = {message_id: min(count, limit) for message_id, count in expected.items() if count > 0}
+    complete.update(message_id for message_id in expected if message_id not in wanted)
     
-    for item in result["data"].get("items", []):
-        replies.append({
-            "id": item.get("id"),
-            "author": item.get("author", {}).get("login"),
-            "author_id": item.get("author", {}).get("id"),
-            "body_html": item.get("body", ""),
-            "body_text": strip_html(item.get("body", "")),
-            "post_time": item.get("post_time"),
-            "kudos": item.get("kudos", {}).get("sum", {}).get("weight", 0),
-        })
+    parent_ids = list(wanted)
+    for start in range(0, len(parent_ids), REPLY_PARENTS_PER_QUERY):
+        chunk = parent_ids[start:start + REPLY_PARENTS_PER_QUERY]
+        id_list = ", ".join(f"'{message_id}'" for message_id in chunk)
+        pending = set(chunk)
+        seen: set = set()
+        cursor = None
+        
+        while True:
+            query = f"""
+                SELECT id, parent.id, body, post_time, author.login, author.id, kudos.sum(weight)
+                FROM messages 
+                WHERE parent.id IN ({id_list})
+                ORDER BY post_time ASC
+                LIMIT {BATCH_SIZE}
+            """
+            if cursor:
+                query += f" CURSOR '{cursor}'"
+            
+            result = liql_query(query.strip(), cacheable=cacheable, schema=ReplyResponse)
+            
+            on_page = set()
+            for item in result.data.items:
+                on_page.add(item.parent.id)
+                bucket = replies.get(item.parent.id)
+                if bucket is not None and len(bucket) < limit:
+                    bucket.append(normalize_reply(item))
+            
+            cursor = result.data.next_cursor
+            remaining = {message_id for message_id in pending
+                         if cursor and len(replies[message_id]) < wanted[message_id]
+                         and (message_id in on_page or message_id not in seen)}
+            complete.update(pending - remaining)
+            pending = remaining
+            seen |= on_page
+            if not pending:
+                break
     
     return replies
 
 
 def fetch_ideas_batch(
     cursor: Optional[str] = None,
-    limit: int = BATCH_SIZE,
-) -> tuple[list[dict], Optional[str]]:
-    """Fetch a batch of ideas ordered by kudos."""
-    
-    fields = [
-        "id",
-        "subject",
-        "body",
-        "view_href",
-        "post_time",
-        "author.login",
-        "author.id",
-        "kudos.sum(weight)",
-        "metrics.views",
-        "conversation.messages_count",
-        "conversation.id",
-        "status.key",
-        "status.name",
-        "labels",
-    ]
+    limit: Optional[int] = BATCH_SIZE,
+    fields: Optional[List[str]] = None,
+    cacheable: bool = True,
+    sizer: Optional[PageSizer] = None,
+) -> tuple[tuple[Message, ...], Optional[str]]:
+    """Fetch a batch of ideas ordered by kudos (the PROJECTION fields unless ``fields`` given).
     
-    query = f"""
-        SELECT {', '.join(fields)} 
-        FROM messages 
-        WHERE board.id = '{BOARD_ID}' AND depth = 0
-        ORDER BY kudos.sum(weight) DESC
-        LIMIT {limit}
+    With a ``sizer`` the page holds as many ideas as it picks (at most ``limit``;
+    None = no cap): a page that times out is requested again from the same cursor
+    with a smaller LIMIT, and each response's time and size set the next page's.
     """
     
-    if cursor:
-        query += f" CURSOR '{cursor}'"
+    fields = fields or PROJECTION.fields
+    responses: List[requests.Response] = []
     
-    result = liql_query(query.strip())
-    
-    items = result["data"].get("items", [])
-    next_cursor = result["data"].get("next_cursor")
+    while True:
+        page_size = sizer.next_size(limit) if sizer else limit
+        query = f"""
+            SELECT {', '.join(fields)} 
+            FROM messages 
+            WHERE board.id = '{BOARD_ID}' AND depth = 0
+            ORDER BY kudos.sum(weight) DESC
+            LIMIT {page_size}
+        """
+        
+        if cursor:
+            query += f" CURSOR '{cursor}'"
+        
+        # Timeouts of a page that can still shrink aren't retried at the same size
+        shrinkable = sizer is not None and sizer.can_shrink
+        try:
+            result = liql_query(query.strip(), cacheable=cacheable, schema=MessageResponse,
+                                on_response=responses.append, retry_timeouts=not shrinkable)
+        except requests.RequestException as e:
+            if shrinkable and is_page_timeout(e):
+                sizer.shrink()
+                continue  # same cursor, smaller page
+            raise
+        break
     
-    return items, next_cursor
+    if sizer:
+        sizer.observe_response(len(result.data.items), responses[-1] if responses else None)
+    return result.data.items, result.data.next_cursor
+
+
+def fetch_ideas_by_ids(ids: List[str], cacheable: bool = True,
+                       fields: Optional[List[str]] = None) -> List[Message]:
+    """Fetch the PROJECTION fields (or ``fields``) of specific ideas with `id IN (...)` queries."""
+    fields = fields or PROJECTION.fields
+    items = []
+    for start in range(0, len(ids), BATCH_SIZE):
+        chunk = ids[start:start + BATCH_SIZE]
+        id_list = ", ".join(f"'{message_id}'" for message_id in chunk)
+        query = f"""
+            SELECT {', '.join(fields)}
+            FROM messages
+            WHERE id IN ({id_list})
+            LIMIT {len(chunk)}
+        """
+        result = liql_query(query.strip(), cacheable=cacheable, schema=MessageResponse)
+        items.extend(result.data.items)
+    return items
+
+
+def normalize_page(page: tuple, projection: Optional[Projection] = None) -> tuple:
+    """normalize_idea over a (raw items, raw count, next cursor) page - the unit
+    handed to worker processes (which get ``projection`` passed, not the global)."""
+    items, raw_count, next_cursor = page
+    return [normalize_idea(item, projection) for item in items], raw_count, next_cursor
 
 
 def fetch_all_ideas(
@@ -203,7 +470,13 @@ def fetch_all_ideas(
     min_replies: Optional[int] = None,
     max_replies: Optional[int] = None,
     include_replies: int = 0,
-    progress_callback: Optional[Callable[[int, int], None]] = None
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    batch_replies: bool = False,
+    checkpoint: Optional[CrawlCheckpoint] = None,
+    pipeline: bool = False,
+    workers: Optional[int] = None,
+    profile: Optional[str] = None,
+    total: Optional[int] = None,
 ) -> Iterator[dict]:
     """
     Generator that yields all ideas ordered by kudos (most voted first).
@@ -214,118 +487,474 @@ def fetch_all_ideas(
         max_replies: Maximum number of replies allowed (client-side filter)
         include_replies: Number of replies to fetch per idea (0 = none)
         progress_callback: Optional callback(fetched, total) for progress
+        batch_replies: Fetch replies for a whole page of ideas with
+            `parent.id IN (...)` queries instead of one query per idea
+        checkpoint: Started/resumed CrawlCheckpoint; records already in it are
+            yielded first and the crawl continues from its last committed cursor
+        pipeline: Overlap the stages - the next listing page is requested while
+            the current one is parsed, HTML is converted in ``workers`` processes
+            and replies are fetched on their own thread
+        workers: Processes for HTML conversion when pipelining (default: CPU count)
+        profile: Field profile to select and normalize (default: the module PROJECTION)
+        total: Ideas in the board, if the caller already counted them (saves a request)
     
     Note: Reply filtering is done client-side since LiQL doesn't support
     filtering by conversation.messages_count in WHERE clauses.
     """
-    total = get_total_count()
+    total = total if total is not None else get_total_count()
+    projection = Projection(profile, IDEA_FIELDS) if profile else PROJECTION
+    normalize = partial(normalize_page, projection=projection)
+    
+    cursor = None
+    fetched = 0
+    yielded = 0
+    done_ids: set = set()
+    
+    if checkpoint:
+        for idea in checkpoint.iter_restored():
+            yield idea
+            yielded += 1
+        cursor, fetched, done_ids = checkpoint.cursor, checkpoint.fetched, set(checkpoint.done_ids)
+        if checkpoint.finished:
+            return
+    
+    filtered = min_replies is not None or max_replies is not None
+    restored = yielded
+    
+    def listing_pages():
+        """(raw items, next cursor) per API page."""
+        page_cursor, wanted = cursor, restored
+        sizer = listing_sizer()
+        while True:
+            items, next_cursor = fetch_ideas_batch(
+                cursor=page_cursor,
+                limit=max_ideas - wanted if max_ideas and not filtered else None,
+                fields=projection.fields,
+                sizer=sizer,
+            )
+            yield items, next_cursor
+            wanted += sum(1 for item in items if item.id not in done_ids)
+            if not next_cursor or not items:
+                return
+            if max_ideas and not filtered and wanted >= max_ideas:
+                return  # don't prefetch pages nobody will read
+            page_cursor = next_cursor
+    
+    def selected_pages():
+        """Apply resume/limit/reply-count filters to the raw items of each page."""
+        selected = restored
+        for items, next_cursor in pages:
+            keep = []
+            for item in items:
+                if max_ideas and selected + len(keep) >= max_ideas:
+                    break
+                if item.id in done_ids:
+                    continue  # produced before an interrupted run stopped mid-page
+                
+                # Client-side filtering by reply count
+                if min_replies is not None and item.reply_count < min_replies:
+                    continue
+                if max_replies is not None and item.reply_count > max_replies:
+                    continue
+                keep.append(item)
+            selected += len(keep)
+            yield keep, len(items), next_cursor
+    
+    def with_replies(normalized: tuple) -> tuple:
+        """Attach the first ``include_replies`` replies to each idea of a page."""
+        page = normalized[0]
+        if include_replies > 0 and batch_replies:
+            by_parent = fetch_replies_batch(
+                {idea["id"]: idea["reply_count"] for idea in page if idea["id"]},
+                limit=include_replies,
+            )
+            for idea in page:
+                idea["replies"] = by_parent.get(idea["id"], [])
+        elif include_replies > 0:
+            for idea in page:
+                idea["replies"] = fetch_replies(idea["id"], limit=include_replies)
+        return normalized
+    
+    if max_ideas and yielded >= max_ideas:
+        return
+    
+    pool = ProcessPoolExecutor(max_workers=workers) if pipeline else None
+    reply_threads = ThreadPoolExecutor(max_workers=2) if pipeline else None
+    pages = stages = None  # still None if building the stages fails
+    try:
+        if pipeline:
+            # listing pages (thread, 2 ahead) -> HTML to text (processes)
+            # -> replies (2 pages at a time) -> consumer; each stage keeps its order
+            pages = prefetch(listing_pages(), depth=2)
+            normalized = map_stage(normalize, selected_pages(), pool, depth=4)
+            stages = map_stage(with_replies, normalized, reply_threads, depth=2)
+        else:
+            pages = listing_pages()
+            stages = map(with_replies, map(normalize, selected_pages()))
+        
+        for page, raw_count, next_cursor in stages:
+            for idea in page:
+                if checkpoint:
+                    checkpoint.record(idea)
+                yield idea
+                yielded += 1
+            
+            fetched += raw_count
+            if checkpoint:
+                checkpoint.commit(next_cursor if raw_count else None, fetched=raw_count)
+            
+            if progress_callback:
+                # Show progress based on total fetched (not yielded, since we filter)
+                progress_callback(fetched, total)
+            
+            if max_ideas and yielded >= max_ideas:
+                break
+    finally:
+        if pool:
+            # Stop the prefetch thread and drop queued work when the consumer quits early
+            try:
+                for stage in (stages, pages):
+                    if stage is not None:
+                        stage.close()
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+                reply_threads.shutdown(wait=False, cancel_futures=True)
+
+
+def normalize_idea(raw: Message, projection: Optional[Projection] = None) -> dict:
+    """Convert raw API response to clean data structure.
+    
+    Only the columns whose field ``projection`` (default: PROJECTION) selects
+    are included, and bodies are only converted when they were selected.
+    """
+    projection = projection or PROJECTION
+    body = raw.body if projection.has("body") else ""
+    
+    idea = {
+        "id": raw.id,
+        "title": raw.subject,
+        "body_html": body,
+        "body_text": strip_html(body),
+        "url": raw.view_href,
+        "post_date": raw.post_time,
+        "author_username": raw.author.login,
+        "author_id": raw.author.id,
+        "kudos": raw.kudos.sum.weight,
+        "views": raw.metrics.views,
+        "reply_count": raw.reply_count,
+        "status_key": raw.status.key,
+        "status_name": raw.status.name,
+        "conversation_id": raw.conversation.id,
+        "labels": label_texts(raw),
+    }
+    return {column: idea[column] for column, field in IDEA_COLUMNS.items() if projection.has(field)}
+
+
+def idea_fingerprint(idea: dict) -> tuple:
+    """Change-detection key of a normalized idea (what the metadata sweep can see)."""
+    return (idea.get("kudos", 0), idea.get("views", 0), idea.get("reply_count", 0), idea.get("status_key"))
+
+
+def raw_fingerprint(raw: Message) -> tuple:
+    """idea_fingerprint() computed from a METADATA_FIELDS item."""
+    return (raw.kudos.sum.weight, raw.metrics.views, raw.reply_count, raw.status.key)
+
+
+def load_snapshot(path: str) -> Mapping[str, dict]:
+    """
+    Load a previous save_to_json() output (.json or .jsonl, optionally .gz/.zst)
+    as a read-only {idea id: idea} mapping.
+    
+    Ideas are held column-wise (forum_records) rather than as one dict each, so a
+    large snapshot stays small for the whole refresh; each lookup builds a new dict.
+    """
+    store = idea_store(to_text=strip_html)
+    store.extend(read_records(path))
+    return store.keyed("id")
+
+
+def refresh_changed_ideas(
+    previous: Mapping[str, dict],
+    max_ideas: Optional[int] = None,
+    min_replies: Optional[int] = None,
+    max_replies: Optional[int] = None,
+    include_replies: int = 0,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    batch_replies: bool = False,
+    stats: Optional[Dict[str, int]] = None,
+    total: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Two-phase refresh against a previous snapshot, yielding ideas ordered by kudos.
+    
+    Phase 1 sweeps the board with METADATA_FIELDS only. Phase 2 (per page) re-fetches
+    body, status details and replies just for ideas whose fingerprint changed or that
+    are new; unchanged ideas are carried over from ``previous``.
+    
+    Args:
+        previous: Snapshot from load_snapshot()
+        stats: Optional dict filled with 'unchanged', 'changed' and 'new' counts
+        (other args as in fetch_all_ideas)
+    """
+    stats = stats if stats is not None else {}
+    stats.update(unchanged=0, changed=0, new=0)
+    total = total if total is not None else get_total_count()
     
     cursor = None
     fetched = 0
     yielded = 0
+    filtered = min_replies is not None or max_replies is not None
+    sizer = listing_sizer()
     
     while True:
         if max_ideas and yielded >= max_ideas:
             break
         
-        items, cursor = fetch_ideas_batch(cursor=cursor, limit=BATCH_SIZE)
+        # Phase 1: metadata only, always fresh
+        items, cursor = fetch_ideas_batch(cursor=cursor,
+                                          limit=max_ideas - yielded if max_ideas and not filtered else None,
+                                          fields=METADATA_FIELDS, cacheable=False, sizer=sizer)
         
+        selected = []
         for item in items:
-            if max_ideas and yielded >= max_ideas:
+            if max_ideas and yielded + len(selected) >= max_ideas:
                 break
-            
-            # Client-side filtering by reply count
-            reply_count = item.get("conversation", {}).get("messages_count", 1) - 1
-            
-            if min_replies is not None and reply_count < min_replies:
+            if min_replies is not None and item.reply_count < min_replies:
                 continue
-            if max_replies is not None and reply_count > max_replies:
+            if max_replies is not None and item.reply_count > max_replies:
                 continue
-            
-            # Normalize the idea
-            idea = normalize_idea(item)
-            
-            # Fetch replies if requested
-            if include_replies > 0:
-                time.sleep(DELAY_BETWEEN_REQUESTS)
-                idea["replies"] = fetch_replies(item.get("id"), limit=include_replies)
-            
+            selected.append(item)
+        
+        # Phase 2: deep-fetch only what changed
+        stale = []
+        for item in selected:
+            old = previous.get(item.id)
+            has_replies = include_replies <= 0 or (
+                old is not None and "replies" in old
+                and len(old["replies"]) >= min(old.get("reply_count", 0), include_replies)
+            )
+            if old is None:
+                stats["new"] += 1
+                stale.append(item.id)
+            elif idea_fingerprint(old) != raw_fingerprint(item) or not has_replies:
+                stats["changed"] += 1
+                stale.append(item.id)
+            else:
+                stats["unchanged"] += 1
+        
+        refreshed = {raw.id: normalize_idea(raw) for raw in fetch_ideas_by_ids(stale, cacheable=False)}
+        
+        if include_replies > 0 and batch_replies:
+            by_parent = fetch_replies_batch(
+                {message_id: idea["reply_count"] for message_id, idea in refreshed.items()},
+                limit=include_replies,
+                cacheable=False,
+            )
+            for message_id, idea in refreshed.items():
+                idea["replies"] = by_parent.get(message_id, [])
+        
+        for item in selected:
+            idea = refreshed.get(item.id) or previous.get(item.id)
+            if idea is None:
+                continue  # vanished between the sweep and the deep fetch
+            if include_replies > 0 and "replies" not in idea:
+                idea["replies"] = fetch_replies(idea["id"], limit=include_replies, cacheable=False)
             yield idea
             yielded += 1
-            
+        
         fetched += len(items)
         
         if progress_callback:
-            # Show progress based on total fetched (not yielded, since we filter)
             progress_callback(fetched, total)
-            
+        
         if not cursor or not items:
             break
-            
-        time.sleep(DELAY_BETWEEN_REQUESTS)
 
 
-def normalize_idea(raw: dict) -> dict:
-    """Convert raw API response to clean data structure."""
-    messages_count = raw.get("conversation", {}).get("messages_count", 1) or 1
-    reply_count = max(messages_count - 1, 0)
-    
-    return {
-        "id": raw.get("id"),
-        "title": raw.get("subject"),
-        "body_html": raw.get("body", ""),
-        "body_text": strip_html(raw.get("body", "")),
-        "url": raw.get("view_href"),
-        "post_date": raw.get("post_time"),
-        "author_username": raw.get("author", {}).get("login"),
-        "author_id": raw.get("author", {}).get("id"),
-        "kudos": raw.get("kudos", {}).get("sum", {}).get("weight", 0),
-        "views": raw.get("metrics", {}).get("views", 0),
-        "reply_count": reply_count,
-        "status_key": raw.get("status", {}).get("key"),
-        "status_name": raw.get("status", {}).get("name"),
-        "conversation_id": raw.get("conversation", {}).get("id"),
-    }
+def _fill_bodies(ideas: List[dict]):
+    """Fetch and convert the bodies of ideas listed without them."""
+    bodies = {raw.id: raw.body for raw in fetch_ideas_by_ids([idea["id"] for idea in ideas],
+                                                             fields=["id", "body"])}
+    for idea in ideas:
+        body = bodies.get(idea["id"]) or ""
+        idea["body_html"] = body
+        idea["body_text"] = strip_html(body)
 
 
-def save_to_json(ideas: list[dict], filename: str):
-    """Save ideas to JSON file."""
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    filepath = OUTPUT_DIR / filename
-    
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(ideas, f, indent=2, ensure_ascii=False)
-    
-    print(f"Saved {len(ideas)} ideas to {filepath}")
-    return filepath
+def _fill_replies(ideas: List[dict], limit: int, complete: set):
+    by_parent: Dict[str, List[dict]] = {}
+    try:
+        fetch_replies_batch({idea["id"]: idea["reply_count"] for idea in ideas}, limit=limit,
+                            replies=by_parent, complete=complete)
+    finally:
+        # Keep what was fetched before the budget ran out
+        for idea in ideas:
+            idea["replies"] = by_parent.get(idea["id"], [])
 
 
-def save_to_csv(ideas: list[dict], filename: str):
-    """Save ideas to CSV file (flattened, no nested replies)."""
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    filepath = OUTPUT_DIR / filename
+def _mark_skipped(ideas: List[dict], part: str, complete: Iterable[str] = ()):
+    complete = set(complete)
+    for idea in ideas:
+        if idea["id"] not in complete:
+            idea["skipped"].append(part)
+
+
+def fetch_ideas_within_budget(
+    max_ideas: Optional[int] = None,
+    min_replies: Optional[int] = None,
+    max_replies: Optional[int] = None,
+    include_replies: int = 0,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    budget: Optional[Budget] = None,
+    report: Optional[Dict[str, Any]] = None,
+    total: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Crawl as much as a request/time budget allows, yielding ideas by kudos, then views.
+    
+    Phase 1 lists ideas with the PROJECTION fields minus the body (one request per
+    listing page) until the board is done or the budget runs out. Phase 2 spends
+    what is left on bodies and replies, BATCH_SIZE ideas per task, most voted ideas
+    first. Each idea gets a "skipped" list naming the parts the budget did not cover
+    ("body", "replies"; empty = complete); skipped bodies are "" and skipped replies
+    are [] or the ones fetched before the budget ran out.
     
-    if not ideas:
-        return filepath
+    Args:
+        budget: Budget to schedule against (default: the one set by configure_budget;
+            requests are charged to that one)
+        report: Optional dict filled with what was listed, fetched and skipped
+        (other args as in fetch_all_ideas)
+    """
+    budget = budget or BUDGET or Budget()
+    report = report if report is not None else {}
+    sweep_fields = [field for field in PROJECTION.fields if field != "body"]
     
-    # Flatten for CSV - exclude replies array
-    flat_ideas = []
+    # Phase 1: cheap listing
+    ideas: List[dict] = []
+    swept = 0
+    listed_all = False
+    filtered = min_replies is not None or max_replies is not None
+    sizer = listing_sizer()
+    try:
+        total = total if total is not None else get_total_count()
+        cursor = None
+        while True:
+            items, cursor = fetch_ideas_batch(cursor=cursor,
+                                              limit=max_ideas - len(ideas) if max_ideas and not filtered else None,
+                                              fields=sweep_fields, sizer=sizer)
+            swept += len(items)
+            for item in items:
+                if max_ideas and len(ideas) >= max_ideas:
+                    break
+                if min_replies is not None and item.reply_count < min_replies:
+                    continue
+                if max_replies is not None and item.reply_count > max_replies:
+                    continue
+                ideas.append(normalize_idea(item))
+            
+            if progress_callback:
+                progress_callback(swept, total)
+            
+            if not cursor or not items or (max_ideas and len(ideas) >= max_ideas):
+                listed_all = True
+                break
+    except BudgetExhausted:
+        pass
+    
+    # Phase 2: bodies and replies, most voted (then most viewed) ideas first
+    ideas.sort(key=lambda idea: (-(idea.get("kudos") or 0), -(idea.get("views") or 0)))
     for idea in ideas:
-        flat = {k: v for k, v in idea.items() if k != "replies"}
-        # Truncate body for CSV readability
-        flat["body_text"] = flat.get("body_text", "")[:500]
-        flat.pop("body_html", None)  # Remove HTML from CSV
-        flat_ideas.append(flat)
+        if include_replies > 0:
+            idea["replies"] = []
+        idea["skipped"] = []
     
-    fieldnames = list(flat_ideas[0].keys())
+    scheduler = PriorityScheduler(budget)
+    for rank, start in enumerate(range(0, len(ideas), BATCH_SIZE)):
+        chunk = ideas[start:start + BATCH_SIZE]
+        span = f"{start + 1}-{start + len(chunk)}"
+        if PROJECTION.has("body"):
+            scheduler.add((rank, 0), 1, f"body {span}", partial(_fill_bodies, chunk),
+                          partial(_mark_skipped, chunk, "body"))
+        with_replies = [idea for idea in chunk if idea["reply_count"] > 0]
+        if include_replies > 0 and with_replies:
+            # Replies come oldest first across the whole chunk, so the last idea's
+            # share may only arrive on the last page: cost every reply page
+            pages = -(-sum(idea["reply_count"] for idea in with_replies) // BATCH_SIZE)
+            complete: set = set()
+            scheduler.add((rank, 1), pages, f"replies {span}",
+                          partial(_fill_replies, with_replies, include_replies, complete),
+                          partial(_mark_skipped, with_replies, "replies", complete))
+    scheduler.run()
     
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(flat_ideas)
+    report.update(
+        total=total,
+        swept=swept,
+        listed=len(ideas),
+        listed_all=listed_all,
+        tasks_completed=len(scheduler.completed),
+        tasks_skipped=scheduler.skipped,
+        ideas_complete=sum(1 for idea in ideas if not idea["skipped"]),
+        ideas_without_body=sum(1 for idea in ideas if "body" in idea["skipped"]),
+        ideas_without_replies=sum(1 for idea in ideas if "replies" in idea["skipped"]),
+        budget=budget.summary(),
+    )
+    yield from ideas
+
+
+def flatten_for_csv(idea: dict) -> dict:
+    """CSV row for an idea: no replies array, no HTML, body truncated for readability."""
+    flat = {k: v for k, v in idea.items() if k not in ("replies", "body_html")}
+    if "body_text" in flat:
+        flat["body_text"] = (flat["body_text"] or "")[:500]
+    if "labels" in flat:
+        flat["labels"] = "; ".join(flat["labels"])
+    if "skipped" in flat:
+        flat["skipped"] = "; ".join(flat["skipped"])
+    return flat
+
+
+def open_idea_sink(path: Path, flat: bool, partition_by=()):
+    """JSON/JSON Lines/CSV sink for ``path`` (.gz/.zst compressed by suffix), or a
+    typed Parquet/Feather sink for .parquet/.feather."""
+    if is_columnar(path):
+        columns = [column for column, field in IDEA_COLUMNS.items() if PROJECTION.has(field)]
+        return ColumnarSink(path, idea_schema(flat=flat, columns=columns), partition_by=partition_by,
+                            defaults={"board_id": BOARD_ID}, source=f"{BASE_URL} board {BOARD_ID}")
+    return CsvSink(path) if flat else open_sink(path)
+
+
+def save_to_json(ideas: Iterable[dict], filename: str, partition_by=()):
+    """Save ideas to JSON file (streamed, so ``ideas`` may be a generator).
     
-    print(f"Saved {len(flat_ideas)} ideas to {filepath}")
-    return filepath
+    The extension picks the format: .json, .jsonl, either with .gz/.zst for
+    compression (e.g. ideas.jsonl.zst). A .parquet/.feather ``filename`` writes
+    the same records, replies included, with a typed schema.
+    """
+    with open_idea_sink(OUTPUT_DIR / filename, flat=False, partition_by=partition_by) as sink:
+        for idea in ideas:
+            sink.write(idea)
+    
+    print(f"Saved {sink.count} ideas to {sink.path}")
+    return sink.path
+
+
+def save_to_csv(ideas: Iterable[dict], filename: str, partition_by=()):
+    """Save ideas to CSV file (flattened, no nested replies); .parquet/.feather also work."""
+    sink = open_idea_sink(OUTPUT_DIR / filename, flat=True, partition_by=partition_by)
+    try:
+        for idea in ideas:
+            sink.write(flatten_for_csv(idea))
+    except BaseException:
+        sink.abort()
+        raise
+    
+    if not sink.count:
+        sink.discard()
+        return sink.path
+    
+    sink.close()
+    print(f"Saved {sink.count} ideas to {sink.path}")
+    return sink.path
 
 
 def print_progress(fetched: int, total: int):
@@ -349,6 +978,12 @@ Examples:
   # Top 50 with 5 replies each
   python acc_ideas_scraper.py -n 50 --replies 5
   
+  # All ideas with 5 replies each, fetched a page of ideas at a time
+  python acc_ideas_scraper.py --all --replies 5 --batch-replies
+  
+  # Same, overlapping network, HTML parsing and writing
+  python acc_ideas_scraper.py --all --replies 5 --batch-replies --pipeline
+  
   # Ideas with at least 10 replies
   python acc_ideas_scraper.py --min-replies 10
   
@@ -357,6 +992,45 @@ Examples:
   
   # All ideas (will take a while for 4000+)
   python acc_ideas_scraper.py --all
+  
+  # Keep responses in the on-disk cache; the same query again later today is served from it
+  python acc_ideas_scraper.py --all --cache
+  
+  # Re-download, updating the cache for later --cache runs
+  python acc_ideas_scraper.py --all --cache --refresh
+  
+  # Continue a long crawl that died part-way (same arguments plus --resume)
+  python acc_ideas_scraper.py --all --replies 10 --resume
+  
+  # Cheap refresh: deep-fetch only ideas that changed since yesterday's JSON
+  python acc_ideas_scraper.py --all --replies 5 --since-snapshot acc_ideas_data/yesterday.json
+  
+  # Whatever fits in 15 minutes: all ideas listed, then bodies/replies for the most voted first
+  python acc_ideas_scraper.py --all --replies 5 --deadline 15m
+  
+  # Same within 200 API requests
+  python acc_ideas_scraper.py --all --replies 5 --max-requests 200
+  
+  # Let listing pages grow (metadata) or shrink (bodies) with response time and size
+  python acc_ideas_scraper.py --all --profile minimal --adaptive-pages --metrics
+  
+  # Rank ideas without downloading bodies (ids, titles, kudos, reply counts, status)
+  python acc_ideas_scraper.py --all --profile minimal
+  
+  # Everything, labels included
+  python acc_ideas_scraper.py --all --profile full+labels
+  
+  # Where did the time go? (requests, 429s, throttling, parse time per call type)
+  python acc_ideas_scraper.py --all --replies 5 --metrics
+  
+  # JSON Lines instead of one big JSON array, both outputs zstd-compressed
+  python acc_ideas_scraper.py --all --replies 5 --format jsonl --compress zst
+  
+  # Also write a typed Parquet dataset, one directory per year
+  python acc_ideas_scraper.py --all --columnar parquet --partition-by year
+  
+  # Against a local stand-in (python forum_stub_server.py) instead of forums.autodesk.com
+  python acc_ideas_scraper.py --all --base-url http://127.0.0.1:8765 --rate 1000 --rate-state ""
         """
     )
     
@@ -366,18 +1040,114 @@ Examples:
                         help="Fetch ALL ideas (ignores -n)")
     parser.add_argument("--replies", type=int, default=0,
                         help="Number of replies to fetch per idea (default: 0)")
+    parser.add_argument("--batch-replies", action="store_true",
+                        help="Fetch replies for a whole page of ideas per query (parent.id IN ...)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Overlap page fetches, HTML conversion (worker processes) and writing")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes for HTML conversion with --pipeline (default: CPU count)")
+    parser.add_argument("--profile", choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help="Fields to fetch: minimal (ranking), metrics (+url, date, views, author), "
+                             f"full (+body), full+labels (default: {DEFAULT_PROFILE})")
     parser.add_argument("--min-replies", type=int, default=None,
                         help="Only ideas with at least N replies")
     parser.add_argument("--max-replies", type=int, default=None,
                         help="Only ideas with at most N replies")
+    parser.add_argument("--since-snapshot", type=str, default=None, metavar="JSON",
+                        help="Only re-fetch body/status/replies for ideas whose kudos, views, "
+                             "reply count or status changed since this earlier JSON output")
+    parser.add_argument("--deadline", type=str, default=None, metavar="DURATION",
+                        help="Stop sending requests after this long (e.g. 900, 90s, 15m, 2h): every idea "
+                             "is listed first, then bodies and replies go to the most voted ideas; "
+                             "what didn't fit is recorded per idea under \"skipped\"")
+    parser.add_argument("--max-requests", type=int, default=None, metavar="N",
+                        help="Send at most N API requests (cached answers are free); same "
+                             "prioritization as --deadline")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted crawl from its last checkpoint")
     parser.add_argument("--output", "-o", type=str, default=None,
                         help="Output filename prefix (default: auto-generated)")
     parser.add_argument("--json-only", action="store_true",
                         help="Only output JSON (skip CSV)")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json",
+                        help="JSON output as one array (default) or JSON Lines, one idea per line")
+    parser.add_argument("--compress", choices=["gz", "zst"], default=None,
+                        help="Compress the JSON and CSV outputs while writing (.gz, or .zst: needs zstandard)")
+    parser.add_argument("--columnar", choices=["parquet", "feather"], default=None,
+                        help="Also write a typed Parquet/Feather copy with replies (needs pyarrow)")
+    parser.add_argument("--partition-by", nargs="+", choices=list(PARTITION_KEYS), default=[],
+                        help="Partition the --columnar output into board=/year= directories")
     parser.add_argument("--quiet", "-q", action="store_true",
                         help="Minimal output")
+    parser.add_argument("--adaptive-pages", action="store_true",
+                        help=f"Size listing pages ({BATCH_SIZE} ideas at first, {MAX_PAGE_SIZE} at most) by "
+                             "response time and payload, and retry a page that timed out with a smaller "
+                             "one (sizes are in --metrics)")
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND,
+                        help=f"Sustained requests per second (default: {REQUESTS_PER_SECOND})")
+    parser.add_argument("--burst", type=int, default=BURST,
+                        help=f"Requests allowed in a burst after idling (default: {BURST})")
+    parser.add_argument("--rate-state", type=str, default=None,
+                        help="Rate-limit state file shared by all scraper processes on this host "
+                             "(default: one per --base-url host in the temp directory; \"\" = do not share)")
+    parser.add_argument("--base-url", type=str, default=None,
+                        help="Khoros site to query (default: https://forums.autodesk.com)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Serve repeated queries from an on-disk response cache (listings up to 12h "
+                             "old, counts 1h). Off unless given")
+    parser.add_argument("--cache-file", type=str, default=None, metavar="PATH",
+                        help=f"Response cache file (default: {DEFAULT_CACHE_PATH}; implies --cache)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't use the response cache, even with --cache")
+    parser.add_argument("--refresh", action="store_true",
+                        help="With --cache: ignore cached responses from earlier runs (still updates the cache)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Print a request-metrics table at the end and write it as JSON plus a "
+                             "Prometheus textfile (<output dir>/<prefix>.metrics.json / .prom)")
+    parser.add_argument("--metrics-file", type=str, default=None, metavar="JSON",
+                        help="Where --metrics writes its JSON (the .prom goes next to it)")
     
     args = parser.parse_args()
+    if args.partition_by and not args.columnar:
+        parser.error("--partition-by needs --columnar")
+    if args.columnar:
+        try:
+            require_pyarrow()
+        except RuntimeError as e:
+            parser.error(str(e))
+    if args.compress == "zst":
+        try:
+            require_zstandard()
+        except RuntimeError as e:
+            parser.error(str(e))
+    budgeted = args.deadline is not None or args.max_requests is not None
+    if budgeted:
+        conflicts = [flag for flag, used in (("--since-snapshot", args.since_snapshot),
+                                             ("--resume", args.resume),
+                                             ("--pipeline", args.pipeline)) if used]
+        if conflicts:
+            parser.error(f"--deadline/--max-requests can't be combined with {', '.join(conflicts)}")
+        if args.max_requests is not None and args.max_requests < 1:
+            parser.error("--max-requests must be at least 1")
+        try:
+            deadline = parse_duration(args.deadline) if args.deadline is not None else None
+        except ValueError as e:
+            parser.error(str(e))
+    compression = f".{args.compress}" if args.compress else ""
+    json_suffix = f".{args.format}{compression}"
+    csv_suffix = f".csv{compression}"
+    if args.base_url:
+        configure_base_url(args.base_url)
+    configure_rate_limit(args.rate, args.burst,
+                         args.rate_state if args.rate_state is not None else str(default_state_path(BASE_URL)))
+    configure_profile(args.profile)
+    configure_paging(args.adaptive_pages)
+    use_cache = (args.cache or args.cache_file is not None) and not args.no_cache
+    if use_cache and args.base_url and not args.cache_file:
+        # Cache keys are LiQL only: don't mix another site's answers into the default cache
+        parser.error("--cache needs a --cache-file with --base-url")
+    configure_cache(args.cache_file or str(DEFAULT_CACHE_PATH) if use_cache else None, refresh=args.refresh)
+    budget = configure_budget(deadline, args.max_requests) if budgeted else None
     
     # Determine max ideas
     max_ideas = None if args.all else args.limit
@@ -389,10 +1159,18 @@ Examples:
         print(f"Ordering: By kudos (most voted first)")
         print(f"Limit: {'ALL' if max_ideas is None else max_ideas}")
         print(f"Replies per idea: {args.replies}")
+        print(f"Fields: {args.profile} ({len(PROJECTION.fields)} fields)")
         if args.min_replies:
             print(f"Min replies filter: {args.min_replies}")
         if args.max_replies:
             print(f"Max replies filter: {args.max_replies}")
+        if budget:
+            limits = []
+            if budget.deadline:
+                limits.append(f"{budget.deadline:g}s")
+            if budget.max_requests:
+                limits.append(f"{budget.max_requests} requests")
+            print(f"Budget: {', '.join(limits)} (listing first, then most voted ideas)")
         print()
     
     # Get count
@@ -407,28 +1185,114 @@ Examples:
         print()
     
     # Fetch ideas
-    ideas = []
     progress_cb = None if args.quiet else print_progress
+    refresh_stats: Dict[str, int] = {}
+    budget_report: Dict[str, Any] = {}
+    checkpoint: Optional[CrawlCheckpoint] = None
     
-    for idea in fetch_all_ideas(
-        max_ideas=max_ideas,
-        min_replies=args.min_replies,
-        max_replies=args.max_replies,
-        include_replies=args.replies,
-        progress_callback=progress_cb,
-    ):
-        ideas.append(idea)
+    if budget:
+        source = fetch_ideas_within_budget(
+            max_ideas=max_ideas,
+            min_replies=args.min_replies,
+            max_replies=args.max_replies,
+            include_replies=args.replies,
+            progress_callback=progress_cb,
+            budget=budget,
+            report=budget_report,
+            total=total,
+        )
+    elif args.since_snapshot:
+        source = refresh_changed_ideas(
+            load_snapshot(args.since_snapshot),
+            max_ideas=max_ideas,
+            min_replies=args.min_replies,
+            max_replies=args.max_replies,
+            include_replies=args.replies,
+            progress_callback=progress_cb,
+            batch_replies=args.batch_replies,
+            stats=refresh_stats,
+            total=total,
+        )
+    else:
+        checkpoint = CrawlCheckpoint(
+            OUTPUT_DIR / f"{args.output or 'crawl'}.checkpoint.json",
+            params={
+                "board": BOARD_ID,
+                "max_ideas": max_ideas,
+                "min_replies": args.min_replies,
+                "max_replies": args.max_replies,
+                "replies": args.replies,
+                "profile": args.profile,
+            },
+        )
+        try:
+            checkpoint.resume() if args.resume else checkpoint.start()
+        except CheckpointMismatch as e:
+            parser.error(f"{e}; rerun without --resume to start over")
+        source = fetch_all_ideas(
+            max_ideas=max_ideas,
+            min_replies=args.min_replies,
+            max_replies=args.max_replies,
+            include_replies=args.replies,
+            progress_callback=progress_cb,
+            batch_replies=args.batch_replies,
+            checkpoint=checkpoint,
+            pipeline=args.pipeline,
+            workers=args.workers,
+            total=total,
+        )
+    
+    # Stream to provisional files; they get their final names once the count is known
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    provisional = args.output or f"acc_ideas_{timestamp}"
+    json_sink = open_sink(OUTPUT_DIR / f"{provisional}{json_suffix}")
+    csv_sink = None if args.json_only else CsvSink(OUTPUT_DIR / f"{provisional}{csv_suffix}")
+    columnar_sink = None
+    if args.columnar:
+        columnar_sink = open_idea_sink(OUTPUT_DIR / f"{provisional}.{args.columnar}", flat=False,
+                                       partition_by=args.partition_by)
+    if args.pipeline:
+        # Serializing/writing happens on writer threads, off the crawl loop
+        json_sink = WriteBehindSink(json_sink)
+        csv_sink = csv_sink and WriteBehindSink(csv_sink)
+        columnar_sink = columnar_sink and WriteBehindSink(columnar_sink)
+    stats = RunningStats()
+    
+    def report_metrics(name: str):
+        json_path, prom_path = METRICS.write(args.metrics_file or OUTPUT_DIR / f"{name}.metrics.json")
+        print()
+        print(METRICS.summary())
+        print(f"Metrics written to {json_path} and {prom_path}")
+    
+    try:
+        for idea in source:
+            json_sink.write(idea)
+            if csv_sink:
+                csv_sink.write(flatten_for_csv(idea))
+            if columnar_sink:
+                columnar_sink.write(idea)
+            stats.add(idea)
+    except BaseException as e:
+        # Leave the .part files behind; the checkpoint (if any) has everything
+        for sink in (json_sink, csv_sink, columnar_sink):
+            if sink:
+                sink.abort()
+        if checkpoint and isinstance(e, (KhorosApiError, requests.RequestException, KeyboardInterrupt)):
+            print(f"\n\nCrawl interrupted after {stats.count} ideas; progress saved to {checkpoint.path}")
+            print("Re-run the same command with --resume to continue.")
+        if args.metrics or args.metrics_file:
+            report_metrics(provisional)
+        raise
     
     if not args.quiet:
         print()
         print()
     
     # Generate filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     if args.output:
         prefix = args.output
     else:
-        parts = ["acc_ideas", f"top{len(ideas)}"]
+        parts = ["acc_ideas", f"top{stats.count}"]
         if args.min_replies:
             parts.append(f"minrep{args.min_replies}")
         if args.max_replies:
@@ -438,9 +1302,22 @@ Examples:
         prefix = "_".join(parts) + f"_{timestamp}"
     
     # Save
-    json_path = save_to_json(ideas, f"{prefix}.json")
-    if not args.json_only:
-        save_to_csv(ideas, f"{prefix}.csv")
+    json_path = json_sink.close(OUTPUT_DIR / f"{prefix}{json_suffix}")
+    print(f"Saved {stats.count} ideas to {json_path}")
+    if csv_sink and csv_sink.count:
+        csv_path = csv_sink.close(OUTPUT_DIR / f"{prefix}{csv_suffix}")
+        print(f"Saved {csv_sink.count} ideas to {csv_path}")
+    elif csv_sink:
+        csv_sink.discard()
+    if columnar_sink:
+        columnar_path = columnar_sink.close(OUTPUT_DIR / f"{prefix}.{args.columnar}")
+        print(f"Saved {columnar_sink.count} ideas to {columnar_path}")
+    if checkpoint:
+        checkpoint.discard()
+    if budget_report:
+        budget_path = OUTPUT_DIR / f"{prefix}.budget.json"
+        budget_path.write_text(json.dumps(budget_report, indent=2), encoding="utf-8")
+        print(f"Budget report written to {budget_path}")
     
     # Summary
     if not args.quiet:
@@ -448,33 +1325,44 @@ Examples:
         print("=" * 60)
         print("SUMMARY")
         print("=" * 60)
-        print(f"Total ideas fetched: {len(ideas)}")
+        print(f"Total ideas fetched: {stats.count}")
+        if refresh_stats:
+            print(f"Re-fetched: {refresh_stats['changed']} changed, {refresh_stats['new']} new "
+                  f"({refresh_stats['unchanged']} unchanged, carried over)")
+        if budget_report:
+            spent = budget_report["budget"]
+            print(f"Budget: {spent['requests']} requests in {spent['seconds']:.1f}s ({spent['reason']})")
+            if not budget_report["listed_all"]:
+                print(f"Listing stopped after {budget_report['swept']} of {budget_report['total']} ideas")
+            print(f"Complete ideas: {budget_report['ideas_complete']} of {budget_report['listed']} "
+                  f"({budget_report['ideas_without_body']} without body, "
+                  f"{budget_report['ideas_without_replies']} without replies)")
         
-        if ideas:
-            total_replies_fetched = sum(len(i.get("replies", [])) for i in ideas)
-            if total_replies_fetched:
-                print(f"Total replies fetched: {total_replies_fetched}")
+        if stats.count:
+            if stats.replies_fetched:
+                print(f"Total replies fetched: {stats.replies_fetched}")
             
             print()
             print("Top 10 by votes:")
-            for i, idea in enumerate(ideas[:10], 1):
+            for i, idea in enumerate(stats.head, 1):
                 print(f"  {i:2}. [{idea['kudos']:4} votes, {idea['reply_count']:3} replies] {idea['title'][:50]}...")
                 print(f"      Status: {idea['status_name'] or 'Unknown'}")
-                if idea.get("replies"):
-                    print(f"      First reply by: {idea['replies'][0]['author']}")
+                if idea["first_reply_author"]:
+                    print(f"      First reply by: {idea['first_reply_author']}")
             
             # Status distribution
             print()
             print("Status distribution:")
-            statuses = {}
-            for idea in ideas:
-                status = idea["status_name"] or "Unknown"
-                statuses[status] = statuses.get(status, 0) + 1
-            
-            for status, count in sorted(statuses.items(), key=lambda x: -x[1]):
+            for status, count in stats.statuses.most_common():
                 print(f"  {status}: {count}")
+        
+        if CACHE:
+            print()
+            print(CACHE.summary())
+    if args.metrics or args.metrics_file:
+        report_metrics(prefix)
     
-    return ideas
+    return stats
 
 
 if __name__ == "__main__":
@@ -13,35 +13,112 @@ Usage:
     # Discover all forums
     python autodesk_forum_api.py discover
     
+    # Census of every board (size, latest post), saved and diffed against the previous one
+    python autodesk_forum_api.py discover --census data/census.json
+    
     # Export all ideas from a board
     python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas.csv
     
     # Export discussion board
     python autodesk_forum_api.py export --board revit-api-forum-en --output data/revit_api.csv
     
-    # Get board statistics
-    python autodesk_forum_api.py stats --board acc-ideas-en
+    # Export with status/body enrichment, 8 requests in flight
+    python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas.csv --enrich -j 8
+    
+    # Bodies and labels straight from the listing (no enrichment queries)
+    python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas.csv --profile full+labels
+    
+    # Big board: 8 post_time shards crawled at once, merged back into kudos order
+    python autodesk_forum_api.py --rate 10 export --board revit-api-forum-en --output data/revit_api.csv --shards 8
+    
+    # Export every ideas board, 4 boards at a time
+    python autodesk_forum_api.py export-all --kind ideas --output-dir data/ideas --jobs 4
+    
+    # Typed Parquet export, one directory per year (needs pyarrow)
+    python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas.parquet --partition-by year
+    
+    # JSON Lines, zstd-compressed as it is written (needs zstandard)
+    python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas.jsonl.zst
+    
+    # Re-run against the on-disk response cache (off by default: plain runs always see the live forum)
+    python autodesk_forum_api.py --cache export --board acc-ideas-en --output data/acc_ideas.csv
+    
+    # Incremental refresh of an existing export
+    python autodesk_forum_api.py sync --board acc-ideas-en --output data/acc_ideas.csv
+    
+    # Listing pages sized by response time and payload (bigger for metadata, smaller for bodies)
+    python autodesk_forum_api.py --adaptive-pages --metrics export --board acc-ideas-en --output data/acc_ideas.csv
+    
+    # Exact board statistics, also as JSON
+    python autodesk_forum_api.py stats --board acc-ideas-en --output data/acc_ideas.stats.json
 
 Requirements:
-    pip install requests pandas tqdm
+    pip install requests tqdm
+    pip install pyarrow  # optional, for Parquet/Feather output
+    pip install orjson   # optional, faster JSON output
+    pip install msgspec  # optional, faster typed response decoding
+    pip install zstandard  # optional, for .zst output
+    pip install lxml     # optional, faster HTML-to-text (forum_html)
 """
 
 import argparse
+import copy
 import json
+import sys
 import time
-import csv
-from dataclasses import dataclass, asdict, field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field, fields
+from fnmatch import fnmatch
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Iterator
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Sequence, Tuple
 from urllib.parse import quote
 import requests
-import pandas as pd
 from tqdm import tqdm
 
+from forum_budget import Budget, BudgetExhausted, parse_duration
+from forum_census import build_census, census_row, diff_census, load_census, save_census
+from forum_checkpoint import CheckpointMismatch, CrawlCheckpoint
+from forum_cache import DEFAULT_CACHE_PATH, ResponseCache, classify_liql, liql_key
+from forum_html import html_to_text
+from forum_metrics import RequestMetrics, default_metrics_path
+from forum_columnar import PARTITION_KEYS, ColumnarSink, is_columnar, message_schema
+from forum_paging import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageSizer, is_page_timeout
+from forum_pipeline import WriteBehindSink, interleave, map_stage, prefetch
+from forum_projections import PROFILES, Projection, label_texts
+from forum_records import RecordStore, message_store
+from forum_schema import (CountResponse, Message, MessageResponse, Node, NodeResponse,
+                          SingleMessageResponse, replace, response_status, to_builtins)
+from forum_shards import TimeShard, plan_shards
+from forum_sinks import CsvSink, open_sink, read_records, split_suffix
+from forum_ratelimit import RateLimiter, default_state_path
+from forum_transport import Transport
+
 
 BASE_URL = "https://forums.autodesk.com"
 API_URL = f"{BASE_URL}/api/2.0"
+# Every listing field to_forum_message can use; --profile picks a subset
+MESSAGE_FIELDS = ('id', 'subject', 'view_href', 'kudos.sum(weight)', 'metrics.views', 'post_time',
+                  'author.login', 'conversation.messages_count', 'conversation.solved',
+                  'status.key', 'status.name', 'body', 'labels')
+DEFAULT_PROFILE = 'metrics'
+BOARD_MESSAGE_FIELDS = Projection(DEFAULT_PROFILE, MESSAGE_FIELDS).select()
+ENRICH_CHUNK_SIZE = 100  # ids per `WHERE id IN (...)` enrichment query
+# What the stats sweep needs: no text, no author
+STATS_FIELDS = ('id', 'kudos.sum(weight)', 'metrics.views', 'conversation.messages_count',
+                'conversation.solved', 'status.key', 'status.name')
+
+
+class ForumApiError(RuntimeError):
+    """Raised when the API answers with an error payload."""
+
+
+def set_base_url(base_url: str):
+    """Point the client at another Khoros site (e.g. a local forum_stub_server)."""
+    global BASE_URL, API_URL
+    BASE_URL = base_url.rstrip('/')
+    API_URL = f"{BASE_URL}/api/2.0"
 
 
 # =============================================================================
@@ -64,7 +141,7 @@ class LiQLQuery:
     # Predefined queries
     @staticmethod
     def all_categories() -> str:
-        return "SELECT id,title,node_type FROM nodes WHERE node_type = 'category' LIMIT 500"
+        return "SELECT id,title,node_type,parent.id FROM nodes WHERE node_type = 'category' LIMIT 500"
     
     @staticmethod
     def all_boards() -> str:
@@ -79,16 +156,39 @@ class LiQLQuery:
         return "SELECT id,title,conversation_style,parent.id FROM nodes WHERE conversation_style = 'forum' LIMIT 200"
     
     @staticmethod
-    def messages_by_board(board_id: str, limit: int = 100, cursor: str = None) -> str:
-        """Get messages from a board. depth=0 means only topic starters (not replies)."""
-        query = f"SELECT id,subject,view_href,kudos.sum(weight),metrics.views,post_time,author.login,conversation.messages_count FROM messages WHERE board.id = '{board_id}' AND depth = 0 ORDER BY kudos.sum(weight) DESC LIMIT {limit}"
+    def messages_by_board(board_id: str, limit: int = 100, cursor: str = None,
+                          fields: str = None, where: str = '') -> str:
+        """Get messages from a board. depth=0 means only topic starters (not replies).
+        ``where`` adds conditions (e.g. a TimeShard's post_time range)."""
+        query = f"SELECT {fields or BOARD_MESSAGE_FIELDS} FROM messages WHERE board.id = '{board_id}' AND depth = 0{where} ORDER BY kudos.sum(weight) DESC LIMIT {limit}"
+        if cursor:
+            query += f" CURSOR '{cursor}'"
+        return query
+    
+    @staticmethod
+    def messages_since(board_id: str, since: str, limit: int = 100, cursor: str = None,
+                       fields: str = None) -> str:
+        """Get topic starters posted at or after ``since``, oldest first (for delta syncs)."""
+        query = f"SELECT {fields or BOARD_MESSAGE_FIELDS} FROM messages WHERE board.id = '{board_id}' AND depth = 0 AND post_time >= '{since}' ORDER BY post_time ASC LIMIT {limit}"
         if cursor:
             query += f" CURSOR '{cursor}'"
         return query
     
     @staticmethod
-    def message_count(board_id: str) -> str:
-        return f"SELECT count(*) FROM messages WHERE board.id = '{board_id}' AND depth = 0"
+    def messages_by_ids(message_ids: List[str]) -> str:
+        """Get the enrichment fields (status, body, conversation) for up to 100 messages."""
+        id_list = ', '.join(f"'{message_id}'" for message_id in message_ids)
+        return f"SELECT id,status.key,status.name,body,conversation.messages_count,conversation.solved FROM messages WHERE id IN ({id_list}) LIMIT {len(message_ids)}"
+    
+    @staticmethod
+    def message_count(board_id: str, where: str = '') -> str:
+        return f"SELECT count(*) FROM messages WHERE board.id = '{board_id}' AND depth = 0{where}"
+    
+    @staticmethod
+    def edge_post_time(board_id: str, newest: bool = False) -> str:
+        """post_time of the oldest (or newest) topic starter of a board."""
+        order = 'DESC' if newest else 'ASC'
+        return f"SELECT id,post_time FROM messages WHERE board.id = '{board_id}' AND depth = 0 ORDER BY post_time {order} LIMIT 1"
 
 
 # =============================================================================
@@ -98,48 +198,127 @@ class LiQLQuery:
 class AutodeskForumAPI:
     """Client for Autodesk Community Forum API."""
     
-    def __init__(self, delay: float = 0.5):
+    def __init__(self, delay: float = 0.5, concurrency: int = 1,
+                 limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 metrics: Optional[RequestMetrics] = None,
+                 adaptive_pages: bool = False,
+                 budget: Optional[Budget] = None):
         self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'RAPS-Research/3.0 (+https://rapscli.xyz)',
-            'Accept': 'application/json',
-        })
-    
-    def query(self, liql: str) -> Dict[str, Any]:
-        """Execute a LiQL query."""
+        self.cache = cache
+        self.adaptive_pages = adaptive_pages
+        self.metrics = metrics or RequestMetrics('autodesk_forum_api')
+        self.concurrency = max(1, concurrency)
+        # One token bucket for every thread (and, via the state file, every process)
+        self.limiter = limiter or RateLimiter.from_delay(delay, state_path=default_state_path(API_URL))
+        # Keep-alive pool sized so concurrent workers don't discard connections;
+        # retries, backoff and the circuit breaker live in the transport
+        self.transport = Transport(
+            self.limiter, self.metrics, pool_size=max(10, self.concurrency),
+            headers={
+                'User-Agent': 'RAPS-Research/3.0 (+https://rapscli.xyz)',
+                'Accept': 'application/json',
+            },
+            budget=budget,
+        )
+        self.session = self.transport.session
+    
+    @property
+    def requests_sent(self) -> int:
+        """HTTP requests sent so far, retries included."""
+        return self.transport.requests_sent
+    
+    def view(self) -> 'AutodeskForumAPI':
+        """
+        A client sharing this one's connection pool, rate limiter, cache, metrics
+        and budget that counts its own ``requests_sent`` (e.g. one per board).
+        """
+        view = copy.copy(self)
+        view.transport = self.transport.view()
+        return view
+    
+    def page_sizer(self) -> PageSizer:
+        """Page sizer for one listing walk (fixed at 100 unless ``adaptive_pages``)."""
+        if self.adaptive_pages:
+            return PageSizer(DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE, metrics=self.metrics)
+        return PageSizer.fixed(DEFAULT_PAGE_SIZE, metrics=self.metrics)
+    
+    def _fetch_uncached(self, url: str, kind: str, schema: Optional[type] = None,
+                        on_response: Optional[Callable[[requests.Response], None]] = None,
+                        retry_timeouts: bool = True) -> Tuple[bytes, Any]:
+        """GET a JSON payload: (raw body, body decoded into ``schema``), raising on error payloads."""
+        response = self.transport.get(url, kind, retry_timeouts=retry_timeouts)
+        response.raise_for_status()
+        data = self.metrics.decode(kind, response.content, schema)
+        status, message = response_status(data)
+        if status == 'error':
+            raise ForumApiError(message)
+        if on_response:
+            on_response(response)
+        return response.content, data
+    
+    def _fetch(self, url: str, key: str, kind: str, schema: Optional[type] = None,
+               cacheable: bool = True,
+               on_response: Optional[Callable[[requests.Response], None]] = None,
+               retry_timeouts: bool = True) -> Any:
+        """GET a JSON payload decoded into ``schema``, through the response cache when enabled."""
+        if not self.cache or not cacheable:
+            return self._fetch_uncached(url, kind, schema, on_response, retry_timeouts)[1]
+        downloaded = []
+        
+        def download() -> bytes:
+            body, data = self._fetch_uncached(url, kind, schema, on_response, retry_timeouts)
+            downloaded.append(data)
+            return body
+        
+        body = self.cache.fetch(key, kind, download)
+        # Decoded once: on the download itself, or here for a cached body
+        return downloaded[0] if downloaded else self.metrics.decode(kind, body, schema)
+    
+    def query(self, liql: str, cacheable: bool = True, schema: Optional[type] = None,
+              on_response: Optional[Callable[[requests.Response], None]] = None,
+              retry_timeouts: bool = True) -> Any:
+        """
+        Execute a LiQL query. ``cacheable=False`` always goes to the network.
+        ``on_response`` gets the HTTP response (not called for a cached answer).
+        ``retry_timeouts=False`` raises a read timeout or 502/504 at once and leaves
+        counting it as an error to the caller (adaptive listing pages shrink instead).
+        
+        The response is decoded into ``schema`` (a forum_schema response type),
+        or returned as plain JSON without one.
+        
+        Raises ``ForumApiError`` for error payloads, ``SchemaError`` (a ValueError)
+        for a response that doesn't fit ``schema``, and ``requests.RequestException``
+        (e.g. ``TransportError``) when the request fails after retries - a failed
+        page must end the crawl, never look like the last page.
+        """
         url = LiQLQuery.search_url(liql)
-        time.sleep(self.delay)
+        kind = classify_liql(liql)
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status') == 'error':
-                print(f"API Error: {data.get('message')}")
-                return {'data': {'items': []}}
-            
-            return data
-        except Exception as e:
-            print(f"Request failed: {e}")
-            return {'data': {'items': []}}
+            return self._fetch(url, liql_key(liql), kind, schema, cacheable, on_response, retry_timeouts)
+        except (ForumApiError, requests.RequestException, ValueError) as e:
+            if retry_timeouts or not is_page_timeout(e):
+                self.metrics.observe_error(kind)
+            raise
     
-    def get_message(self, message_id: str) -> Dict[str, Any]:
-        """Get full details of a single message."""
+    def get_message(self, message_id: str) -> Optional[Message]:
+        """Get full details of a single message (None if it no longer exists)."""
         url = f"{API_URL}/messages/{message_id}"
-        time.sleep(self.delay)
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return response.json().get('data', {})
-        except Exception as e:
-            print(f"Failed to get message {message_id}: {e}")
-            return {}
+            return self._fetch(url, url, 'message', SingleMessageResponse).data
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None  # deleted since it was listed
+            self.metrics.observe_error('message')
+            raise
+        except (ForumApiError, requests.RequestException, ValueError):
+            self.metrics.observe_error('message')
+            raise
     
     # High-level methods
-    def discover_boards(self) -> Dict[str, List[Dict]]:
+    def discover_boards(self) -> Dict[str, List[Node]]:
         """Discover all forum boards organized by type."""
         result = {
             'categories': [],
@@ -148,71 +327,203 @@ class AutodeskForumAPI:
         }
         
         # Categories
-        data = self.query(LiQLQuery.all_categories())
-        result['categories'] = data.get('data', {}).get('items', [])
+        data = self.query(LiQLQuery.all_categories(), schema=NodeResponse)
+        result['categories'] = list(data.data.items)
         
         # Ideas boards
-        data = self.query(LiQLQuery.ideas_boards())
-        result['ideas_boards'] = data.get('data', {}).get('items', [])
+        data = self.query(LiQLQuery.ideas_boards(), schema=NodeResponse)
+        result['ideas_boards'] = list(data.data.items)
         
         # Forum/discussion boards
-        data = self.query(LiQLQuery.forum_boards())
-        result['discussion_boards'] = data.get('data', {}).get('items', [])
+        data = self.query(LiQLQuery.forum_boards(), schema=NodeResponse)
+        result['discussion_boards'] = list(data.data.items)
         
         return result
     
-    def get_board_messages(self, board_id: str, max_messages: int = 10000) -> Iterator[Dict]:
+    def get_board_messages(self, board_id: str, max_messages: int = 10000,
+                           cursor: Optional[str] = None) -> Iterator[Message]:
         """
         Get all messages from a board with pagination.
-        Uses cursor-based pagination for efficiency.
+        Uses cursor-based pagination for efficiency; pass ``cursor`` to resume.
+        """
+        for page in self.iter_board_pages(board_id, max_messages, cursor=cursor):
+            yield from page
+    
+    def iter_board_pages(self, board_id: str, max_messages: int = 10000,
+                         since: Optional[str] = None,
+                         cursor: Optional[str] = None,
+                         projection: Optional[Projection] = None,
+                         cacheable: bool = True) -> Iterator[Sequence[Message]]:
         """
-        cursor = None
+        Like get_board_messages, but yields one list per API page.
+        With ``since``, only messages posted at/after that time, oldest first
+        (never served from the cache). ``projection`` picks the fields
+        (default: the DEFAULT_PROFILE listing fields).
+        """
+        for items, _ in self.iter_board_cursor_pages(board_id, max_messages, since, cursor, projection,
+                                                     cacheable=cacheable):
+            yield items
+    
+    def iter_board_cursor_pages(self, board_id: str, max_messages: int = 10000,
+                                since: Optional[str] = None,
+                                cursor: Optional[str] = None,
+                                projection: Optional[Projection] = None,
+                                shard: Optional[TimeShard] = None,
+                                cacheable: bool = True
+                                ) -> Iterator[Tuple[Sequence[Message], Optional[str]]]:
+        """Yield (page items, cursor of the following page) - the unit checkpoints commit.
+        With ``shard``, only topics in its post_time range (kudos order).
+        Pages are sized by ``page_sizer()``; one that times out is re-requested smaller."""
+        select = projection.select() if projection else None
+        where = shard.where() if shard else ''
         total_fetched = 0
-        batch_size = 100  # Max per request
+        sizer = self.page_sizer()
         
         while total_fetched < max_messages:
-            query = LiQLQuery.messages_by_board(board_id, batch_size, cursor)
-            data = self.query(query)
+            batch_size = sizer.next_size(max_messages - total_fetched)
+            if since:
+                query = LiQLQuery.messages_since(board_id, since, batch_size, cursor, select)
+            else:
+                query = LiQLQuery.messages_by_board(board_id, batch_size, cursor, select, where)
+            responses = []
+            # Timeouts of a page that can still shrink aren't retried at the same size
+            shrinkable = sizer.can_shrink
+            try:
+                data = self.query(query, cacheable=cacheable and since is None, schema=MessageResponse,
+                                  on_response=responses.append, retry_timeouts=not shrinkable)
+            except requests.RequestException as e:
+                if shrinkable and is_page_timeout(e):
+                    sizer.shrink()
+                    continue  # same cursor, smaller page
+                raise
             
-            items = data.get('data', {}).get('items', [])
+            items = data.data.items
+            sizer.observe_response(len(items), responses[-1] if responses else None)
             if not items:
                 break
             
-            for item in items:
-                yield item
-                total_fetched += 1
-                if total_fetched >= max_messages:
-                    break
+            items = items[:max_messages - total_fetched]
+            total_fetched += len(items)
             
             # Get next cursor
-            cursor = data.get('data', {}).get('next_cursor')
+            cursor = data.data.next_cursor
+            yield items, cursor
             if not cursor:
                 break
     
-    def enrich_message(self, message: Dict) -> Dict:
+    def plan_board_shards(self, board_id: str, shards: int) -> List[TimeShard]:
+        """
+        Split a board's topic starters into up to ``shards`` post_time ranges of
+        similar size, using count(*) queries (see forum_shards.plan_shards).
+        """
+        def count(start: Optional[str], end: Optional[str]) -> int:
+            data = self.query(LiQLQuery.message_count(board_id, TimeShard(start, end).where()),
+                              schema=CountResponse)
+            return data.data.count
+        
+        edges = []
+        for newest in (False, True):
+            items = self.query(LiQLQuery.edge_post_time(board_id, newest), schema=MessageResponse).data.items
+            edges.append(_parse_post_time(items[0].post_time or '') if items else None)
+        if None in edges:
+            return [TimeShard(count=count(None, None))]
+        return plan_shards(count, edges[0], edges[1], shards)
+    
+    def iter_sharded_cursor_pages(self, board_id: str, shards: Sequence[TimeShard],
+                                  max_messages: int = 10000,
+                                  cursors: Optional[Dict[str, Optional[str]]] = None,
+                                  projection: Optional[Projection] = None
+                                  ) -> Iterator[Tuple[Sequence[Message], Tuple[str, Optional[str]]]]:
+        """
+        Crawl every shard with its own cursor, all at once (one thread per shard,
+        sharing the connection pool and rate limiter).
+        
+        Yields (page items, (shard key, cursor of that shard's next page)) as pages
+        arrive. Each shard stops after ``max_messages`` - its kudos-ordered top,
+        which is all a merged top-``max_messages`` needs. ``cursors`` resumes shards
+        by key. Items are not deduplicated across shards.
+        """
+        cursors = cursors or {}
+        
+        def walk(shard: TimeShard) -> Iterator[Tuple[Sequence[Message], Optional[str]]]:
+            next_cursor = ''
+            for items, next_cursor in self.iter_board_cursor_pages(
+                    board_id, max_messages, cursor=cursors.get(shard.key), projection=projection, shard=shard):
+                yield items, next_cursor
+            if next_cursor is not None:
+                yield [], None  # empty or capped: still report the shard as done
+        
+        walks = [walk(shard) for shard in shards]
+        for index, (items, next_cursor) in interleave(walks, workers=len(walks)):
+            yield items, (shards[index].key, next_cursor)
+    
+    def enrich_message(self, message: Message) -> Message:
         """Fetch full message details including status."""
-        message_id = message.get('id')
-        if not message_id:
+        if not message.id:
             return message
         
-        full_data = self.get_message(message_id)
+        full_data = self.get_message(message.id)
         if full_data:
-            # Extract status
-            status = full_data.get('status', {})
-            message['status_name'] = status.get('name', '')
-            message['status_key'] = status.get('key', '')
+            message = self._apply_enrichment(message, full_data)
+        
+        return message
+    
+    @staticmethod
+    def _apply_enrichment(message: Message, full_data: Message) -> Message:
+        """A copy of a listing item with the full message's status, body and conversation."""
+        return replace(message, status=full_data.status, body=full_data.body,
+                       conversation=full_data.conversation)
+    
+    def enrich_messages_bulk(self, messages: Sequence[Message], chunk_size: int = ENRICH_CHUNK_SIZE,
+                             concurrency: Optional[int] = None) -> List[Message]:
+        """
+        Enrich messages with one `WHERE id IN (...)` LiQL query per chunk.
+        Ids a chunk fails to return fall back to per-message GETs.
+        """
+        enriched = list(messages)
+        missing = []  # positions in ``enriched``
+        for start in range(0, len(enriched), chunk_size):
+            chunk = [i for i in range(start, min(start + chunk_size, len(enriched))) if enriched[i].id]
+            if not chunk:
+                continue
             
-            # Body text (strip HTML for analysis)
-            body_html = full_data.get('body', '')
-            # Simple HTML strip - for proper handling use BeautifulSoup
-            import re
-            message['body_text'] = re.sub(r'<[^>]+>', ' ', body_html).strip()
+            data = self.query(LiQLQuery.messages_by_ids([enriched[i].id for i in chunk]),
+                              schema=MessageResponse)
+            found = {item.id: item for item in data.data.items}
             
-            # Additional fields
-            message['replies_count'] = full_data.get('conversation', {}).get('messages_count', 0)
-            message['solved'] = full_data.get('conversation', {}).get('solved', False)
+            for i in chunk:
+                full_data = found.get(enriched[i].id)
+                if full_data:
+                    enriched[i] = self._apply_enrichment(enriched[i], full_data)
+                else:
+                    missing.append(i)
         
-        return message
+        # Fallback: resolve stragglers one by one
+        for i, message in zip(missing, self.enrich_messages([enriched[i] for i in missing], concurrency)):
+            enriched[i] = message
+        
+        return enriched
+    
+    def enrich_messages(self, messages: Iterable[Message], concurrency: Optional[int] = None) -> Iterator[Message]:
+        """
+        Enrich messages using a bounded thread pool.
+        Yields results in input order; at most ``concurrency`` requests are in flight.
+        """
+        workers = max(1, concurrency or self.concurrency)
+        if workers == 1:
+            for message in messages:
+                yield self.enrich_message(message)
+            return
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='enrich') as pool:
+            pending = deque()
+            for message in messages:
+                pending.append(pool.submit(self.enrich_message, message))
+                # Keep a small backlog so the pool never idles, without draining the source
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
 
 
 # =============================================================================
@@ -233,6 +544,7 @@ class ForumMessage:
     author: str = ""
     body_text: str = ""
     solved: bool = False
+    labels: str = ""
     board_id: str = ""
     scraped_at: str = ""
     
@@ -241,57 +553,611 @@ class ForumMessage:
             self.scraped_at = datetime.now().isoformat()
 
 
+def to_forum_message(msg: Message, board_id: str) -> ForumMessage:
+    """Transform a raw (optionally enriched) API item to the standard record.
+    
+    Status, body, solved and labels come from enrichment, or from the listing
+    item itself when the export's profile selected them.
+    """
+    return ForumMessage(
+        id=msg.id or '',
+        subject=msg.subject or '',
+        url=msg.view_href or '',
+        kudos=msg.kudos.sum.weight,
+        views=msg.metrics.views,
+        replies=msg.conversation.messages_count,
+        status=msg.status.name or '',
+        post_date=msg.post_time or '',
+        author=msg.author.login or '',
+        body_text=html_to_text(msg.body) if msg.body else '',
+        solved=msg.conversation.solved,
+        labels='; '.join(label_texts(msg)),
+        board_id=board_id,
+    )
+
+
+def message_columns(projection: Projection) -> List[str]:
+    """Export columns: the ForumMessage fields, labels only if the profile selects them."""
+    return [fld.name for fld in fields(ForumMessage) if fld.name != 'labels' or projection.has('labels')]
+
+
+def message_record(msg: Message, board_id: str, projection: Projection) -> Dict[str, Any]:
+    """Export record of ``msg`` with the ``message_columns`` of ``projection``."""
+    record = asdict(to_forum_message(msg, board_id))
+    if not projection.has('labels'):
+        del record['labels']
+    return record
+
+
+def _enrich_page(api: AutodeskForumAPI, page: Sequence[Message], enrich_mode: str,
+                 concurrency: Optional[int]) -> List[Message]:
+    if enrich_mode == 'bulk':
+        return api.enrich_messages_bulk(page, concurrency=concurrency)
+    return list(api.enrich_messages(page, concurrency))
+
+
+def _listing_has_details(projection: Projection) -> bool:
+    """True if listing items already carry what enrichment adds (status and body)."""
+    return projection.has('status.name') and projection.has('body')
+
+
+def _message_source(api: AutodeskForumAPI, pages: Iterator[Sequence[Message]], enrich: bool,
+                    enrich_mode: str, concurrency: Optional[int]) -> Iterator[Message]:
+    """Flatten listing pages, enriching them as requested."""
+    if enrich and enrich_mode == 'bulk':
+        return (msg for page in pages for msg in _enrich_page(api, page, enrich_mode, concurrency))
+    messages = (msg for page in pages for msg in page)
+    if enrich:
+        return api.enrich_messages(messages, concurrency)
+    return messages
+
+
 def export_board(api: AutodeskForumAPI, board_id: str, output_path: str, 
-                 enrich: bool = False, max_messages: int = 10000):
-    """Export all messages from a board to CSV."""
+                 enrich: bool = False, max_messages: int = 10000,
+                 concurrency: Optional[int] = None, enrich_mode: str = 'bulk',
+                 checkpoint: Optional[CrawlCheckpoint] = None,
+                 partition_by: Sequence[str] = (), progress_position: Optional[int] = None,
+                 pipeline: bool = False, profile: str = DEFAULT_PROFILE,
+                 shards: int = 1, sort: str = 'kudos'):
+    """
+    Export all messages from a board to CSV, or to Parquet/Feather when
+    ``output_path`` ends in .parquet/.feather (optionally ``partition_by``
+    'board' and/or 'year', which makes the output a directory).
+    
+    enrich_mode 'bulk' resolves each listing page with `id IN (...)` queries;
+    'per-message' issues one GET per message on a thread pool.
+    
+    With a started/resumed ``checkpoint``, every record and page cursor is persisted
+    as it is produced, and a resumed export continues where the last one stopped.
+    
+    ``progress_position`` places the progress bar on its own line when several
+    boards are exported at once.
+    
+    With ``pipeline``, the next listing page is requested while the current one
+    is enriched, two pages are enriched at a time and rows are written on a
+    writer thread.
+    
+    ``profile`` (see forum_projections) selects the listing fields; with 'full'
+    or 'full+labels' the listing already has status and body, so ``enrich``
+    is skipped.
+    
+    With ``shards`` > 1 the board is split into that many post_time ranges
+    (see forum_shards), crawled concurrently with one cursor each, and
+    messages are deduplicated by id. ``sort='kudos'`` holds them in memory to
+    write the usual kudos order; 'arrival' streams them as shards deliver.
+    """
     
     print(f"Exporting board: {board_id}")
-    messages = []
+    projection = Projection(profile, MESSAGE_FIELDS)
+    enrich = enrich and not _listing_has_details(projection)
+    finished = bool(checkpoint and checkpoint.finished)
+    sharded = shards > 1
+    plan: List[TimeShard] = []
+    if sharded and checkpoint and checkpoint.shards:
+        plan = [TimeShard.from_dict(shard) for shard in checkpoint.shards.values()]
+    elif sharded and not finished:
+        plan = api.plan_board_shards(board_id, shards)
+        print(f"Crawling {len(plan)} post_time shards of {min(s.count for s in plan)}-"
+              f"{max(s.count for s in plan)} messages")
+        if checkpoint:
+            checkpoint.set_shards([shard.to_dict() for shard in plan])
+    output = Path(output_path)
+    if is_columnar(output):
+        sink = ColumnarSink(output, message_schema(columns=message_columns(projection)),
+                            partition_by=partition_by, source=f"{API_URL} board {board_id}")
+    else:
+        sink = _open_export_sink(output, projection)
+    if pipeline:
+        sink = WriteBehindSink(sink)
+    done_ids = set(checkpoint.done_ids) if checkpoint else set()
+    seen = set(done_ids)  # across shards
+    buffered: Optional[RecordStore] = message_store() if sharded and sort == 'kudos' else None
+    emit = buffered.append if buffered is not None else sink.write
     
-    for msg in tqdm(api.get_board_messages(board_id, max_messages), 
-                    desc="Fetching messages"):
-        
+    def prepare(listing: Tuple[Sequence[Message], Optional[str]]) -> Tuple[List[Dict], Optional[str]]:
+        """Listing page -> (export records, next cursor)."""
+        page, next_cursor = listing
+        page = [msg for msg in page if msg.id not in done_ids]
         if enrich:
-            msg = api.enrich_message(msg)
-        
+            page = _enrich_page(api, page, enrich_mode, concurrency)
         # Transform to standard format
-        record = ForumMessage(
-            id=msg.get('id', ''),
-            subject=msg.get('subject', ''),
-            url=msg.get('view_href', ''),
-            kudos=msg.get('kudos', {}).get('sum', {}).get('weight', 0) if isinstance(msg.get('kudos'), dict) else 0,
-            views=msg.get('metrics', {}).get('views', 0) if isinstance(msg.get('metrics'), dict) else 0,
-            replies=msg.get('conversation', {}).get('messages_count', 0) if isinstance(msg.get('conversation'), dict) else msg.get('replies_count', 0),
-            status=msg.get('status_name', ''),
-            post_date=msg.get('post_time', ''),
-            author=msg.get('author', {}).get('login', '') if isinstance(msg.get('author'), dict) else '',
-            body_text=msg.get('body_text', ''),
-            solved=msg.get('solved', False),
-            board_id=board_id,
-        )
-        messages.append(asdict(record))
+        return [message_record(msg, board_id, projection) for msg in page], next_cursor
     
-    # Save to CSV
-    if messages:
-        output = Path(output_path)
-        output.parent.mkdir(parents=True, exist_ok=True)
+    workers = ThreadPoolExecutor(max_workers=2) if pipeline else None
+    source = records = None
+    try:
+        restored = 0
+        if checkpoint:
+            for record in checkpoint.iter_restored():
+                emit(record)
+                restored += 1
+        
+        if finished:
+            pages = iter(())
+        elif sharded:
+            state = checkpoint.shards if checkpoint else {}
+            pending = [shard for shard in plan if not state.get(shard.key, {}).get('finished')]
+            cursors = {key: shard.get('cursor') for key, shard in state.items()}
+            pages = api.iter_sharded_cursor_pages(board_id, pending, max_messages, cursors, projection)
+        else:
+            # Restored records may include part of the page fetched again from the
+            # cursor, so cap on the rows written rather than shrinking the listing
+            pages = api.iter_board_cursor_pages(
+                board_id, max_messages, cursor=checkpoint.cursor if checkpoint else None,
+                projection=projection)
+        source = prefetch(pages, depth=2) if pipeline else pages
+        if pipeline:
+            records = map_stage(prepare, source, workers, depth=2)
+        else:
+            records = map(prepare, source)
+        
+        started = time.monotonic()
+        requests_before = api.requests_sent
+        desc = "Fetching messages" if progress_position is None else board_id
+        with tqdm(desc=desc, initial=restored, position=progress_position) as progress:
+            for page, position in records:
+                if sharded:
+                    page = [record for record in page if record['id'] not in seen]
+                    seen.update(record['id'] for record in page)
+                if buffered is None:
+                    page = page[:max(0, max_messages - sink.count)]
+                for record in page:
+                    emit(record)
+                    if checkpoint:
+                        checkpoint.record(record)
+                sink.flush()
+                progress.update(len(page))
+                
+                if checkpoint and sharded:
+                    checkpoint.commit_shard(*position, fetched=len(page))
+                elif checkpoint:
+                    checkpoint.commit(position, fetched=len(page))
+                if buffered is None and sink.count >= max_messages:
+                    break
         
-        df = pd.DataFrame(messages)
-        df.to_csv(output, index=False)
-        print(f"Exported {len(messages)} messages to {output}")
+        if buffered is not None:
+            # Each shard delivered its own kudos top; merge them into one order
+            kudos, ids = buffered.column('kudos'), buffered.column('id')
+            order = sorted(range(len(buffered)), key=lambda i: (-(kudos[i] or 0), ids[i]))
+            for i in order[:max_messages]:
+                sink.write(buffered[i])
+    except BaseException:
+        sink.abort()
+        raise
+    finally:
+        if workers:
+            # Stop prefetching and drop queued pages if the export stopped early
+            if records is not None:
+                records.close()
+            workers.shutdown(wait=False, cancel_futures=True)
+        if sharded and hasattr(source, 'close'):
+            source.close()  # stops the shard threads
+    
+    produced = sink.count - restored
+    # The request counter is shared, so only report it when this is the only board
+    if enrich and produced and progress_position is None:
+        elapsed = time.monotonic() - started
+        sent = api.requests_sent - requests_before
+        rate = sent / elapsed if elapsed > 0 else 0.0
+        print(f"Enriched {produced} messages with {sent} requests in {elapsed:.1f}s ({rate:.2f} req/s)")
+    
+    # Rows were streamed to <output>.part; move into place only when complete
+    if sink.count:
+        sink.close()
+        print(f"Exported {sink.count} messages to {output}")
     else:
+        sink.discard()
         print("No messages found")
     
-    return messages
+    if checkpoint:
+        checkpoint.discard()
+    
+    return sink.count
+
+
+# =============================================================================
+# Multi-board Export
+# =============================================================================
+
+def board_ids(boards: Dict[str, List[Node]], kinds: Sequence[str] = ('ideas', 'discussion'),
+              pattern: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    """
+    (board_id, kind, title) for the boards in a ``discover_boards`` result.
+    
+    Read-only boards are skipped; ``pattern`` is a shell-style glob on the id
+    (e.g. '*-ideas-en').
+    """
+    selected = []
+    for kind in kinds:
+        for board in boards.get(f'{kind}_boards', []):
+            board_id = board.id.replace('board:', '')
+            title = board.title
+            if not board_id or 'Read Only' in title:
+                continue
+            if pattern and not fnmatch(board_id, pattern):
+                continue
+            selected.append((board_id, kind, title))
+    return sorted(selected)
+
+
+def export_all(api: AutodeskForumAPI, boards: Sequence[Tuple[str, str, str]], output_dir: str,
+               fmt: str = 'csv', jobs: int = 4, resume: bool = False,
+               **export_kwargs) -> Dict[str, Any]:
+    """
+    Export several boards concurrently into ``output_dir/<board_id>.<fmt>``.
+    
+    All workers share ``api`` - one connection pool, one rate limiter and, if
+    it has one, one request budget - so ``jobs`` sets how many boards are in
+    flight, not the request rate. Each board is checkpointed on its own; a
+    failed board is recorded in the manifest and does not stop the others.
+    Once the budget is spent, the boards still running (and those not started)
+    are recorded as unfinished, to be continued with ``resume``. The manifest
+    has the requests each board sent. ``export_kwargs`` are passed to
+    ``export_board``.
+    """
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    started = datetime.now()
+    requests_before = api.requests_sent
+    
+    def run(position: int, board_id: str, kind: str, title: str) -> Dict[str, Any]:
+        path = output / f"{board_id}.{fmt}"
+        checkpoint = CrawlCheckpoint(
+            f"{path}.checkpoint.json",
+            params={'board': board_id, 'max': export_kwargs.get('max_messages', 10000),
+                    'enrich': export_kwargs.get('enrich', False),
+                    'profile': export_kwargs.get('profile', DEFAULT_PROFILE),
+                    'shards': export_kwargs.get('shards', 1)},
+        )
+        entry = {'board_id': board_id, 'kind': kind, 'title': title, 'path': path.name}
+        board_api = api.view()  # counts this board's requests
+        board_started = time.monotonic()
+        try:
+            checkpoint.resume() if resume else checkpoint.start()
+            entry['rows'] = export_board(board_api, board_id, str(path), checkpoint=checkpoint,
+                                         progress_position=position, **export_kwargs)
+        except BudgetExhausted as e:
+            entry['rows'] = 0
+            entry['unfinished'] = str(e)
+        except (ForumApiError, CheckpointMismatch, requests.RequestException, OSError) as e:
+            entry['rows'] = 0
+            entry['error'] = f"{type(e).__name__}: {e}"
+        entry['requests'] = board_api.requests_sent
+        entry['seconds'] = round(time.monotonic() - board_started, 1)
+        return entry
+    
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(run, i % max(1, jobs), *board) for i, board in enumerate(boards)]
+        results = [future.result() for future in futures]
+    
+    manifest = {
+        'created_at': started.isoformat(),
+        'finished_at': datetime.now().isoformat(),
+        'format': fmt,
+        'boards': results,
+        'total_rows': sum(entry['rows'] for entry in results),
+        'failed': [entry['board_id'] for entry in results if 'error' in entry],
+        'unfinished': [entry['board_id'] for entry in results if 'unfinished' in entry],
+        'requests_sent': api.requests_sent - requests_before,
+    }
+    budget = api.transport.budget
+    if budget:
+        manifest['budget'] = budget.summary()
+    manifest_path = output / '_manifest.json'
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return manifest
+
+
+# =============================================================================
+# Incremental Sync
+# =============================================================================
+
+def _parse_post_time(value: str) -> Optional[datetime]:
+    """Parse a Khoros post_time (ISO 8601 with offset); None if missing/invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _open_export_sink(output: Path, projection: Projection):
+    """CSV (``message_columns``), JSON or JSON Lines sink, compressed if the name ends in .gz/.zst."""
+    if split_suffix(output)[0] == '.csv':
+        return CsvSink(output, fieldnames=message_columns(projection))
+    return open_sink(output)
+
+
+def _read_export(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream the records of an existing CSV/JSON/JSON Lines export (compressed or not)."""
+    return read_records(path)
+
+
+def _watermark(records: Iterable[Dict], state: Optional[Dict] = None) -> Dict[str, Any]:
+    """Advance a {last_post_time, last_ids} watermark over exported records."""
+    state = dict(state or {'last_post_time': '', 'last_ids': []})
+    latest = _parse_post_time(state['last_post_time'])
+    last_ids = set(state['last_ids'])
+    
+    for record in records:
+        posted = _parse_post_time(record.get('post_date', ''))
+        if posted is None:
+            continue
+        if latest is None or posted > latest:
+            latest, last_ids = posted, {record['id']}
+            state['last_post_time'] = record['post_date']
+        elif posted == latest:
+            last_ids.add(record['id'])
+    
+    state['last_ids'] = sorted(last_ids)
+    return state
+
+
+def sync_board(api: AutodeskForumAPI, board_id: str, output_path: str,
+               state_path: Optional[str] = None, enrich: bool = False,
+               concurrency: Optional[int] = None, enrich_mode: str = 'bulk',
+               profile: str = DEFAULT_PROFILE) -> Dict[str, Any]:
+    """
+    Bring an existing board export up to date with messages posted since the last sync.
+    
+    The state file (default: <output>.sync.json) holds the newest post_time seen and
+    the ids posted at exactly that time, so `post_time >= watermark` never re-adds or
+    misses a message. Without state or output, falls back to a full export.
+    """
+    output = Path(output_path)
+    projection = Projection(profile, MESSAGE_FIELDS)
+    state_file = Path(state_path) if state_path else output.with_name(output.name + '.sync.json')
+    state = json.loads(state_file.read_text()) if state_file.exists() else None
+    
+    if is_columnar(output):
+        raise ValueError("sync updates CSV/JSON exports; export Parquet/Feather with the export command")
+    if state is None or not output.exists():
+        print(f"No sync state for {board_id}; running a full export first")
+        total = export_board(api, board_id, output_path, enrich=enrich,
+                             concurrency=concurrency, enrich_mode=enrich_mode, profile=profile)
+        added, updated = total, 0
+        state = _watermark(_read_export(output)) if total else _watermark(())
+    else:
+        print(f"Syncing {board_id} since {state['last_post_time']}")
+        pages = api.iter_board_pages(board_id, since=state['last_post_time'], projection=projection)
+        known_at_watermark = set(state['last_ids'])
+        fresh = {}
+        enrich = enrich and not _listing_has_details(projection)
+        for msg in _message_source(api, pages, enrich, enrich_mode, concurrency):
+            if msg.id not in known_at_watermark:
+                record = message_record(msg, board_id, projection)
+                fresh[record['id']] = record
+        
+        # Merge by id into the existing dataset, keeping its row order; only the
+        # new messages are held in memory, existing rows are streamed through
+        synced = list(fresh.values())
+        updated = 0
+        sink = _open_export_sink(output, projection)
+        try:
+            for row in _read_export(output):
+                if row['id'] in fresh:
+                    row = fresh.pop(row['id'])
+                    updated += 1
+                sink.write(row)
+            added = len(fresh)
+            for record in fresh.values():
+                sink.write(record)
+        except BaseException:
+            sink.discard()
+            raise
+        total = sink.count
+        sink.close()
+        state = _watermark(synced, state)
+    
+    state.update({'board_id': board_id, 'synced_at': datetime.now().isoformat(), 'total': total})
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    state_file.write_text(json.dumps(state, indent=2))
+    print(f"Sync complete: {added} new, {updated} updated, {total} total -> {output}")
+    return state
+
+
+# =============================================================================
+# Board Statistics
+# =============================================================================
+
+def board_stats(api: AutodeskForumAPI, board_id: str, workers: int = 4) -> Dict[str, Any]:
+    """
+    Exact statistics of a board's topic starters.
+    
+    One sweep of the whole board with STATS_FIELDS keeps running sums (kudos,
+    views, replies, solved) overall and per status; the topics of every status
+    key the sweep saw are then counted with ``count(*)`` queries, ``workers``
+    at a time. Counts are exact even if topics changed status mid-sweep; the
+    sums are as of the sweep. Nothing is read from the response cache.
+    """
+    started = time.monotonic()
+    requests_before = api.requests_sent
+    projection = Projection('metrics', STATS_FIELDS)
+    totals = {'swept': 0, 'kudos': 0, 'views': 0, 'replies': 0, 'solved': 0}
+    by_status: Dict[Optional[str], Dict[str, Any]] = {}
+    
+    pages = api.iter_board_pages(board_id, max_messages=sys.maxsize, projection=projection, cacheable=False)
+    with tqdm(desc=f"Sweeping {board_id}", unit=' topics') as progress:
+        for page in pages:
+            for msg in page:
+                key = msg.status.key
+                sums = by_status.get(key)
+                if sums is None:
+                    sums = by_status[key] = {'key': key, 'name': msg.status.name, 'topics': 0, 'swept': 0,
+                                             'kudos': 0, 'views': 0, 'replies': 0, 'solved': 0}
+                for target in (totals, sums):
+                    target['swept'] += 1
+                    target['kudos'] += msg.kudos.sum.weight
+                    target['views'] += msg.metrics.views
+                    target['replies'] += msg.reply_count
+                    target['solved'] += msg.conversation.solved
+            progress.update(len(page))
+    
+    def count(where: str = '') -> int:
+        query = LiQLQuery.message_count(board_id, where)
+        return api.query(query, cacheable=False, schema=CountResponse).data.count
+    
+    keys = [key for key in by_status if key]
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='count') as pool:
+        total = pool.submit(count)
+        counts = dict(zip(keys, pool.map(lambda key: count(f" AND status.key = '{key}'"), keys)))
+        topics = total.result()
+    for key, exact in counts.items():
+        by_status[key]['topics'] = exact
+    if None in by_status or topics > sum(counts.values()):
+        unset = by_status.setdefault(None, {'key': None, 'name': None, 'topics': 0, 'swept': 0,
+                                            'kudos': 0, 'views': 0, 'replies': 0, 'solved': 0})
+        unset['topics'] = max(topics - sum(counts.values()), 0)
+    
+    return {
+        'board_id': board_id,
+        'computed_at': datetime.now().isoformat(timespec='seconds'),
+        'topics': topics,
+        **totals,
+        'statuses': sorted(by_status.values(), key=lambda s: (-s['topics'], s['key'] or '')),
+        'requests': api.requests_sent - requests_before,
+        'seconds': round(time.monotonic() - started, 1),
+    }
+
+
+def cached_board_stats(api: AutodeskForumAPI, board_id: str, workers: int = 4) -> Tuple[Dict[str, Any], bool]:
+    """(board_stats, True if it came from the response cache) - cached per board for the 'stats' TTL."""
+    if not api.cache:
+        return board_stats(api, board_id, workers), False
+    computed = []
+    
+    def compute() -> bytes:
+        computed.append(True)
+        return json.dumps(board_stats(api, board_id, workers)).encode('utf-8')
+    
+    body = api.cache.fetch(f"stats:{board_id}", 'stats', compute)
+    return json.loads(body), not computed
+
+
+# =============================================================================
+# Census
+# =============================================================================
+
+def _node_id(node_id: Optional[str]) -> Optional[str]:
+    """'category:acc' -> 'acc'."""
+    return node_id.split(':', 1)[-1] if node_id else None
+
+
+def census_board(api: AutodeskForumAPI, board: Node, kind: str, kudos: bool = False) -> Dict[str, Any]:
+    """
+    Census row of one board: a count(*) and the newest topic's post_time (2 queries);
+    with ``kudos``, also a sweep of every topic's kudos (1 query per 100 topics).
+    A failure is recorded in the row's ``error`` rather than raised.
+    """
+    board_id = _node_id(board.id)
+    row = census_row(board_id, 'board', board.title, _node_id(board.parent.id), kind=kind)
+    try:
+        row['topics'] = api.query(LiQLQuery.message_count(board_id), schema=CountResponse).data.count
+        newest = api.query(LiQLQuery.edge_post_time(board_id, newest=True), schema=MessageResponse).data.items
+        row['latest_post'] = newest[0].post_time if newest else None
+        if kudos:
+            projection = Projection('minimal', ('id', 'kudos.sum(weight)'))
+            pages = api.iter_board_pages(board_id, max_messages=sys.maxsize, projection=projection)
+            row['kudos'] = sum(msg.kudos.sum.weight for page in pages for msg in page)
+    except (ForumApiError, requests.RequestException, ValueError) as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def board_census(api: AutodeskForumAPI, boards: Dict[str, List[Node]], workers: int = 8,
+                 kudos: bool = False) -> List[Dict[str, Any]]:
+    """
+    Census rows (see forum_census) for a ``discover_boards`` result: every board
+    is measured by census_board, ``workers`` boards at a time, and placed in the
+    category tree.
+    """
+    categories = [census_row(_node_id(node.id), 'category', node.title, _node_id(node.parent.id))
+                  for node in boards['categories']]
+    targets = [(board, kind) for kind in ('ideas', 'discussion') for board in boards.get(f'{kind}_boards', [])]
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='census') as pool:
+        futures = [pool.submit(census_board, api, board, kind, kudos) for board, kind in targets]
+        with tqdm(total=len(futures), desc="Census", unit=' boards') as progress:
+            rows = []
+            for future in futures:
+                rows.append(future.result())
+                progress.update(1)
+    return build_census(categories, rows)
+
+
+def print_census(rows: Sequence[Dict[str, Any]]):
+    """The census as an indented tree with topics and latest post."""
+    for row in rows:
+        depth = row['path'].count('/')
+        label = f"{'  ' * depth}{'📁 ' if row['node_type'] == 'category' else ''}{row['title'] or row['id']}"
+        if row['error']:
+            print(f"  {label[:60]:60} ! {row['error'][:60]}")
+            continue
+        kudos = f" {row['kudos']:>10,} kudos" if row['kudos'] is not None else ''
+        print(f"  {label[:60]:60} {row['topics'] or 0:>9,} topics  {(row['latest_post'] or '-')[:10]}{kudos}")
+
+
+def print_census_diff(changes: Dict[str, Any]):
+    print(f"\nSince the previous census: {len(changes['added'])} new boards, {len(changes['removed'])} removed, "
+          f"{len(changes['changed'])} changed, {changes['topics_delta']:+,} topics")
+    for row in changes['added']:
+        print(f"  + {row['id']:40} {row['topics'] or 0:>9,} topics")
+    for row in changes['removed']:
+        print(f"  - {row['id']}")
+    for change in changes['changed'][:20]:
+        moved = f"  (moved {change['parent_id'][0]} -> {change['parent_id'][1]})" if 'parent_id' in change else ''
+        print(f"  ~ {change['id']:40} {change['delta']:>+9,} topics{moved}")
 
 
 # =============================================================================
 # CLI Commands
 # =============================================================================
 
+def make_api(args, concurrency: int = 1, budget: Optional[Budget] = None) -> AutodeskForumAPI:
+    """Build a client from the global rate-limit options."""
+    state_path = default_state_path(args.base_url) if args.rate_state is None else args.rate_state or None
+    limiter = RateLimiter(rate=args.rate, burst=args.burst, state_path=state_path)
+    return AutodeskForumAPI(delay=1 / args.rate, concurrency=concurrency, limiter=limiter,
+                            cache=args.response_cache, metrics=args.request_metrics,
+                            adaptive_pages=args.adaptive_pages, budget=budget)
+
+
+def report_metrics(args):
+    """Print the run's request metrics and write them as JSON and Prometheus text."""
+    if args.metrics_file:
+        path = Path(args.metrics_file)
+    elif getattr(args, 'output_dir', None):
+        path = Path(args.output_dir) / '_metrics.json'
+    else:
+        path = default_metrics_path(getattr(args, 'output', None))
+    json_path, prom_path = args.request_metrics.write(path)
+    print(args.request_metrics.summary())
+    print(f"Metrics written to {json_path} and {prom_path}")
+
+
 def cmd_discover(args):
-    """Discover all available forums."""
-    api = AutodeskForumAPI()
+    """Discover all available forums (and with --census / --diff, how big they are)."""
+    api = make_api(args, concurrency=args.concurrency)
     boards = api.discover_boards()
     
     print("\n" + "="*70)
@@ -299,87 +1165,192 @@ def cmd_discover(args):
     print("="*70)
     
     print(f"\n📁 CATEGORIES ({len(boards['categories'])})")
-    for cat in sorted(boards['categories'], key=lambda x: x.get('title', '')):
-        cat_id = cat.get('id', '').replace('category:', '')
-        print(f"  {cat_id:40} {cat.get('title', '')}")
+    for cat in sorted(boards['categories'], key=lambda x: x.title):
+        cat_id = cat.id.replace('category:', '')
+        print(f"  {cat_id:40} {cat.title}")
     
     print(f"\n💡 IDEAS BOARDS ({len(boards['ideas_boards'])})")
-    for board in sorted(boards['ideas_boards'], key=lambda x: x.get('title', '')):
-        board_id = board.get('id', '').replace('board:', '')
-        parent = board.get('parent', {}).get('id', '').replace('category:', '')
-        if 'Read Only' not in board.get('title', ''):
-            print(f"  {board_id:40} {board.get('title', '')[:40]}")
+    for board in sorted(boards['ideas_boards'], key=lambda x: x.title):
+        board_id = board.id.replace('board:', '')
+        if 'Read Only' not in board.title:
+            print(f"  {board_id:40} {board.title[:40]}")
     
     print(f"\n💬 DISCUSSION BOARDS ({len(boards['discussion_boards'])})")
-    for board in sorted(boards['discussion_boards'], key=lambda x: x.get('title', '')):
-        board_id = board.get('id', '').replace('board:', '')
-        if 'Read Only' not in board.get('title', ''):
-            print(f"  {board_id:40} {board.get('title', '')[:40]}")
+    for board in sorted(boards['discussion_boards'], key=lambda x: x.title):
+        board_id = board.id.replace('board:', '')
+        if 'Read Only' not in board.title:
+            print(f"  {board_id:40} {board.title[:40]}")
     
     # Save full data
     if args.output:
         with open(args.output, 'w') as f:
-            json.dump(boards, f, indent=2)
+            json.dump(to_builtins(boards), f, indent=2)
         print(f"\nFull data saved to {args.output}")
+    
+    if not (args.census or args.diff):
+        return
+    
+    print(f"\n📊 CENSUS ({args.concurrency} boards at a time)")
+    rows = board_census(api, boards, workers=args.concurrency, kudos=args.kudos)
+    print_census(rows)
+    
+    # Compare with the given snapshot, or with the one about to be replaced
+    previous = args.diff or (args.census if Path(args.census).exists() else None)
+    if previous:
+        print_census_diff(diff_census(load_census(previous), rows))
+    if args.census:
+        save_census(args.census, rows, source=API_URL)
+        print(f"\nCensus saved to {args.census}")
 
 
 def cmd_export(args):
     """Export messages from a board."""
-    api = AutodeskForumAPI()
-    export_board(
-        api, 
-        args.board, 
-        args.output, 
+    # Each shard keeps a request in flight on the shared pool
+    api = make_api(args, concurrency=max(args.concurrency, args.shards))
+    checkpoint = CrawlCheckpoint(
+        f"{args.output}.checkpoint.json",
+        params={'board': args.board, 'max': args.max, 'enrich': args.enrich, 'profile': args.profile,
+                'shards': args.shards},
+    )
+    try:
+        checkpoint.resume() if args.resume else checkpoint.start()
+    except CheckpointMismatch as e:
+        raise SystemExit(f"{e}; rerun without --resume to start over")
+    
+    try:
+        export_board(
+            api, 
+            args.board, 
+            args.output, 
+            enrich=args.enrich,
+            max_messages=args.max,
+            concurrency=args.concurrency,
+            enrich_mode=args.enrich_mode,
+            checkpoint=checkpoint,
+            partition_by=args.partition_by,
+            pipeline=args.pipeline,
+            profile=args.profile,
+            shards=args.shards,
+            sort=args.sort,
+        )
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; progress saved to {checkpoint.path}. Re-run with --resume to continue.")
+        raise
+    except (ForumApiError, requests.RequestException) as e:
+        # No partial CSV: rows stay in <output>.part, progress in the checkpoint
+        raise SystemExit(f"\nExport failed: {e}\n"
+                         f"Progress saved to {checkpoint.path}. Re-run with --resume to continue.")
+
+
+def cmd_export_all(args):
+    """Export every (matching) board from discovery, several at a time."""
+    fmt = args.format
+    if args.compress:
+        if is_columnar(f"x.{fmt}"):
+            raise SystemExit("--compress is for CSV/JSON; Parquet/Feather are already compressed")
+        fmt += f".{args.compress}"
+    if args.max_requests is not None and args.max_requests < 1:
+        raise SystemExit("--max-requests must be at least 1")
+    try:
+        deadline = parse_duration(args.deadline) if args.deadline is not None else None
+    except ValueError as e:
+        raise SystemExit(str(e))
+    # One budget for every board (discovery included); cached answers are free
+    budget = Budget(deadline, args.max_requests) if deadline or args.max_requests else None
+    # Every worker may have -j enrichment requests (or one per shard) in flight on the shared pool
+    api = make_api(args, concurrency=args.jobs * max(1, args.concurrency, args.shards), budget=budget)
+    kinds = ('ideas', 'discussion') if args.kind == 'all' else (args.kind,)
+    try:
+        boards = board_ids(api.discover_boards(), kinds=kinds, pattern=args.match)
+    except BudgetExhausted as e:
+        raise SystemExit(f"Budget spent while discovering boards: {e}")
+    if args.limit:
+        boards = boards[:args.limit]
+    if not boards:
+        raise SystemExit("No boards matched")
+    print(f"Exporting {len(boards)} boards, {args.jobs} at a time -> {args.output_dir}")
+    
+    manifest = export_all(
+        api,
+        boards,
+        args.output_dir,
+        fmt=fmt,
+        jobs=args.jobs,
+        resume=args.resume,
         enrich=args.enrich,
-        max_messages=args.max
+        max_messages=args.max,
+        concurrency=args.concurrency,
+        enrich_mode=args.enrich_mode,
+        partition_by=args.partition_by,
+        pipeline=args.pipeline,
+        profile=args.profile,
+        shards=args.shards,
+        sort=args.sort,
+    )
+    
+    print(f"\nExported {manifest['total_rows']} messages from {len(boards)} boards "
+          f"with {manifest['requests_sent']} requests -> {Path(args.output_dir) / '_manifest.json'}")
+    for board_id in manifest['failed']:
+        error = next(e['error'] for e in manifest['boards'] if e['board_id'] == board_id)
+        print(f"  FAILED {board_id}: {error}")
+    if manifest['unfinished']:
+        print(f"  {len(manifest['unfinished'])} boards unfinished ({budget.reason()}); "
+              f"re-run with --resume to continue them")
+    if manifest['failed']:
+        raise SystemExit(f"{len(manifest['failed'])} boards failed; re-run with --resume to retry them")
+
+
+def cmd_sync(args):
+    """Incrementally update a board export."""
+    if is_columnar(args.output):
+        raise SystemExit("sync updates CSV exports; use export for Parquet/Feather")
+    api = make_api(args, concurrency=args.concurrency)
+    sync_board(
+        api,
+        args.board,
+        args.output,
+        state_path=args.state,
+        enrich=args.enrich,
+        concurrency=args.concurrency,
+        profile=args.profile,
     )
 
 
 def cmd_stats(args):
-    """Get board statistics."""
-    api = AutodeskForumAPI()
+    """Get exact board statistics (cached per board; --refresh recomputes)."""
+    api = make_api(args, concurrency=args.concurrency)
     
     print(f"\nFetching stats for: {args.board}")
+    stats, cached = cached_board_stats(api, args.board, args.concurrency)
     
-    # Get sample messages
-    messages = list(api.get_board_messages(args.board, max_messages=100))
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(stats, indent=2))
     
-    if not messages:
+    if not stats['topics']:
         print("No messages found")
         return
     
-    # Enrich first 20 to get status distribution
-    print("Enriching sample messages for status analysis...")
-    statuses = []
-    for msg in tqdm(messages[:20]):
-        enriched = api.enrich_message(msg)
-        if enriched.get('status_name'):
-            statuses.append(enriched['status_name'])
-    
-    # Calculate stats
-    total_kudos = sum(
-        m.get('kudos', {}).get('sum', {}).get('weight', 0) 
-        if isinstance(m.get('kudos'), dict) else 0
-        for m in messages
-    )
-    total_views = sum(
-        m.get('metrics', {}).get('views', 0)
-        if isinstance(m.get('metrics'), dict) else 0
-        for m in messages
-    )
-    
+    topics = stats['topics']
+    source = "cached" if cached else f"{stats['requests']} requests in {stats['seconds']}s"
     print(f"\n📊 BOARD STATISTICS: {args.board}")
-    print(f"  Sample size: {len(messages)} messages")
-    print(f"  Total kudos (sample): {total_kudos:,}")
-    print(f"  Total views (sample): {total_views:,}")
+    print(f"  As of: {stats['computed_at']} ({source})")
+    print(f"  Topics: {topics:,}")
+    print(f"  Total kudos: {stats['kudos']:,}")
+    print(f"  Total views: {stats['views']:,}")
+    print(f"  Total replies: {stats['replies']:,}")
+    print(f"  Solved: {stats['solved']:,}")
+    
+    print("\n  Status distribution:")
+    for status in stats['statuses']:
+        pct = status['topics'] / topics * 100
+        avg_kudos = status['kudos'] / status['swept'] if status['swept'] else 0
+        print(f"    {status['name'] or '(no status)':30} {status['topics']:6,} ({pct:.1f}%)"
+              f"  avg kudos {avg_kudos:,.1f}")
     
-    if statuses:
-        from collections import Counter
-        status_counts = Counter(statuses)
-        print(f"\n  Status distribution (sample of {len(statuses)}):")
-        for status, count in status_counts.most_common():
-            pct = count / len(statuses) * 100
-            print(f"    {status:30} {count:4} ({pct:.1f}%)")
+    if args.output:
+        print(f"\nStats written to {args.output}")
 
 
 def main():
@@ -391,14 +1362,47 @@ Examples:
   # Discover all forums
   python autodesk_forum_api.py discover --output forums.json
   
+  # Census: topics and latest post per board, as a category tree; diffed against the last one
+  python autodesk_forum_api.py discover --census data/census.parquet
+  
   # Export ACC Ideas (fast, no enrichment)
   python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas.csv
   
   # Export with full details (slower, includes status)
   python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas_full.csv --enrich
   
-  # Get board statistics
-  python autodesk_forum_api.py stats --board revit-ideas-en
+  # Same, enriching 8 messages concurrently
+  python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas_full.csv --enrich -j 8
+  
+  # Bodies and labels in the listing query itself (no enrichment requests)
+  python autodesk_forum_api.py export --board acc-ideas-en --output data/acc_ideas_full.csv --profile full+labels
+  
+  # Big discussion board: 8 post_time shards with their own cursors, crawled at once
+  python autodesk_forum_api.py --rate 10 export --board revit-api-forum-en --output data/revit_api.csv --shards 8
+  
+  # Every ideas board, 4 boards at a time, sharing one connection pool and rate budget
+  python autodesk_forum_api.py export-all --kind ideas --output-dir data/ideas --jobs 4
+  
+  # At most 2000 requests or 30 minutes across all boards (unfinished boards continue with --resume)
+  python autodesk_forum_api.py export-all --kind ideas --output-dir data/ideas --max-requests 2000 --deadline 30m
+  
+  # Daily refresh: only fetch ideas posted since the last sync
+  python autodesk_forum_api.py sync --board acc-ideas-en --output data/acc_ideas.csv
+  
+  # Exact board statistics (per-status counts, totals), also as JSON for a dashboard
+  python autodesk_forum_api.py stats --board revit-ideas-en --output data/revit_ideas.stats.json
+  
+  # Re-download everything instead of reusing today's cached responses
+  python autodesk_forum_api.py --refresh export --board acc-ideas-en --output data/acc_ideas.csv
+  
+  # Where did the time go? (requests, 429s, throttling, parse time per call type)
+  python autodesk_forum_api.py --metrics export --board acc-ideas-en --output data/acc_ideas.csv
+  
+  # Run faster (rate is shared with other scraper processes on this host)
+  python autodesk_forum_api.py --rate 5 --burst 10 export --board acc-ideas-en --output data/acc_ideas.csv
+  
+  # Against a local stand-in (python forum_stub_server.py) instead of forums.autodesk.com
+  python autodesk_forum_api.py --base-url http://127.0.0.1:8765 --rate 1000 --rate-state "" export -b acc-ideas-en -o /tmp/acc.csv
 
 Key Board IDs:
   Ideas Boards:
@@ -414,24 +1418,132 @@ Key Board IDs:
         """
     )
     
+    parser.add_argument('--rate', type=float, default=2.0,
+                        help='Sustained requests per second (default: 2.0)')
+    parser.add_argument('--burst', type=int, default=4,
+                        help='Requests allowed in a burst after idling (default: 4)')
+    parser.add_argument('--rate-state', default=None,
+                        help='Rate-limit state file shared by all scraper processes on this host '
+                             '(default: one per --base-url host in the temp directory; "" = do not share)')
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help=f'Khoros site to query (default: {BASE_URL})')
+    parser.add_argument('--cache', action='store_true',
+                        help='Serve repeated queries from an on-disk response cache (listings up to 12h '
+                             'old, counts 1h). Off unless given')
+    parser.add_argument('--cache-file', metavar='PATH',
+                        help=f'Response cache file (default: {DEFAULT_CACHE_PATH}; implies --cache)')
+    parser.add_argument('--no-cache', action='store_true', help="Don't use the response cache, even with --cache")
+    parser.add_argument('--refresh', action='store_true',
+                        help='With --cache: ignore cached responses from earlier runs (still updates the cache)')
+    parser.add_argument('--adaptive-pages', action='store_true',
+                        help=f'Size listing pages ({DEFAULT_PAGE_SIZE} messages at first, {MAX_PAGE_SIZE} at most) '
+                             'by response time and payload, and retry a page that timed out with a '
+                             'smaller one (sizes are in --metrics)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Print a request-metrics table at the end and write it as JSON plus a '
+                             'Prometheus textfile (<output>.metrics.json / .prom)')
+    parser.add_argument('--metrics-file', metavar='JSON',
+                        help='Where --metrics writes its JSON (the .prom goes next to it)')
+    
     subparsers = parser.add_subparsers(dest='command', help='Command')
     
     # Discover
     discover_parser = subparsers.add_parser('discover', help='Discover all forums')
     discover_parser.add_argument('--output', '-o', help='Output JSON file')
+    discover_parser.add_argument('--census', metavar='SNAPSHOT',
+                                 help='Also count every board\'s topics and latest post, print the category '
+                                      'tree, and save it (.json[.gz|.zst], .parquet or .feather); an existing '
+                                      'snapshot there is diffed first')
+    discover_parser.add_argument('--diff', metavar='SNAPSHOT',
+                                 help='Take a census and compare it with this earlier snapshot')
+    discover_parser.add_argument('--kudos', action='store_true',
+                                 help='Census kudos totals too (sweeps every board: 1 request per 100 topics)')
+    discover_parser.add_argument('--concurrency', '-j', type=int, default=8,
+                                 help='Boards counted at a time in a census (default: 8)')
     discover_parser.set_defaults(func=cmd_discover)
     
     # Export
     export_parser = subparsers.add_parser('export', help='Export board messages')
     export_parser.add_argument('--board', '-b', required=True, help='Board ID')
-    export_parser.add_argument('--output', '-o', required=True, help='Output CSV file')
+    export_parser.add_argument('--output', '-o', required=True,
+                               help='Output file: .csv, .jsonl or .json (+ .gz/.zst to compress), '
+                                    'or .parquet/.feather for a typed columnar export (needs pyarrow)')
     export_parser.add_argument('--enrich', action='store_true', help='Fetch full message details (slower)')
     export_parser.add_argument('--max', '-m', type=int, default=10000, help='Max messages')
+    export_parser.add_argument('--concurrency', '-j', type=int, default=1,
+                               help='Concurrent enrichment requests (default: 1)')
+    export_parser.add_argument('--resume', action='store_true',
+                               help='Continue an interrupted export from <output>.checkpoint.json')
+    export_parser.add_argument('--enrich-mode', choices=['bulk', 'per-message'], default='bulk',
+                               help='bulk: one id IN (...) query per 100 messages; '
+                                    'per-message: one GET each (default: bulk)')
+    export_parser.add_argument('--partition-by', nargs='+', choices=list(PARTITION_KEYS), default=[],
+                               help='Write a Parquet/Feather directory partitioned by board and/or year')
+    export_parser.add_argument('--pipeline', action='store_true',
+                               help='Prefetch the next page and enrich/write while fetching')
+    export_parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                               help='Listing fields: minimal, metrics (default; + url, date, views, author), '
+                                    'full (+ body, makes --enrich unnecessary), full+labels')
+    export_parser.add_argument('--shards', type=int, default=1,
+                               help='Split the board into N post_time ranges crawled concurrently (default: 1)')
+    export_parser.add_argument('--sort', choices=['kudos', 'arrival'], default='kudos',
+                               help='With --shards: merge into kudos order (held in memory) or write as pages arrive')
     export_parser.set_defaults(func=cmd_export)
     
+    # Export all
+    export_all_parser = subparsers.add_parser('export-all', help='Export many boards concurrently')
+    export_all_parser.add_argument('--output-dir', '-o', required=True, help='Directory for <board>.<format> files')
+    export_all_parser.add_argument('--kind', choices=['ideas', 'discussion', 'all'], default='ideas',
+                                   help='Which discovered boards to export (default: ideas)')
+    export_all_parser.add_argument('--match', help="Glob on board id, e.g. '*-ideas-en'")
+    export_all_parser.add_argument('--limit', type=int, help='Export at most N boards')
+    export_all_parser.add_argument('--format', choices=['csv', 'jsonl', 'json', 'parquet', 'feather'], default='csv')
+    export_all_parser.add_argument('--compress', choices=['gz', 'zst'],
+                                   help='Compress CSV/JSON output while writing (zst needs zstandard)')
+    export_all_parser.add_argument('--partition-by', nargs='+', choices=list(PARTITION_KEYS), default=[],
+                                   help='Partition Parquet/Feather output by board and/or year')
+    export_all_parser.add_argument('--jobs', type=int, default=4, help='Boards exported at once (default: 4)')
+    export_all_parser.add_argument('--enrich', action='store_true', help='Fetch full message details (slower)')
+    export_all_parser.add_argument('--max', '-m', type=int, default=10000, help='Max messages per board')
+    export_all_parser.add_argument('--concurrency', '-j', type=int, default=1,
+                                   help='Concurrent enrichment requests per board (default: 1)')
+    export_all_parser.add_argument('--enrich-mode', choices=['bulk', 'per-message'], default='bulk')
+    export_all_parser.add_argument('--resume', action='store_true',
+                                   help='Continue each board from its checkpoint')
+    export_all_parser.add_argument('--pipeline', action='store_true',
+                                   help='Prefetch pages and enrich/write while fetching, per board')
+    export_all_parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                                   help='Listing fields per board (default: metrics)')
+    export_all_parser.add_argument('--shards', type=int, default=1,
+                                   help='Split the board into N post_time ranges crawled concurrently (default: 1)')
+    export_all_parser.add_argument('--sort', choices=['kudos', 'arrival'], default='kudos',
+                                   help='With --shards: merge into kudos order (held in memory) or write as pages arrive')
+    export_all_parser.add_argument('--max-requests', type=int, metavar='N',
+                                   help='Send at most N API requests across all boards (cached answers are free); '
+                                        'boards still running are left to --resume')
+    export_all_parser.add_argument('--deadline', metavar='DURATION',
+                                   help='Stop sending requests after this long (e.g. 900, 90s, 15m, 2h), '
+                                        'across all boards')
+    export_all_parser.set_defaults(func=cmd_export_all)
+    
+    # Sync
+    sync_parser = subparsers.add_parser('sync', help='Add messages posted since the last export/sync')
+    sync_parser.add_argument('--board', '-b', required=True, help='Board ID')
+    sync_parser.add_argument('--output', '-o', required=True, help='CSV/JSON Lines export to update')
+    sync_parser.add_argument('--state', help='Sync state file (default: <output>.sync.json)')
+    sync_parser.add_argument('--enrich', action='store_true', help='Fetch full details for new messages')
+    sync_parser.add_argument('--concurrency', '-j', type=int, default=1,
+                             help='Concurrent fallback enrichment requests (default: 1)')
+    sync_parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                             help='Listing fields (default: metrics; use the export\'s profile)')
+    sync_parser.set_defaults(func=cmd_sync)
+    
     # Stats
-    stats_parser = subparsers.add_parser('stats', help='Get board statistics')
+    stats_parser = subparsers.add_parser('stats', help='Get exact board statistics')
     stats_parser.add_argument('--board', '-b', required=True, help='Board ID')
+    stats_parser.add_argument('--output', '-o', help='Also write the statistics as JSON')
+    stats_parser.add_argument('--concurrency', '-j', type=int, default=4,
+                              help='Parallel per-status count queries (default: 4)')
     stats_parser.set_defaults(func=cmd_stats)
     
     args = parser.parse_args()
@@ -440,7 +1552,24 @@ Key Board IDs:
         parser.print_help()
         return
     
-    args.func(args)
+    use_cache = (args.cache or args.cache_file is not None) and not args.no_cache
+    if args.base_url != BASE_URL:
+        set_base_url(args.base_url)
+        if use_cache and not args.cache_file:
+            # Cache keys are LiQL only: don't mix another site's answers into the default cache
+            parser.error('--cache needs a --cache-file with a non-default --base-url')
+    args.response_cache = ResponseCache(args.cache_file or DEFAULT_CACHE_PATH,
+                                        refresh=args.refresh) if use_cache else None
+    args.request_metrics = RequestMetrics('autodesk_forum_api')
+    try:
+        args.func(args)
+    except (ForumApiError, requests.RequestException) as e:
+        raise SystemExit(f"\nFailed: {e}")
+    finally:
+        if args.response_cache:
+            print(args.response_cache.summary())
+        if args.metrics or args.metrics_file:
+            report_metrics(args)
 
 
 if __name__ == '__main__':
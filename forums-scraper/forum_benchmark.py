@@ -0,0 +1,694 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the forum scraper's hot paths.
+
+Runs offline against the existing CSV export in acc_ideas_data/ (or any CSV
+with a body_text column), so results are repeatable and don't touch the API.
+Crawl benchmarks go to an in-process forum_stub_server seeded from that CSV.
+
+Usage:
+    # HTML to text: shared converter vs the previous BeautifulSoup strip_html
+    python forum_benchmark.py html
+    python forum_benchmark.py html --csv acc_ideas_data/acc_ideas_top4295_*.csv --repeat 5 --workers 4
+
+    # export_board, fetch_all_ideas (with/without replies) and stats at 4k/40k/400k messages
+    python forum_benchmark.py throughput
+    python forum_benchmark.py throughput --sizes 4000 40000 --latency 0.05 --pipeline
+    python forum_benchmark.py throughput --scenarios export --rate-429 0.02
+    python forum_benchmark.py throughput --scenarios export --sizes 40000 --shards 8
+
+    # Bytes, parse and normalize time per idea for each field profile
+    python forum_benchmark.py profiles
+    python forum_benchmark.py profiles --size 20000 --profiles minimal full
+
+    # Memory held by scraped records: list of dicts vs forum_records.RecordStore
+    python forum_benchmark.py memory
+    python forum_benchmark.py memory --size 200000 --replies 5
+
+    # save_to_json output: encode time and size per format, compression and JSON encoder
+    python forum_benchmark.py serialize
+    python forum_benchmark.py serialize --formats jsonl.zst json.gz --encoders orjson json
+
+    # Response pages: json.loads + dict normalize vs typed forum_schema decode + normalize
+    python forum_benchmark.py decode
+    python forum_benchmark.py decode --size 20000 --profile full
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import html
+import io
+import json
+import math
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import forum_html
+from forum_html import html_to_text, html_to_text_many
+from forum_projections import PROFILES
+
+
+DEFAULT_CSV = str(Path(__file__).parent / "acc_ideas_data" / "*.csv")
+
+
+def load_corpus(pattern: str) -> List[Dict[str, str]]:
+    """Rows from every CSV matching ``pattern``."""
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise SystemExit(f"No CSV files match {pattern}")
+    csv.field_size_limit(sys.maxsize)
+    rows = []
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    """Best wall time of ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _print_table(header: List[str], rows: List[List[str]]):
+    widths = [max(len(str(r[i])) for r in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  " + "  ".join(str(cell).rjust(w) if i else str(cell).ljust(w)
+                               for i, (cell, w) in enumerate(zip(row, widths))))
+
+
+# =============================================================================
+# html: HTML to text engines
+# =============================================================================
+
+def synthesize_html(text: str, rng: random.Random) -> str:
+    """
+    Khoros-style markup around a plain-text body: paragraphs, <br>, inline
+    formatting, links, lists, entities, and the odd style block.
+    """
+    escaped = html.escape(text, quote=False).replace("'", "&#39;")
+    sentences = [s.strip() for s in escaped.split(". ") if s.strip()]
+    blocks = []
+    i = 0
+    while i < len(sentences):
+        kind = rng.random()
+        chunk = sentences[i:i + rng.randint(1, 4)]
+        i += len(chunk)
+        words = ". ".join(chunk).split(" ")
+        if len(words) > 3:
+            j = rng.randrange(len(words) - 2)
+            tag = rng.choice(["strong", "em", "span", "u"])
+            words[j] = f"<{tag}>{words[j]}"
+            words[j + 1] = f"{words[j + 1]}</{tag}>"
+        if len(words) > 6 and rng.random() < 0.3:
+            k = rng.randrange(len(words))
+            words[k] = f'<a href="https://forums.autodesk.com/t5/x/{rng.randint(1, 10**7)}" target="_blank">{words[k]}</a>'
+        body = "&nbsp;".join(words[:2]) + " " + " ".join(words[2:]) if len(words) > 2 else " ".join(words)
+        if kind < 0.15:
+            items = body.split(", ")
+            blocks.append("<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>")
+        elif kind < 0.25:
+            blocks.append(f"<p>{body}<br />{rng.choice(['Thanks!', 'Regards', '&#8212; sent from ACC'])}</p>")
+        elif kind < 0.28:
+            blocks.append(f'<style>.lia-message-body p {{ margin: 0; }}</style><div class="lia-spoiler">{body}</div>')
+        else:
+            blocks.append(f"<p>{body}</p>")
+    return "\n".join(blocks) or "<p></p>"
+
+
+def legacy_strip_html(html_content: str) -> str:
+    """The BeautifulSoup+lxml strip_html that forum_html.html_to_text replaced."""
+    from bs4 import BeautifulSoup
+
+    if not html_content:
+        return ""
+    decoded = html.unescape(html_content)
+    soup = BeautifulSoup(decoded, "lxml")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    for br in soup.find_all("br"):
+        br.replace_with("\n")
+    for p in soup.find_all("p"):
+        if p.contents:
+            p.append("\n")
+    text = soup.get_text(separator=" ")
+    return " ".join(text.split()).strip()
+
+
+def legacy_regex_strip(html_content: str) -> str:
+    """The regex strip autodesk_forum_api used for enriched bodies (no unescaping)."""
+    return re.sub(r'<[^>]+>', ' ', html_content).strip()
+
+
+def _words(text: str) -> List[str]:
+    return text.split()
+
+
+def cmd_html(args):
+    rows = load_corpus(args.csv)
+    rng = random.Random(args.seed)
+    documents = [synthesize_html(row.get("body_text") or "", rng) for row in rows]
+    if args.limit:
+        documents = documents[:args.limit]
+    total_bytes = sum(len(d.encode("utf-8")) for d in documents)
+    print(f"Corpus: {len(documents)} bodies, {total_bytes / 1e6:.2f} MB of HTML (from {args.csv})")
+
+    backend = "lxml" if forum_html.etree is not None else "html.parser"
+    stdlib = forum_html._StdlibParser()
+    engines = [(f"html_to_text ({backend})", lambda: [html_to_text(d) for d in documents])]
+    if backend != "html.parser":
+        engines.append(("html_to_text (html.parser)", lambda: [stdlib.convert(d) for d in documents]))
+    engines.append(("html_to_text_many", lambda: html_to_text_many(documents)))
+    if args.workers > 1:
+        engines.append((f"html_to_text_many x{args.workers}",
+                        lambda: html_to_text_many(documents, workers=args.workers)))
+    engines.append(("regex (old enrich)", lambda: [legacy_regex_strip(d) for d in documents]))
+    try:
+        import bs4, lxml  # noqa: F401,E401 - only the baseline needs them
+        engines.append(("bs4 strip_html (old)", lambda: [legacy_strip_html(d) for d in documents]))
+        baseline = "bs4 strip_html (old)"
+    except ImportError:
+        print("  (beautifulsoup4/lxml not installed: skipping the old strip_html baseline)")
+        baseline = engines[0][0]
+
+    timings = {name: _timed(fn, args.repeat) for name, fn in engines}
+    table = []
+    for name, seconds in timings.items():
+        table.append([
+            name,
+            f"{seconds * 1000:.0f} ms",
+            f"{len(documents) / seconds:,.0f}",
+            f"{total_bytes / seconds / 1e6:.1f}",
+            f"{timings[baseline] / seconds:.1f}x",
+        ])
+    print()
+    _print_table(["engine", "best", "docs/s", "MB/s", f"vs {baseline}"], table)
+
+    if baseline != engines[0][0]:
+        # Same words in the same order, ignoring line breaks vs spaces
+        same = sum(_words(html_to_text(html.unescape(d))) == _words(legacy_strip_html(d))
+                   for d in documents)
+        print(f"\nSame words as the old strip_html: {same}/{len(documents)} bodies")
+    sample = documents[0]
+    print("\nSample input:\n  " + sample[:300].replace("\n", "\n  "))
+    print("Sample output:\n  " + html_to_text(sample)[:300].replace("\n", "\n  "))
+
+
+# =============================================================================
+# throughput: crawls against the local API stand-in
+# =============================================================================
+
+SCENARIOS = ('export', 'ideas', 'ideas+replies', 'stats')
+BOARD = "acc-ideas-en"
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..1); 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def _run_scenario(name: str, size: int, args, workdir: Path) -> int:
+    """Run one crawl against the stub (already configured); returns records produced."""
+    import acc_ideas_scraper_v2 as scraper
+    import autodesk_forum_api as forum_api
+    from forum_ratelimit import RateLimiter
+
+    if name == 'export':
+        api = forum_api.AutodeskForumAPI(concurrency=max(args.concurrency, args.shards),
+                                         limiter=RateLimiter(rate=args.rate, burst=args.burst))
+        return forum_api.export_board(api, BOARD, str(workdir / f"export-{size}.csv"),
+                                      enrich=args.enrich, max_messages=size,
+                                      concurrency=args.concurrency, pipeline=args.pipeline,
+                                      shards=args.shards)
+    if name in ('ideas', 'ideas+replies'):
+        replies = args.replies if name == 'ideas+replies' else 0
+        ideas = scraper.fetch_all_ideas(include_replies=replies, batch_replies=not args.per_idea_replies,
+                                        pipeline=args.pipeline)
+        return sum(1 for _ in ideas)
+    if name == 'stats':
+        forum_api.cmd_stats(argparse.Namespace(board=BOARD, rate=args.rate, burst=args.burst,
+                                               rate_state='', response_cache=None,
+                                               request_metrics=None))
+        return 100
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def cmd_throughput(args):
+    import acc_ideas_scraper_v2 as scraper
+    import autodesk_forum_api as forum_api
+    from forum_stub_server import StubConfig, StubCorpus, StubServer
+
+    paths = sorted(glob.glob(args.csv))
+    print(f"Stub: latency {args.latency * 1000:.0f} ms (+{args.jitter * 1000:.0f} ms jitter), "
+          f"page size <= {args.page_size}, 429 rate {args.rate_429:.1%}, 503 rate {args.rate_503:.1%}; "
+          f"client rate {'unlimited' if math.isinf(args.rate) else args.rate}"
+          f"{', pipelined' if args.pipeline else ''}{f', {args.shards} shards' if args.shards > 1 else ''}")
+    print(f"Corpus: {'seeded from ' + args.csv if paths else 'synthetic'}\n")
+
+    config = StubConfig(args.latency, args.jitter, args.page_size, args.rate_429, args.retry_after,
+                        rate_503=args.rate_503)
+    table = []
+    with tempfile.TemporaryDirectory(prefix="forum-bench-") as tmp:
+        for size in args.sizes:
+            corpus = (StubCorpus.from_csv(paths, size, [BOARD]) if paths
+                      else StubCorpus.synthetic(size, [BOARD]))
+            server = StubServer(corpus, config).start()
+            try:
+                forum_api.set_base_url(server.base_url)
+                scraper.configure_base_url(server.base_url)
+                scraper.configure_rate_limit(args.rate, args.burst, None)
+                scraper.configure_cache(None)
+                for name in args.scenarios:
+                    server.reset_stats()
+                    started = time.perf_counter()
+                    # The crawls print progress bars and summaries; keep the table readable
+                    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                        records = _run_scenario(name, size, args, Path(tmp))
+                    elapsed = time.perf_counter() - started
+                    stats = server.reset_stats()
+                    latencies = stats['latencies']
+                    table.append([
+                        name,
+                        f"{size:,}",
+                        f"{records:,}",
+                        f"{stats['requests']:,}",
+                        f"{stats['throttled']}/{stats['failed']}",
+                        f"{stats['requests'] / elapsed:,.1f}",
+                        f"{_percentile(latencies, 0.50) * 1000:.1f}",
+                        f"{_percentile(latencies, 0.99) * 1000:.1f}",
+                        f"{stats['bytes_sent'] / 1e6:.1f}",
+                        f"{elapsed:.2f}",
+                    ])
+                    print(f"  {name} @ {size:,}: {elapsed:.2f}s", file=sys.stderr)
+            finally:
+                server.stop()
+
+    print()
+    _print_table(["scenario", "messages", "records", "requests", "429/503", "req/s",
+                  "p50 ms", "p99 ms", "MB sent", "total s"], table)
+    print("\nLatency is measured in the stub: time to serve each request, injected latency included.")
+
+
+# =============================================================================
+# profiles: cost of each field-projection profile
+# =============================================================================
+
+def cmd_profiles(args):
+    import acc_ideas_scraper_v2 as scraper
+    from forum_metrics import RequestMetrics
+    from forum_projections import Projection
+    from forum_stub_server import StubConfig, StubCorpus, StubServer
+
+    paths = sorted(glob.glob(args.csv))
+    corpus = (StubCorpus.from_csv(paths, args.size, [BOARD]) if paths
+              else StubCorpus.synthetic(args.size, [BOARD]))
+    print(f"Corpus: {args.size:,} ideas {'seeded from ' + args.csv if paths else '(synthetic)'}; "
+          f"stub page size {args.page_size}, gzip on the wire\n")
+
+    server = StubServer(corpus, StubConfig(0.0, 0.0, args.page_size)).start()
+    table = []
+    try:
+        scraper.configure_base_url(server.base_url)
+        scraper.configure_rate_limit(math.inf, 4, None)
+        scraper.configure_cache(None)
+        for profile in args.profiles:
+            projection = Projection(profile, scraper.IDEA_FIELDS)
+            scraper.METRICS = RequestMetrics("benchmark")
+            server.reset_stats()
+            started = time.perf_counter()
+            raw, cursor = [], None
+            while True:
+                items, cursor = scraper.fetch_ideas_batch(cursor=cursor, limit=scraper.BATCH_SIZE,
+                                                          fields=projection.fields, cacheable=False)
+                raw.extend(items)
+                if not cursor or not items:
+                    break
+            fetch_seconds = time.perf_counter() - started
+            wire = server.reset_stats()['bytes_sent']
+            search = scraper.METRICS.snapshot()['search']
+            normalize_seconds = _timed(lambda: [scraper.normalize_idea(item, projection) for item in raw],
+                                       args.repeat)
+            records = [scraper.normalize_idea(item, projection) for item in raw]
+            output = sum(len(json.dumps(record, ensure_ascii=False)) for record in records)
+            n = max(len(raw), 1)
+            table.append([
+                profile,
+                str(len(projection.fields)),
+                f"{search['requests']:,}",
+                f"{wire / n:,.0f}",
+                f"{search['bytes'] / n:,.0f}",
+                f"{output / n:,.0f}",
+                f"{search['parse_seconds'] / n * 1e6:,.1f}",
+                f"{normalize_seconds / n * 1e6:,.1f}",
+                f"{fetch_seconds:.2f}",
+            ])
+            print(f"  {profile}: {len(raw):,} ideas in {fetch_seconds:.2f}s", file=sys.stderr)
+    finally:
+        server.stop()
+
+    print()
+    _print_table(["profile", "fields", "requests", "wire B/idea", "JSON B/idea", "record B/idea",
+                  "parse us/idea", "normalize us/idea", "fetch s"], table)
+    print("\nwire = gzip response bytes; JSON = decoded response bytes; record = normalize_idea "
+          "output as JSON; normalize includes HTML-to-text for profiles with the body.")
+
+
+# =============================================================================
+# memory: records held as dicts vs column-wise
+# =============================================================================
+
+def _records(kind: str, corpus, replies: int):
+    """Yield normalize_idea (+ replies) or ForumMessage records for every corpus topic."""
+    import acc_ideas_scraper_v2 as scraper
+    import autodesk_forum_api as forum_api
+    from dataclasses import asdict
+    from forum_schema import Message, Reply, convert
+    from forum_stub_server import render_message
+
+    reply_fields = ['id', 'body', 'post_time', 'author.login', 'author.id', 'kudos.sum(weight)']
+    for topic in corpus.topics:
+        if kind == 'ideas':
+            idea = scraper.normalize_idea(convert(render_message(topic, scraper.IDEA_FIELDS + ['labels']), Message))
+            if replies:
+                idea['replies'] = [scraper.normalize_reply(convert(render_message(reply, reply_fields), Reply))
+                                   for reply in corpus.replies_of(topic['id'])[:replies]]
+            yield idea
+        else:
+            raw = render_message(topic, list(forum_api.MESSAGE_FIELDS) + ['body', 'status.name', 'labels'])
+            yield asdict(forum_api.to_forum_message(convert(raw, Message), BOARD))
+
+
+def _measure(build: Callable[[], object]):
+    """(result, seconds, MB still allocated, peak MB) for one build."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, current / 2**20, peak / 2**20
+
+
+def cmd_memory(args):
+    import acc_ideas_scraper_v2 as scraper
+    from forum_records import idea_store, message_store
+    from forum_sinks import JsonLinesSink
+    from forum_stub_server import StubCorpus
+
+    paths = sorted(glob.glob(args.csv))
+    corpus = (StubCorpus.from_csv(paths, args.size, [BOARD]) if paths
+              else StubCorpus.synthetic(args.size, [BOARD]))
+    print(f"Corpus: {args.size:,} topics {'seeded from ' + args.csv if paths else '(synthetic)'}; "
+          f"up to {args.replies} replies per idea\n")
+
+    table = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in args.kinds:
+            # Render once, outside the measurement; both layouts get the same records
+            source = list(_records(kind, corpus, args.replies))
+            # Each layout gets its own copy of every record, as json.load would return them
+            copies = lambda: (json.loads(json.dumps(record)) for record in source)
+            layouts = {
+                'list of dicts': lambda: list(copies()),
+                'RecordStore': lambda: _store_of(idea_store(scraper.strip_html) if kind == 'ideas'
+                                                 else message_store(), copies()),
+            }
+            for layout, build in layouts.items():
+                records, seconds, current, peak = _measure(build)
+                sink = JsonLinesSink(Path(tmp) / f"{kind}.jsonl")
+                started = time.perf_counter()
+                for record in records:
+                    sink.write(record)
+                sink.close()
+                write_seconds = time.perf_counter() - started
+                table.append([
+                    kind, layout, f"{len(records):,}", f"{current:,.1f}",
+                    f"{current * 2**20 / max(len(records), 1):,.0f}", f"{peak:,.1f}",
+                    f"{seconds:.2f}", f"{write_seconds:.2f}",
+                ])
+                print(f"  {kind} / {layout}: {current:,.1f} MB", file=sys.stderr)
+                del records
+            del source
+
+    print()
+    _print_table(["records", "layout", "count", "held MB", "B/record", "peak MB", "build s", "write s"], table)
+    print("\nheld/peak = tracemalloc while building from a fresh copy of every record; "
+          "write = streaming every record to JSON Lines.")
+
+
+def _store_of(store, records):
+    store.extend(records)
+    return store
+
+
+# =============================================================================
+# serialize: output formats, compression and JSON encoders
+# =============================================================================
+
+SERIAL_FORMATS = ('json', 'json.gz', 'json.zst', 'jsonl', 'jsonl.gz', 'jsonl.zst')
+
+
+def cmd_serialize(args):
+    from forum_sinks import available_encoders, open_sink, read_records, zstandard
+    from forum_stub_server import StubCorpus
+
+    paths = sorted(glob.glob(args.csv))
+    corpus = (StubCorpus.from_csv(paths, args.size, [BOARD]) if paths
+              else StubCorpus.synthetic(args.size, [BOARD]))
+    ideas = list(_records('ideas', corpus, args.replies))
+    encoders = [name for name in args.encoders if name in available_encoders()]
+    formats = [fmt for fmt in args.formats if zstandard is not None or not fmt.endswith('.zst')]
+    skipped = sorted(set(args.encoders) - set(encoders)) + sorted(set(args.formats) - set(formats))
+    print(f"Corpus: {len(ideas):,} ideas {'seeded from ' + args.csv if paths else '(synthetic)'}, "
+          f"up to {args.replies} replies each; best of {args.repeat}")
+    if skipped:
+        print(f"Skipped (not installed): {', '.join(skipped)}")
+    print()
+
+    table = []
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            path = Path(tmp) / f"ideas.{fmt}"
+            for encoder in encoders:
+                def write():
+                    with open_sink(path, encoder=encoder) as sink:
+                        for idea in ideas:
+                            sink.write(idea)
+
+                write_seconds = _timed(write, args.repeat)
+                size = path.stat().st_size
+                read_seconds = _timed(lambda: sum(1 for _ in read_records(path)), args.repeat)
+                if baseline is None:
+                    baseline = (write_seconds, size)
+                table.append([
+                    fmt, encoder, f"{size / 2**20:,.2f}", f"{size / baseline[1]:.2f}",
+                    f"{write_seconds:.3f}", f"{baseline[0] / write_seconds:.1f}x", f"{read_seconds:.3f}",
+                ])
+                print(f"  {fmt} / {encoder}: {write_seconds:.3f}s", file=sys.stderr)
+
+    print()
+    _print_table(["format", "encoder", "MB", "size", "write s", "speedup", "read s"], table)
+    print(f"\nsize and speedup are relative to the first row ({formats[0]} / {encoders[0]}); "
+          "read = read_records with the fastest installed decoder.")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+# =============================================================================
+# decode: response pages as dicts vs typed structs
+# =============================================================================
+
+def legacy_normalize_idea(raw: dict, projection) -> dict:
+    """normalize_idea as it was on json.loads dicts, before forum_schema."""
+    import acc_ideas_scraper_v2 as scraper
+
+    messages_count = raw.get("conversation", {}).get("messages_count", 1) or 1
+    body = raw.get("body", "") if projection.has("body") else ""
+    labels = raw.get("labels") or {}
+    idea = {
+        "id": raw.get("id"),
+        "title": raw.get("subject"),
+        "body_html": body,
+        "body_text": scraper.strip_html(body),
+        "url": raw.get("view_href"),
+        "post_date": raw.get("post_time"),
+        "author_username": raw.get("author", {}).get("login"),
+        "author_id": raw.get("author", {}).get("id"),
+        "kudos": raw.get("kudos", {}).get("sum", {}).get("weight", 0),
+        "views": raw.get("metrics", {}).get("views", 0),
+        "reply_count": max(messages_count - 1, 0),
+        "status_key": raw.get("status", {}).get("key"),
+        "status_name": raw.get("status", {}).get("name"),
+        "conversation_id": raw.get("conversation", {}).get("id"),
+        "labels": [item.get("text", "") for item in labels.get("items", []) if item.get("text")],
+    }
+    return {column: idea[column] for column, field in scraper.IDEA_COLUMNS.items() if projection.has(field)}
+
+
+def _response_pages(corpus, fields: List[str], page_size: int) -> List[bytes]:
+    """The corpus as search response bodies of ``page_size`` items, like the stub sends them."""
+    from forum_stub_server import render_message
+
+    pages = []
+    for start in range(0, len(corpus.topics), page_size):
+        items = [render_message(topic, fields) for topic in corpus.topics[start:start + page_size]]
+        data = {"type": "messages", "list_item_type": "message", "size": len(items), "items": items,
+                "next_cursor": f"c{start + page_size}"}
+        pages.append(json.dumps({"status": "success", "message": "", "http_code": 200, "data": data}).encode())
+    return pages
+
+
+def cmd_decode(args):
+    import acc_ideas_scraper_v2 as scraper
+    import forum_schema
+    from forum_projections import Projection
+    from forum_schema import MessageResponse, decode
+    from forum_stub_server import StubCorpus
+
+    paths = sorted(glob.glob(args.csv))
+    corpus = (StubCorpus.from_csv(paths, args.size, [BOARD]) if paths
+              else StubCorpus.synthetic(args.size, [BOARD]))
+    projection = Projection(args.profile, scraper.IDEA_FIELDS)
+    pages = _response_pages(corpus, projection.fields, args.page_size)
+    backend = "msgspec" if forum_schema.msgspec is not None else "pure Python"
+    print(f"Corpus: {args.size:,} ideas in {len(pages):,} pages of {args.page_size}, profile {args.profile} "
+          f"({sum(map(len, pages)) / len(pages) / 1024:,.0f} KB/page); forum_schema backend: {backend}\n")
+
+    def as_dicts(body: bytes) -> list:
+        data = json.loads(body)
+        if data.get("status") != "success":
+            raise ValueError(data.get("message"))
+        return data["data"].get("items", [])
+
+    def as_structs(body: bytes) -> tuple:
+        return decode(body, MessageResponse).data.items
+
+    paths_ = {
+        "json.loads -> dicts": (as_dicts, lambda item: legacy_normalize_idea(item, projection)),
+        "forum_schema -> structs": (as_structs, lambda item: scraper.normalize_idea(item, projection)),
+    }
+    table = []
+    n = len(corpus.topics)
+    for name, (parse, normalize) in paths_.items():
+        parse_seconds = _timed(lambda: [parse(body) for body in pages], args.repeat)
+        total_seconds = _timed(lambda: [normalize(item) for body in pages for item in parse(body)], args.repeat)
+        # Allocation of one page: peak while decoding it, and what the decoded page holds
+        _, _, held, peak = _measure(lambda: parse(pages[0]))
+        table.append([
+            name,
+            f"{parse_seconds / len(pages) * 1e3:,.2f}",
+            f"{parse_seconds / n * 1e6:,.1f}",
+            f"{total_seconds / n * 1e6:,.1f}",
+            f"{held * 1024:,.0f}",
+            f"{peak * 1024:,.0f}",
+        ])
+        print(f"  {name}: {total_seconds:.2f}s", file=sys.stderr)
+
+    print()
+    _print_table(["path", "decode ms/page", "decode us/idea", "+normalize us/idea",
+                  "held KB/page", "peak KB/page"], table)
+    print("\nheld = tracemalloc of one decoded page; peak includes temporaries. normalize builds the "
+          "normalize_idea record (HTML-to-text too for profiles with the body).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the forum scraper")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    html_parser = subparsers.add_parser("html", help="HTML-to-text engines on the CSV corpus")
+    html_parser.add_argument("--csv", default=DEFAULT_CSV, help="CSV file(s) with a body_text column (glob)")
+    html_parser.add_argument("--limit", type=int, default=None, help="Use only the first N bodies")
+    html_parser.add_argument("--repeat", type=int, default=3, help="Runs per engine; best is reported")
+    html_parser.add_argument("--workers", type=int, default=1, help="Also time the batch API on N processes")
+    html_parser.add_argument("--seed", type=int, default=13, help="Seed for the synthesized markup")
+    html_parser.set_defaults(func=cmd_html)
+
+    throughput_parser = subparsers.add_parser("throughput", help="Scraper crawls against a local API stand-in")
+    throughput_parser.add_argument("--sizes", type=int, nargs="+", default=[4000, 40000, 400000],
+                                   help="Topic messages in the stub board (default: 4000 40000 400000)")
+    throughput_parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    throughput_parser.add_argument("--csv", default=DEFAULT_CSV,
+                                   help="CSV file(s) to seed the corpus from (glob; synthetic if none match)")
+    throughput_parser.add_argument("--latency", type=float, default=0.02, help="Stub latency per request, seconds")
+    throughput_parser.add_argument("--jitter", type=float, default=0.0, help="Extra random stub latency, seconds")
+    throughput_parser.add_argument("--page-size", type=int, default=1000, help="Max items the stub returns per page")
+    throughput_parser.add_argument("--rate-429", type=float, default=0.0,
+                                   help="Fraction of requests the stub answers with 429")
+    throughput_parser.add_argument("--rate-503", type=float, default=0.0,
+                                   help="Fraction of requests the stub answers with 503")
+    throughput_parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429s")
+    throughput_parser.add_argument("--rate", type=float, default=math.inf,
+                                   help="Client rate limit, requests/second (default: unlimited)")
+    throughput_parser.add_argument("--burst", type=int, default=4, help="Client rate-limit burst")
+    throughput_parser.add_argument("--replies", type=int, default=5, help="Replies per idea for ideas+replies")
+    throughput_parser.add_argument("--per-idea-replies", action="store_true",
+                                   help="One reply query per idea instead of one per page")
+    throughput_parser.add_argument("--enrich", action="store_true", help="Enrich the export scenario")
+    throughput_parser.add_argument("--concurrency", "-j", type=int, default=1, help="Enrichment concurrency")
+    throughput_parser.add_argument("--pipeline", action="store_true", help="Run the crawls with --pipeline")
+    throughput_parser.add_argument("--shards", type=int, default=1,
+                                   help="post_time shards crawled at once in the export scenario")
+    throughput_parser.set_defaults(func=cmd_throughput)
+
+    profiles_parser = subparsers.add_parser("profiles", help="Payload and CPU cost of each field profile")
+    profiles_parser.add_argument("--size", type=int, default=4000, help="Ideas in the stub board (default: 4000)")
+    profiles_parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    profiles_parser.add_argument("--csv", default=DEFAULT_CSV,
+                                 help="CSV file(s) to seed the corpus from (glob; synthetic if none match)")
+    profiles_parser.add_argument("--page-size", type=int, default=1000, help="Max items the stub returns per page")
+    profiles_parser.add_argument("--repeat", type=int, default=3, help="Normalize runs; best is reported")
+    profiles_parser.set_defaults(func=cmd_profiles)
+
+    memory_parser = subparsers.add_parser("memory", help="Memory held by records: dicts vs RecordStore")
+    memory_parser.add_argument("--size", type=int, default=100000, help="Topics in the corpus (default: 100000)")
+    memory_parser.add_argument("--replies", type=int, default=3, help="Replies kept per idea (default: 3)")
+    memory_parser.add_argument("--kinds", nargs="+", choices=["ideas", "messages"], default=["ideas", "messages"])
+    memory_parser.add_argument("--csv", default=DEFAULT_CSV,
+                               help="CSV file(s) to seed the corpus from (glob; synthetic if none match)")
+    memory_parser.set_defaults(func=cmd_memory)
+
+    serialize_parser = subparsers.add_parser("serialize", help="JSON output formats, compression and encoders")
+    serialize_parser.add_argument("--size", type=int, default=4295, help="Ideas to write (default: 4295)")
+    serialize_parser.add_argument("--replies", type=int, default=3, help="Replies per idea (default: 3)")
+    serialize_parser.add_argument("--formats", nargs="+", choices=SERIAL_FORMATS, default=list(SERIAL_FORMATS))
+    serialize_parser.add_argument("--encoders", nargs="+", choices=["json", "orjson", "msgspec"],
+                                  default=["json", "orjson", "msgspec"])
+    serialize_parser.add_argument("--csv", default=DEFAULT_CSV,
+                                  help="CSV file(s) to seed the corpus from (glob; synthetic if none match)")
+    serialize_parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; best is reported")
+    serialize_parser.set_defaults(func=cmd_serialize)
+
+    decode_parser = subparsers.add_parser("decode", help="Response decoding: dicts vs typed structs")
+    decode_parser.add_argument("--size", type=int, default=10000, help="Ideas to decode (default: 10000)")
+    decode_parser.add_argument("--profile", choices=list(PROFILES), default="metrics",
+                               help="Fields in each response item (default: metrics)")
+    decode_parser.add_argument("--page-size", type=int, default=100, help="Items per response (default: 100)")
+    decode_parser.add_argument("--csv", default=DEFAULT_CSV,
+                               help="CSV file(s) to seed the corpus from (glob; synthetic if none match)")
+    decode_parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; best is reported")
+    decode_parser.set_defaults(func=cmd_decode)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
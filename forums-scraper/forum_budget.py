@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Request and wall-clock budgets for a crawl, and a scheduler that spends them.
+
+A full crawl with bodies and replies costs a few requests per page of
+ideas; with a deadline (a nightly window) or a request quota, it is better
+to come back with every idea's metadata and the most important ideas
+complete than with the first N ideas complete and nothing else. So a
+budgeted crawl runs in two steps:
+
+1. a cheap sweep lists every idea without bodies (one request per 100);
+2. the remaining budget goes to the expensive parts - bodies, replies -
+   queued as tasks in priority order (most voted ideas first).
+
+``Budget.charge()`` is called before every HTTP request and raises
+``BudgetExhausted`` once the deadline has passed or the quota is used up;
+responses served from the cache are free. ``PriorityScheduler`` runs tasks
+while the budget allows them and records the rest as skipped, so the run
+always ends cleanly with what it has.
+
+Usage:
+    budget = Budget(deadline=parse_duration('15m'), max_requests=500)
+    scheduler = PriorityScheduler(budget)
+    scheduler.add((rank, 0), cost=1, name='body', run=fetch_bodies, on_skip=mark_skipped)
+    scheduler.run()
+    print(budget.summary(), scheduler.skipped)
+"""
+
+import heapq
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+class BudgetExhausted(RuntimeError):
+    """The crawl's deadline or request quota was reached."""
+
+
+def parse_duration(value: str) -> float:
+    """Seconds from '90', '90s', '15m' or '2h'."""
+    text = value.strip().lower()
+    unit = DURATION_UNITS.get(text[-1:]) if text else None
+    try:
+        seconds = float(text[:-1] if unit else text) * (unit or 1)
+    except ValueError:
+        raise ValueError(f"Invalid duration: {value!r} (expected e.g. 90, 90s, 15m or 2h)") from None
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive: {value!r}")
+    return seconds
+
+
+class Budget:
+    """A deadline (seconds from now) and/or a maximum number of HTTP requests."""
+
+    def __init__(self, deadline: Optional[float] = None, max_requests: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.deadline = deadline
+        self.max_requests = max_requests
+        self.clock = clock
+        self.started = clock()
+        self.requests = 0
+        self.refused = 0  # requests not sent because the budget was spent
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def remaining_requests(self) -> Optional[int]:
+        return None if self.max_requests is None else max(0, self.max_requests - self.requests)
+
+    def remaining_seconds(self) -> Optional[float]:
+        return None if self.deadline is None else max(0.0, self.deadline - self.elapsed())
+
+    def exhausted(self) -> bool:
+        return self.remaining_requests() == 0 or self.remaining_seconds() == 0
+
+    def allows(self, cost: int) -> bool:
+        """True if ``cost`` more requests fit (the deadline is only checked, not predicted)."""
+        if self.exhausted():
+            return False
+        remaining = self.remaining_requests()
+        return remaining is None or cost <= remaining
+
+    def charge(self):
+        """Account for one request about to be sent; raises BudgetExhausted instead."""
+        with self._lock:
+            if self.exhausted():
+                self.refused += 1
+                raise BudgetExhausted(self.reason())
+            self.requests += 1
+
+    def reason(self) -> str:
+        if self.remaining_requests() == 0:
+            return f"request budget of {self.max_requests} used up"
+        if self.remaining_seconds() == 0:
+            return f"deadline of {self.deadline:g}s reached"
+        return "budget left"
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "deadline_seconds": self.deadline,
+            "max_requests": self.max_requests,
+            "requests": self.requests,
+            "refused": self.refused,
+            "seconds": round(self.elapsed(), 3),
+            "exhausted": self.exhausted(),
+            "reason": self.reason(),
+        }
+
+
+class PriorityScheduler:
+    """Runs queued tasks lowest priority value first while the budget lasts."""
+
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        self.queue: List[tuple] = []
+        self.completed: List[str] = []
+        self.skipped: List[str] = []
+        self._sequence = 0
+
+    def add(self, priority: Any, cost: int, name: str, run: Callable[[], Any],
+            on_skip: Optional[Callable[[], Any]] = None):
+        """
+        Queue ``run`` (expected to send about ``cost`` requests); ``on_skip`` is
+        called instead if the task doesn't fit the budget or is cut short by it.
+        Tasks of equal priority run in the order they were added.
+        """
+        heapq.heappush(self.queue, (priority, self._sequence, cost, name, run, on_skip))
+        self._sequence += 1
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def run(self) -> List[str]:
+        """Run or skip every queued task; returns the names of the completed ones."""
+        while self.queue:
+            _, _, cost, name, run, on_skip = heapq.heappop(self.queue)
+            if self.budget.allows(cost):
+                try:
+                    run()
+                except BudgetExhausted:
+                    pass
+                else:
+                    self.completed.append(name)
+                    continue
+            # Too expensive for what's left, or interrupted: keep going, cheaper tasks may fit
+            self.skipped.append(name)
+            if on_skip:
+                on_skip()
+        return self.completed
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk response cache for Khoros API calls.
+
+Sits in front of ``AutodeskForumAPI.query``/``get_message`` and
+``acc_ideas_scraper_v2.liql_query`` so re-running an analysis (or
+debugging one step) doesn't re-download the board:
+
+- SQLite file, one row per response, zlib-compressed
+- keyed by whitespace-normalized LiQL text or by URL
+- per-query-type TTLs (board listings change slower than counts)
+- size cap with least-recently-used eviction
+- identical concurrent requests are coalesced: one goes to the network,
+  the others wait for its result
+
+It is opt-in: the CLIs only use it with ``--cache``/``--cache-file`` (a listing can be up
+to 12 hours old), so a plain run always reads the live forum.
+
+Usage:
+    cache = ResponseCache()
+    body = cache.fetch(liql_key(query), classify_liql(query), lambda: download(query))
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "raps-forums" / "khoros.sqlite"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+HOUR = 3600
+DEFAULT_TTLS = {
+    'nodes': 7 * 24 * HOUR,   # category/board listings
+    'count': 1 * HOUR,        # count(*) queries
+    'search': 12 * HOUR,      # message listings
+    'replies': 24 * HOUR,     # parent.id queries
+    'message': 24 * HOUR,     # REST GET /messages/{id}
+    'stats': 1 * HOUR,        # board_stats results, keyed stats:<board>
+}
+
+
+def normalize_liql(query: str) -> str:
+    """Collapse whitespace so formatting differences share one cache entry."""
+    return ' '.join(query.split())
+
+
+def liql_key(query: str) -> str:
+    return f"liql:{normalize_liql(query)}"
+
+
+def classify_liql(query: str) -> str:
+    """Map a LiQL query to its call type (used for TTLs and metrics)."""
+    text = normalize_liql(query).lower()
+    if 'count(*)' in text:
+        return 'count'
+    if ' from nodes' in text:
+        return 'nodes'
+    if 'parent.id' in text:
+        return 'replies'
+    return 'search'
+
+
+class _InFlight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.body: Optional[bytes] = None
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTLs, LRU eviction and request coalescing."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, float]] = None, refresh: bool = False):
+        """
+        Args:
+            path: SQLite database file (created on first use)
+            max_bytes: Evict least-recently-used entries above this size
+            ttls: Per-kind max age in seconds, merged over DEFAULT_TTLS
+            refresh: Ignore entries written before this run, but still store
+                fresh responses (so later identical calls in the run hit)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.not_before = time.time() if refresh else 0.0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlight] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+            # Running estimate; recomputed exactly before evicting
+            self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    # -- lookups --------------------------------------------------------------
+
+    def get(self, key: str, kind: str) -> Optional[bytes]:
+        """Return a fresh cached body, or None."""
+        now = time.time()
+        oldest = max(now - self.ttls.get(kind, DEFAULT_TTLS['search']), self.not_before)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < oldest:
+                return None
+            with self._db:
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return zlib.decompress(row[0])
+
+    def put(self, key: str, kind: str, body: bytes):
+        packed = zlib.compress(body, 1)
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, kind, body, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, packed, len(packed), now, now),
+            )
+            self._total += len(packed)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def fetch(self, key: str, kind: str, loader: Callable[[], bytes]) -> bytes:
+        """
+        Return the cached body for ``key`` or call ``loader`` once to produce it.
+
+        Concurrent callers asking for the same key wait for the first one.
+        If ``loader`` raises, nothing is stored and the exception propagates.
+        """
+        body = self.get(key, kind)
+        if body is not None:
+            self._count(hit=True)
+            return body
+
+        with self._lock:
+            waiter = self._inflight.get(key)
+            leader = waiter is None
+            if leader:
+                waiter = self._inflight[key] = _InFlight()
+
+        if not leader:
+            waiter.event.wait()
+            if waiter.body is not None:
+                self._count(hit=True)
+                return waiter.body
+            # The leader failed; try ourselves rather than sharing its error
+
+        self._count(hit=False)
+        try:
+            body = loader()
+            self.put(key, kind, body)
+            waiter.body = body
+            return body
+        finally:
+            if leader:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                waiter.event.set()
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    # -- maintenance ----------------------------------------------------------
+
+    def _evict(self):
+        """Drop least-recently-used rows until the cache is under 90% of its cap."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._total = total
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        for key, size in self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= target:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+        self._total = total
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+            self._total = 0
+
+    def summary(self) -> str:
+        return f"Cache: {self.hits} hits, {self.misses} misses ({self.path})"
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Forum-wide census: every category and board with its size.
+
+Discovery lists boards, but says nothing about how big they are, which is
+what crawl budgets and shard counts depend on. A census is one row per
+node - category or board - with:
+
+- ``topics``: topic starters (a board's count(*); a category's sum)
+- ``latest_post``: newest topic's post_time (a category's newest board)
+- ``kudos``: kudos total, when boards were swept for it (None otherwise)
+- ``parent_id`` / ``path``: the category tree, rebuilt from parent.id
+
+Rows are in tree order (each category followed by its boards and
+subcategories). A snapshot is saved as JSON (rows plus the nested tree,
+optionally .gz/.zst) or Parquet/Feather (rows), and ``diff_census``
+compares two snapshots without touching the API.
+
+Usage:
+    rows = build_census(categories, boards)     # node rows from the API client
+    save_census("data/census.parquet", rows, source=API_URL)
+
+    changes = diff_census(load_census("data/census.json"), rows)
+    for change in changes['changed']:
+        print(change['id'], change['delta'])
+"""
+
+import json
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from forum_columnar import ColumnarSink, census_schema, is_columnar, read_columnar_records
+from forum_sinks import open_stream, split_suffix
+
+# Every census row has these keys, in this order
+CENSUS_FIELDS = ('id', 'node_type', 'kind', 'title', 'parent_id', 'path', 'topics', 'latest_post',
+                 'kudos', 'error')
+
+
+def census_row(node_id: str, node_type: str, title: str = '', parent_id: Optional[str] = None,
+               **values) -> Dict[str, Any]:
+    """A census row with every CENSUS_FIELDS key (missing values are None)."""
+    row = dict.fromkeys(CENSUS_FIELDS)
+    row.update(id=node_id, node_type=node_type, title=title, parent_id=parent_id, **values)
+    return row
+
+
+def _time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _latest(values: Sequence[Optional[str]]) -> Optional[str]:
+    """The newest of several post_time strings (offsets may differ)."""
+    dated = [(_time(value), value) for value in values if _time(value)]
+    return max(dated)[1] if dated else None
+
+
+# =============================================================================
+# Tree
+# =============================================================================
+
+def build_census(categories: Sequence[Dict[str, Any]], boards: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Census rows in tree order, with paths and category totals filled in.
+
+    ``categories`` and ``boards`` are census rows; a node whose parent_id is
+    not a known category is a root. A category's topics and kudos are the
+    sums over everything below it (kudos None if any board lacks it).
+    """
+    category_ids = {row['id'] for row in categories}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+    for row in list(categories) + list(boards):
+        parent = row['parent_id'] if row['parent_id'] in category_ids else None
+        children[parent].append(dict(row))
+
+    rows: List[Dict[str, Any]] = []
+    visited = set()
+
+    def visit(row: Dict[str, Any], path: str):
+        row['path'] = f"{path}/{row['id']}" if path else row['id']
+        rows.append(row)
+        if row['node_type'] != 'category' or row['id'] in visited:
+            return
+        visited.add(row['id'])
+        below = sorted(children[row['id']], key=lambda child: (child['node_type'] == 'category', child['title'] or ''))
+        for child in below:
+            visit(child, row['path'])
+        row['topics'] = sum(child['topics'] or 0 for child in below)
+        row['latest_post'] = _latest([child['latest_post'] for child in below])
+        kudos = [child['kudos'] for child in below]
+        row['kudos'] = sum(kudos) if None not in kudos else None
+
+    for root in sorted(children[None], key=lambda row: (row['node_type'] == 'board', row['title'] or '')):
+        visit(root, '')
+    return rows
+
+
+def census_tree(rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The rows nested by parent: categories get a ``children`` list."""
+    nodes = {}
+    roots = []
+    for row in rows:
+        node = {key: value for key, value in row.items() if key != 'path'}
+        if row['node_type'] == 'category':
+            node['children'] = []
+            nodes[row['id']] = node
+        parent = nodes.get(row['parent_id'])
+        (parent['children'] if parent is not None else roots).append(node)
+    return roots
+
+
+# =============================================================================
+# Snapshots
+# =============================================================================
+
+def save_census(path, rows: Sequence[Dict[str, Any]], source: Optional[str] = None) -> Path:
+    """Write a snapshot: .parquet/.feather rows, or a JSON document (optionally .gz/.zst)."""
+    path = Path(path)
+    if is_columnar(path):
+        with ColumnarSink(path, census_schema(), source=source) as sink:
+            for row in rows:
+                sink.write(row)
+        return path
+    document = {
+        'taken_at': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'nodes': list(rows),
+        'tree': census_tree(rows),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = path.with_name(path.name + '.part')
+    with open_stream(part, 'w', split_suffix(path)[1]) as f:
+        json.dump(document, f, indent=2)
+    part.replace(path)
+    return path
+
+
+def load_census(path) -> List[Dict[str, Any]]:
+    """The rows of a snapshot written by save_census."""
+    if is_columnar(path):
+        return read_columnar_records(path)
+    with open_stream(path, 'r') as f:
+        return json.load(f)['nodes']
+
+
+# =============================================================================
+# Diff
+# =============================================================================
+
+def diff_census(old: Sequence[Dict[str, Any]], new: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    What changed between two snapshots' boards.
+
+    Returns ``added`` and ``removed`` board rows, ``changed`` entries (board id,
+    title, topics ``delta``, and old/new pairs for whatever moved: topics,
+    latest_post, parent_id, title) and ``topics_delta``, the net change.
+    """
+    before = {row['id']: row for row in old if row['node_type'] == 'board'}
+    after = {row['id']: row for row in new if row['node_type'] == 'board'}
+    changed = []
+    for board_id, row in after.items():
+        previous = before.get(board_id)
+        if previous is None:
+            continue
+        change: Dict[str, Any] = {}
+        if previous['topics'] != row['topics']:
+            change['topics'] = (previous['topics'], row['topics'])
+        if _time(previous['latest_post']) != _time(row['latest_post']):
+            change['latest_post'] = (previous['latest_post'], row['latest_post'])
+        for key in ('parent_id', 'title'):
+            if previous[key] != row[key]:
+                change[key] = (previous[key], row[key])
+        if change:
+            delta = (row['topics'] or 0) - (previous['topics'] or 0)
+            changed.append({'id': board_id, 'title': row['title'], 'delta': delta, **change})
+    added = [row for board_id, row in after.items() if board_id not in before]
+    removed = [row for board_id, row in before.items() if board_id not in after]
+    return {
+        'added': added,
+        'removed': removed,
+        'changed': sorted(changed, key=lambda change: -abs(change['delta'])),
+        'topics_delta': (sum(change['delta'] for change in changed) + sum(row['topics'] or 0 for row in added)
+                         - sum(row['topics'] or 0 for row in removed)),
+    }
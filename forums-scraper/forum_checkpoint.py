@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Checkpoints for long-running board crawls.
+
+A checkpoint is two files next to each other:
+
+    <name>.json    crawl position: next page cursor, pages done, crawl params
+    <name>.jsonl   every record produced so far, one JSON object per line
+
+Records are appended (and flushed) as they are produced; the cursor is
+committed once a page is complete. Resuming streams the saved records
+back (without loading them into memory), restarts from the last committed
+cursor and skips ids that were already produced from a half-finished page,
+so finished pages and their replies are never fetched twice.
+
+Usage:
+    checkpoint = CrawlCheckpoint("data/crawl.checkpoint.json", params={"board": board_id})
+    checkpoint.resume() if resuming else checkpoint.start()
+    yield from checkpoint.iter_restored()
+    for page, next_cursor in pages(cursor=checkpoint.cursor):  # unless checkpoint.finished
+        for record in page:
+            checkpoint.record(record)
+            yield record
+        checkpoint.commit(next_cursor)
+    checkpoint.discard()  # after the real output has been written
+
+A sharded crawl (several cursors over disjoint parts of a board, see
+forum_shards) registers its shards once with ``set_shards`` and commits
+pages with ``commit_shard``; each shard then resumes from its own cursor.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class CheckpointMismatch(ValueError):
+    """Raised when resuming a checkpoint written for different crawl parameters."""
+
+
+class CrawlCheckpoint:
+    """Persisted cursor + partial output of one crawl."""
+
+    def __init__(self, path: str, params: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        self.records_path = self.path.with_suffix('.jsonl')
+        self.params = params or {}
+        self.cursor: Optional[str] = None
+        self.finished = False
+        self.pages = 0
+        self.fetched = 0
+        self.done_ids: set = set()
+        self.shards: Dict[str, Dict[str, Any]] = {}  # key -> shard fields + cursor/finished
+        self.restored = 0
+        self._restored_bytes = 0
+        self._records = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def start(self) -> int:
+        """Begin a new crawl, dropping any previous checkpoint."""
+        self.discard()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._records = open(self.records_path, 'w', encoding='utf-8')
+        self.restored = 0
+        return 0
+
+    def resume(self) -> int:
+        """Reload state; returns how many records were produced before the interruption."""
+        if not self.exists():
+            print(f"No checkpoint at {self.path}; starting from the beginning")
+            return self.start()
+
+        state = json.loads(self.path.read_text(encoding='utf-8'))
+        if state.get('params') != self.params:
+            raise CheckpointMismatch(
+                f"Checkpoint {self.path} was written for {state.get('params')}, not {self.params}"
+            )
+        self.cursor = state.get('cursor')
+        self.finished = state.get('finished', False)
+        self.pages = state.get('pages', 0)
+        self.fetched = state.get('fetched', 0)
+        self.shards = state.get('shards', {})
+
+        # Scan once for ids and the end of the last complete line (a crash
+        # mid-write can leave a torn tail), then keep appending after it
+        valid_bytes = 0
+        if self.records_path.exists():
+            with open(self.records_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    self.restored += 1
+                    if record.get('id') is not None:
+                        self.done_ids.add(record['id'])
+        self._restored_bytes = valid_bytes
+        self._records = open(self.records_path, 'a+', encoding='utf-8')
+        self._records.truncate(valid_bytes)
+
+        print(f"Resuming from checkpoint: {self.restored} records, {self.pages} pages done")
+        return self.restored
+
+    def iter_restored(self) -> Iterator[dict]:
+        """Stream the records produced before the interruption (not held in memory)."""
+        if not self.restored:
+            return
+        with open(self.records_path, 'rb') as f:
+            remaining = self._restored_bytes
+            for line in f:
+                remaining -= len(line)
+                if remaining < 0:
+                    break
+                yield json.loads(line)
+
+    def record(self, record: dict):
+        """Append one produced record."""
+        self._write(record)
+        self._records.flush()
+
+    def commit(self, next_cursor: Optional[str], fetched: int = 0):
+        """Mark the current page complete; the crawl continues at ``next_cursor``
+        (None = that was the last page)."""
+        os.fsync(self._records.fileno())
+        self.cursor = next_cursor
+        self.finished = next_cursor is None
+        self.pages += 1
+        self.fetched += fetched
+        self._save()
+
+    def set_shards(self, shards: List[Dict[str, Any]]):
+        """Start a sharded crawl; each dict needs a unique 'key' (e.g. TimeShard.to_dict())."""
+        self.shards = {shard['key']: dict(shard, cursor=None, finished=False) for shard in shards}
+        self._save()
+
+    def commit_shard(self, key: str, next_cursor: Optional[str], fetched: int = 0):
+        """``commit`` for one shard; the crawl is finished once every shard is."""
+        os.fsync(self._records.fileno())
+        self.shards[key].update(cursor=next_cursor, finished=next_cursor is None)
+        self.finished = all(shard['finished'] for shard in self.shards.values())
+        self.pages += 1
+        self.fetched += fetched
+        self._save()
+
+    def _save(self):
+        state = {
+            'params': self.params,
+            'cursor': self.cursor,
+            'finished': self.finished,
+            'pages': self.pages,
+            'fetched': self.fetched,
+            'records': len(self.done_ids),
+            'updated_at': datetime.now().isoformat(),
+        }
+        if self.shards:
+            state['shards'] = self.shards
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(json.dumps(state, indent=2), encoding='utf-8')
+        tmp.replace(self.path)
+
+    def discard(self):
+        """Remove the checkpoint (call after the final output is safely written)."""
+        if self._records:
+            self._records.close()
+            self._records = None
+        for path in (self.path, self.records_path):
+            if path.exists():
+                path.unlink()
+
+    def _write(self, record: dict):
+        self._records.write(json.dumps(record, ensure_ascii=False) + '\n')
+        if record.get('id') is not None:
+            self.done_ids.add(record['id'])
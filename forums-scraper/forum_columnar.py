@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Parquet / Feather output for board exports.
+
+Records are written with an explicit Arrow schema instead of letting every
+reader re-infer types from CSV:
+
+- kudos, views and reply counts are integers, ``solved`` is a bool
+- post_date (and reply post_time) are UTC timestamps
+- status and board columns are dictionary-encoded (a handful of distinct
+  values repeated across thousands of rows)
+
+Like the CSV/JSON sinks, rows are buffered one row group at a time and the
+output is moved into place only when the export completes. With
+``partition_by=('board', 'year')`` the output is a hive-style directory
+(``board=revit-ideas-en/year=2024/part-0.parquet``) so readers can skip
+whole files with predicate pushdown. Every export also writes a small
+JSON manifest (schema, row counts, files).
+
+Requires pyarrow (``pip install pyarrow``); everything else in the scraper
+works without it.
+
+Usage:
+    with ColumnarSink("data/revit.parquet", message_schema(), partition_by=("year",)) as sink:
+        for record in records:
+            sink.write(record)
+
+    df = pd.read_parquet("data/revit.parquet", filters=[("year", ">=", 2023)])
+"""
+
+import json
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+
+COLUMNAR_SUFFIXES = ('.parquet', '.feather', '.arrow')
+DEFAULT_ROW_GROUP = 10000
+PARTITION_KEYS = ('board', 'year')
+
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet/Feather output needs pyarrow: pip install pyarrow")
+
+
+def is_columnar(path) -> bool:
+    return Path(path).suffix.lower() in COLUMNAR_SUFFIXES
+
+
+# =============================================================================
+# Schemas
+# =============================================================================
+
+def _category():
+    return pa.dictionary(pa.int32(), pa.string())
+
+
+def _timestamp():
+    return pa.timestamp('ms', tz='UTC')
+
+
+def message_schema(columns: Optional[Sequence[str]] = None) -> 'pa.Schema':
+    """
+    Schema for ``autodesk_forum_api.ForumMessage`` records, restricted to
+    ``columns`` if given (``autodesk_forum_api.message_columns``).
+    """
+    require_pyarrow()
+    schema = pa.schema([
+        ('id', pa.string()),
+        ('subject', pa.string()),
+        ('url', pa.string()),
+        ('kudos', pa.int64()),
+        ('views', pa.int64()),
+        ('replies', pa.int32()),
+        ('status', _category()),
+        ('post_date', _timestamp()),
+        ('author', pa.string()),
+        ('body_text', pa.string()),
+        ('solved', pa.bool_()),
+        ('labels', pa.string()),
+        ('board_id', _category()),
+        ('scraped_at', pa.timestamp('ms')),
+    ])
+    if columns is not None:
+        schema = pa.schema([column for column in schema if column.name in set(columns)])
+    return schema
+
+
+def census_schema() -> 'pa.Schema':
+    """Schema for ``forum_census`` node rows (one per category and board)."""
+    require_pyarrow()
+    return pa.schema([
+        ('id', pa.string()),
+        ('node_type', _category()),
+        ('kind', _category()),
+        ('title', pa.string()),
+        ('parent_id', pa.string()),
+        ('path', pa.string()),
+        ('topics', pa.int64()),
+        ('latest_post', _timestamp()),
+        ('kudos', pa.int64()),
+        ('error', pa.string()),
+    ])
+
+
+def idea_schema(flat: bool = False, columns: Optional[Sequence[str]] = None) -> 'pa.Schema':
+    """
+    Schema for ``acc_ideas_scraper_v2.normalize_idea`` records.
+
+    ``flat=True`` matches the CSV export (no body_html, no nested replies,
+    labels joined into one string). ``columns`` restricts the record columns
+    to those a field profile produces; board_id and replies are always kept.
+    """
+    require_pyarrow()
+    fields = [
+        ('id', pa.string()),
+        ('title', pa.string()),
+        ('body_html', pa.string()),
+        ('body_text', pa.string()),
+        ('url', pa.string()),
+        ('post_date', _timestamp()),
+        ('author_username', pa.string()),
+        ('author_id', pa.string()),
+        ('kudos', pa.int64()),
+        ('views', pa.int64()),
+        ('reply_count', pa.int32()),
+        ('status_key', _category()),
+        ('status_name', _category()),
+        ('conversation_id', pa.string()),
+        ('labels', pa.string() if flat else pa.list_(pa.string())),
+        ('board_id', _category()),
+        ('replies', pa.list_(pa.struct([
+            ('id', pa.string()),
+            ('author', pa.string()),
+            ('author_id', pa.string()),
+            ('body_html', pa.string()),
+            ('body_text', pa.string()),
+            ('post_time', _timestamp()),
+            ('kudos', pa.int64()),
+        ]))),
+    ]
+    if flat:
+        fields = [c for c in fields if c[0] not in ('body_html', 'replies')]
+    if columns is not None:
+        keep = set(columns) | {'board_id', 'replies'}
+        fields = [c for c in fields if c[0] in keep]
+    return pa.schema(fields)
+
+
+def _parse_time(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _coerce(value: Any, type_: 'pa.DataType') -> Any:
+    """Convert one JSON/CSV value to what ``pa.array`` expects for ``type_``."""
+    if value is None or value == '' and not pa.types.is_string(type_):
+        return None
+    if pa.types.is_timestamp(type_):
+        return _parse_time(value) if isinstance(value, str) else value
+    if pa.types.is_integer(type_):
+        return int(value)
+    if pa.types.is_boolean(type_):
+        return value if isinstance(value, bool) else str(value).lower() == 'true'
+    if pa.types.is_string(type_) or pa.types.is_dictionary(type_):
+        return str(value)
+    if pa.types.is_list(type_):
+        return [_coerce(item, type_.value_type) for item in value]
+    if pa.types.is_struct(type_):
+        return {child.name: _coerce(value.get(child.name), child.type) for child in type_}
+    return value
+
+
+def _partition_value(key: str, record: Dict[str, Any]) -> str:
+    if key == 'board':
+        return record.get('board_id') or 'unknown'
+    if key == 'year':
+        # The year of the UTC timestamp stored in the file, not of the local-time string
+        value = record.get('post_date')
+        when = _parse_time(value) if isinstance(value, str) else value
+        if not isinstance(when, datetime):
+            return 'unknown'
+        if when.tzinfo is not None:
+            when = when.astimezone(timezone.utc)
+        return str(when.year)
+    raise ValueError(f"Unknown partition key: {key} (expected one of {PARTITION_KEYS})")
+
+
+# =============================================================================
+# Writer
+# =============================================================================
+
+class ColumnarSink:
+    """
+    Streaming Parquet/Feather writer with the same interface as the
+    ``forum_sinks`` record sinks (write / flush / close / abort / discard).
+    """
+
+    def __init__(self, path, schema: 'pa.Schema', partition_by: Sequence[str] = (),
+                 row_group_size: int = DEFAULT_ROW_GROUP, defaults: Optional[Dict[str, Any]] = None,
+                 source: Optional[str] = None):
+        """
+        Args:
+            path: Output file, or directory when ``partition_by`` is set.
+                The format comes from the suffix (.parquet, .feather/.arrow)
+            schema: Arrow schema; record keys not in it are ignored
+            partition_by: Any of 'board', 'year' (hive-style directories)
+            row_group_size: Rows buffered per partition before writing
+            defaults: Values for columns a record lacks (e.g. board_id)
+            source: Free-form description stored in the manifest
+        """
+        require_pyarrow()
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + '.part')
+        self.schema = schema
+        self.format = 'parquet' if self.path.suffix.lower() == '.parquet' else 'feather'
+        self.partition_by = tuple(partition_by)
+        self.row_group_size = row_group_size
+        self.defaults = defaults or {}
+        self.source = source
+        self.count = 0
+        self.closed = False
+        self._buffers: Dict[tuple, list] = {}
+        self._writers: Dict[tuple, Any] = {}
+        self._rows: Dict[tuple, int] = {}
+
+        for key in self.partition_by:
+            if key not in PARTITION_KEYS:
+                raise ValueError(f"Unknown partition key: {key} (expected one of {PARTITION_KEYS})")
+        self._remove(self.part_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.partition_by:
+            self.part_path.mkdir()
+
+    def write(self, record: Dict[str, Any]):
+        if self.defaults:
+            record = {**self.defaults, **{k: v for k, v in record.items() if v is not None}}
+        key = tuple(_partition_value(k, record) for k in self.partition_by)
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(record)
+        self.count += 1
+        if len(buffer) >= self.row_group_size:
+            self._write_batch(key)
+
+    def flush(self):
+        """Row groups are written when full; flushing early would only make them small."""
+
+    def _file_for(self, key: tuple) -> Path:
+        if not self.partition_by:
+            return self.part_path
+        directory = self.part_path.joinpath(*(f"{k}={v}" for k, v in zip(self.partition_by, key)))
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f"part-0{self.path.suffix}"
+
+    def _write_batch(self, key: tuple):
+        rows = self._buffers.pop(key, [])
+        if not rows:
+            return
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array([_coerce(r.get(f.name), f.type) for r in rows], type=f.type) for f in self.schema],
+            schema=self.schema,
+        )
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = self._writers[key] = self._open_writer(self._file_for(key))
+        writer.write_batch(batch)
+        self._rows[key] = self._rows.get(key, 0) + len(rows)
+
+    def _open_writer(self, target: Path):
+        if self.format == 'parquet':
+            return pq.ParquetWriter(str(target), self.schema, compression='zstd')
+        options = pa.ipc.IpcWriteOptions(compression='lz4')
+        return pa.ipc.new_file(str(target), self.schema, options=options)
+
+    def close(self, final_path=None) -> Path:
+        """Write the remaining rows and the manifest, then move the output into place."""
+        if self.closed:
+            return self.path
+        for key in list(self._buffers):
+            self._write_batch(key)
+        if not self._writers and not self.partition_by:
+            # Keep a readable (empty) file rather than no file at all
+            self._writers[()] = self._open_writer(self.part_path)
+        self._close_writers()
+        self.closed = True
+
+        if final_path is not None:
+            self.path = Path(final_path)
+        self._remove(self.path)
+        self.part_path.replace(self.path)
+        self._write_manifest()
+        return self.path
+
+    def abort(self):
+        """Stop writing and leave the ``.part`` output behind."""
+        if not self.closed:
+            self._buffers.clear()
+            self._close_writers()
+            self.closed = True
+
+    def discard(self):
+        self.abort()
+        self._remove(self.part_path)
+
+    def _close_writers(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def manifest_path(self) -> Path:
+        if self.partition_by:
+            return self.path / '_manifest.json'
+        return self.path.with_name(self.path.name + '.manifest.json')
+
+    def _write_manifest(self):
+        files = []
+        for key, rows in sorted(self._rows.items()):
+            relative = self._file_for_final(key)
+            files.append({
+                'path': relative,
+                'rows': rows,
+                'partition': dict(zip(self.partition_by, key)),
+            })
+        manifest = {
+            'format': self.format,
+            'rows': self.count,
+            'partitioning': list(self.partition_by),
+            'schema': {f.name: str(f.type) for f in self.schema},
+            'files': files,
+            'source': self.source,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+        }
+        self.manifest_path().write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+    def _file_for_final(self, key: tuple) -> str:
+        if not self.partition_by:
+            return self.path.name
+        parts = [f"{k}={v}" for k, v in zip(self.partition_by, key)]
+        return '/'.join(parts + [f"part-0{self.path.suffix}"])
+
+    @staticmethod
+    def _remove(path: Path):
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+def read_columnar(path, columns: Optional[Iterable[str]] = None, filters=None):
+    """
+    Load a Parquet/Feather export (file or partitioned directory) as a DataFrame.
+
+    ``filters`` uses the pyarrow/pandas DNF form, e.g.
+    ``[("year", ">=", 2023), ("status_name", "=", "Implemented")]``; on Parquet
+    they are pushed down so non-matching row groups and partitions are skipped.
+    """
+    require_pyarrow()
+    import pyarrow.dataset as ds
+
+    path = Path(path)
+    suffix = path.suffix.lower()
+    fmt = 'parquet' if suffix == '.parquet' else 'ipc'
+    # Hive partition directories become columns; _manifest.json is skipped
+    dataset = ds.dataset(str(path), format=fmt, partitioning='hive' if path.is_dir() else None)
+    expression = pq.filters_to_expression(filters) if filters else None
+    table = dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+    return table.to_pandas()
+
+
+def read_columnar_records(path) -> list:
+    """
+    Load a single Parquet/Feather file as plain dicts, without pandas.
+    Timestamps come back as ISO 8601 strings, as in the JSON/CSV exports.
+    """
+    require_pyarrow()
+    import pyarrow.dataset as ds
+
+    path = Path(path)
+    fmt = 'parquet' if path.suffix.lower() == '.parquet' else 'ipc'
+    records = ds.dataset(str(path), format=fmt).to_table().to_pylist()
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, datetime):
+                record[key] = value.isoformat(timespec='milliseconds')
+    return records
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+HTML to plain text for Khoros message bodies.
+
+One converter for every exporter (idea bodies, replies, enriched board
+messages). It streams through the markup with an event parser - lxml's
+HTML push parser when lxml is installed, otherwise the standard library's
+``html.parser`` - without building a DOM, and:
+
+- puts each block element (paragraphs, list items, headings, table rows,
+  <br>, ...) on its own line
+- drops <script>/<style> (and other non-content) elements entirely
+- unescapes entities (&amp;, &nbsp;, &#8217;, ...)
+- collapses runs of whitespace inside a line and drops empty lines
+
+Usage:
+    text = html_to_text("<p>Hello&nbsp;<b>world</b></p><p>Bye</p>")   # 'Hello world\\nBye'
+    texts = html_to_text_many(bodies)                                   # batch, one parser
+    texts = html_to_text_many(bodies, workers=4)                        # batch on 4 processes
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional
+
+try:
+    from lxml import etree
+except ImportError:  # optional: html.parser gives the same text, just slower
+    etree = None
+
+
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'caption', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+    'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul',
+})
+SKIP_TAGS = frozenset({'script', 'style', 'head', 'noscript', 'template', 'iframe', 'object'})
+
+BATCH_CHUNK = 64  # documents per task when converting on worker processes
+
+
+class _TextCollector:
+    """Parser target: collects text chunks, with '\\n' markers at block boundaries."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.skipping = 0
+
+    def start(self, tag, attrib=None):
+        if tag in SKIP_TAGS:
+            self.skipping += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def end(self, tag):
+        if tag in SKIP_TAGS:
+            self.skipping = max(0, self.skipping - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+
+    def close(self) -> str:
+        lines = (' '.join(line.split()) for line in ''.join(self.parts).split('\n'))
+        self.parts = []
+        self.skipping = 0
+        return '\n'.join(line for line in lines if line)
+
+
+class _StdlibParser(HTMLParser):
+    """html.parser front end for _TextCollector (entities decoded by convert_charrefs)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.target = _TextCollector()
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/>, <hr/>: one boundary, and never opens a skipped element
+        if tag in BLOCK_TAGS and not self.target.skipping:
+            self.target.data('\n')
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+    def convert(self, html_content: str) -> str:
+        self.reset()
+        self.feed(html_content)
+        super().close()
+        return self.target.close()
+
+
+class _LxmlParser:
+    """libxml2's HTML push parser driving _TextCollector (about 2.5x html.parser)."""
+
+    def __init__(self):
+        self.target = _TextCollector()
+        self.parser = etree.HTMLParser(target=self.target)
+        self.fallback = None
+
+    def convert(self, html_content: str) -> str:
+        try:
+            self.parser.feed(html_content)
+            return self.parser.close()
+        except etree.LxmlError:
+            # libxml2 refuses a few degenerate inputs (e.g. whitespace only)
+            self.target.close()
+            self.parser = etree.HTMLParser(target=self.target)
+            self.fallback = self.fallback or _StdlibParser()
+            return self.fallback.convert(html_content)
+
+
+def _new_parser():
+    return _LxmlParser() if etree is not None else _StdlibParser()
+
+
+_local = threading.local()
+
+
+def _parser():
+    """One parser per thread, reused across documents."""
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = _local.parser = _new_parser()
+    return parser
+
+
+def html_to_text(html_content: Optional[str]) -> str:
+    """Convert an HTML fragment to readable plain text (block elements on their own lines)."""
+    if not html_content:
+        return ""
+    if '<' not in html_content and '&' not in html_content:
+        return '\n'.join(' '.join(line.split()) for line in html_content.split('\n') if line.strip())
+    return _parser().convert(html_content)
+
+
+def _convert_chunk(documents: List[Optional[str]]) -> List[str]:
+    parser = _parser()
+    return [parser.convert(doc) if doc else "" for doc in documents]
+
+
+def html_to_text_many(documents: Iterable[Optional[str]], workers: Optional[int] = None) -> List[str]:
+    """
+    Convert many fragments, reusing one parser; results are in input order.
+
+    ``workers`` > 1 spreads chunks of ``BATCH_CHUNK`` documents over that many
+    processes; process start-up makes that a loss for small batches (a few
+    thousand idea bodies convert in ~0.1 s on one core).
+    """
+    documents = list(documents)
+    if not workers or workers <= 1 or len(documents) <= BATCH_CHUNK:
+        return _convert_chunk(documents)
+    chunks = [documents[i:i + BATCH_CHUNK] for i in range(0, len(documents), BATCH_CHUNK)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [text for chunk in pool.map(_convert_chunk, chunks) for text in chunk]
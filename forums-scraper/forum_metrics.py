@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Per-request metrics for the forum clients.
+
+Both clients (``AutodeskForumAPI`` and ``acc_ideas_scraper_v2.liql_query``)
+record, per call type (search, message, replies, count, nodes):
+
+- requests sent, response bytes and HTTP status codes
+- a latency histogram (Prometheus-style cumulative buckets)
+- retries: 429 re-sends plus urllib3's connection/5xx retries
+- 429 responses, and seconds spent waiting in the rate limiter
+- seconds spent parsing JSON (or decoding it into forum_schema structs)
+- the LIMIT of each listing page, and pages re-requested smaller after a
+  timeout (forum_paging)
+- failed calls
+
+At the end of a run the metrics are written as JSON and as a Prometheus
+textfile (for node_exporter's textfile collector), and can be printed as a
+summary table.
+
+Usage:
+    metrics = RequestMetrics('autodesk_forum_api')
+    metrics.observe_wait('search', limiter.acquire())
+    started = time.perf_counter()
+    response = session.get(url)
+    metrics.observe_response('search', response, time.perf_counter() - started)
+    data = metrics.parse_json('search', response.content)
+    page = metrics.decode('search', response.content, MessageResponse)   # typed
+
+    metrics.write('data/acc_ideas.metrics.json')      # + data/acc_ideas.metrics.prom
+    print(metrics.summary())
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from forum_schema import decode
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _CallStats:
+    """Counters for one call type."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.retries = 0
+        self.throttled = 0
+        self.errors = 0
+        self.wait_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.parses = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # per bucket, last is +Inf
+        self.statuses: Dict[int, int] = {}
+        self.page_sizes: Dict[int, int] = {}  # LIMIT -> pages requested with it
+        self.page_shrinks = 0
+
+    def quantile(self, q: float) -> float:
+        """Latency quantile, interpolated within its bucket (like histogram_quantile)."""
+        if not self.requests:
+            return 0.0
+        rank = q * self.requests
+        seen = 0
+        lower = 0.0
+        for upper, count in zip(LATENCY_BUCKETS + (None,), self.buckets):
+            if count and seen + count >= rank:
+                if upper is None:
+                    return lower  # beyond the last bound: report the bound
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper if upper is not None else lower
+        return lower
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = []
+        running = 0
+        for upper, count in zip(LATENCY_BUCKETS + (float('inf'),), self.buckets):
+            running += count
+            cumulative.append(['+Inf' if upper == float('inf') else upper, running])
+        return {
+            'requests': self.requests,
+            'bytes': self.bytes,
+            'retries': self.retries,
+            'throttled_429': self.throttled,
+            'errors': self.errors,
+            'throttle_wait_seconds': round(self.wait_seconds, 6),
+            'parse_seconds': round(self.parse_seconds, 6),
+            'parses': self.parses,
+            'latency': {
+                'sum_seconds': round(self.latency_sum, 6),
+                'p50': round(self.quantile(0.50), 6),
+                'p90': round(self.quantile(0.90), 6),
+                'p99': round(self.quantile(0.99), 6),
+                'buckets': cumulative,
+            },
+            'statuses': {str(code): n for code, n in sorted(self.statuses.items())},
+            'page_sizes': {str(size): n for size, n in sorted(self.page_sizes.items())},
+            'page_shrinks': self.page_shrinks,
+        }
+
+
+class RequestMetrics:
+    """Thread-safe request metrics, keyed by call type."""
+
+    def __init__(self, client: str):
+        self.client = client
+        self.started = time.time()
+        self._calls: Dict[str, _CallStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, kind: str) -> _CallStats:
+        stats = self._calls.get(kind)
+        if stats is None:
+            stats = self._calls[kind] = _CallStats()
+        return stats
+
+    # -- recording ------------------------------------------------------------
+
+    def observe_request(self, kind: str, seconds: float, nbytes: int, status: int):
+        with self._lock:
+            stats = self._stats(kind)
+            stats.requests += 1
+            stats.bytes += nbytes
+            stats.latency_sum += seconds
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status == 429:
+                stats.throttled += 1
+            for i, upper in enumerate(LATENCY_BUCKETS):
+                if seconds <= upper:
+                    stats.buckets[i] += 1
+                    break
+            else:
+                stats.buckets[-1] += 1
+
+    def observe_response(self, kind: str, response, seconds: float):
+        """Record a ``requests.Response``, including retries urllib3 made for it."""
+        retry = getattr(getattr(response, 'raw', None), 'retries', None)
+        history = getattr(retry, 'history', None) or ()
+        if history:
+            self.observe_retry(kind, len(history))
+        self.observe_request(kind, seconds, len(response.content), response.status_code)
+
+    def observe_retry(self, kind: str, count: int = 1):
+        with self._lock:
+            self._stats(kind).retries += count
+
+    def observe_wait(self, kind: str, seconds: float):
+        """Time spent blocked in the rate limiter before a request."""
+        if seconds:
+            with self._lock:
+                self._stats(kind).wait_seconds += seconds
+
+    def observe_error(self, kind: str):
+        with self._lock:
+            self._stats(kind).errors += 1
+
+    def observe_page_size(self, kind: str, size: int):
+        """The LIMIT a listing page is about to be requested with."""
+        with self._lock:
+            stats = self._stats(kind)
+            stats.page_sizes[size] = stats.page_sizes.get(size, 0) + 1
+
+    def observe_page_shrink(self, kind: str):
+        """A page timed out and is re-requested with a smaller LIMIT."""
+        with self._lock:
+            self._stats(kind).page_shrinks += 1
+
+    def parse_json(self, kind: str, body: bytes) -> Any:
+        """``json.loads`` that records the time it took."""
+        started = time.perf_counter()
+        data = json.loads(body)
+        self._observe_parse(kind, time.perf_counter() - started)
+        return data
+
+    def decode(self, kind: str, body: bytes, schema: Optional[type] = None) -> Any:
+        """``forum_schema.decode`` into ``schema`` (plain JSON without one), timed like parse_json."""
+        if schema is None:
+            return self.parse_json(kind, body)
+        started = time.perf_counter()
+        try:
+            return decode(body, schema)
+        finally:
+            self._observe_parse(kind, time.perf_counter() - started)
+
+    def _observe_parse(self, kind: str, elapsed: float):
+        with self._lock:
+            stats = self._stats(kind)
+            stats.parse_seconds += elapsed
+            stats.parses += 1
+
+    # -- reporting ------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {kind: stats.to_dict() for kind, stats in sorted(self._calls.items())}
+
+    def to_dict(self) -> Dict[str, Any]:
+        calls = self.snapshot()
+        total_keys = ('requests', 'bytes', 'retries', 'throttled_429', 'errors',
+                      'throttle_wait_seconds', 'parse_seconds')
+        return {
+            'client': self.client,
+            'started_at': self.started,
+            'elapsed_seconds': round(time.time() - self.started, 3),
+            'totals': {key: round(sum(c[key] for c in calls.values()), 6) for key in total_keys},
+            'calls': calls,
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (one labelled series per call type)."""
+        calls = self.snapshot()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: List[Tuple[str, Any]]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        def labels(call: str, **extra) -> str:
+            pairs = {'client': self.client, 'call': call, **extra}
+            return ','.join(f'{k}="{v}"' for k, v in pairs.items())
+
+        counters = [
+            ('forum_requests_total', 'requests', 'HTTP requests sent'),
+            ('forum_response_bytes_total', 'bytes', 'Response body bytes (after gzip decoding)'),
+            ('forum_retries_total', 'retries', 'Requests re-sent after a 429, 5xx or connection error'),
+            ('forum_throttled_total', 'throttled_429', 'Responses with status 429'),
+            ('forum_errors_total', 'errors', 'Calls that failed after retries'),
+            ('forum_throttle_wait_seconds_total', 'throttle_wait_seconds', 'Seconds spent waiting in the rate limiter'),
+            ('forum_parse_seconds_total', 'parse_seconds', 'Seconds spent parsing JSON responses'),
+        ]
+        for name, key, help_text in counters:
+            family(name, 'counter', help_text, [(labels(call), c[key]) for call, c in calls.items()])
+
+        family('forum_responses_total', 'counter', 'HTTP responses by status code',
+               [(labels(call, code=code), n) for call, c in calls.items() for code, n in c['statuses'].items()])
+        family('forum_page_limit_total', 'counter', 'Listing pages requested, by LIMIT',
+               [(labels(call, limit=size), n) for call, c in calls.items() for size, n in c['page_sizes'].items()])
+        family('forum_page_shrinks_total', 'counter', 'Listing pages re-requested with a smaller LIMIT after a timeout',
+               [(labels(call), c['page_shrinks']) for call, c in calls.items() if c['page_sizes']])
+
+        name = 'forum_request_duration_seconds'
+        lines.append(f"# HELP {name} Request latency")
+        lines.append(f"# TYPE {name} histogram")
+        for call, c in calls.items():
+            for upper, count in c['latency']['buckets']:
+                lines.append(f"{name}_bucket{{{labels(call, le=upper)}}} {count}")
+            lines.append(f"{name}_sum{{{labels(call)}}} {c['latency']['sum_seconds']}")
+            lines.append(f"{name}_count{{{labels(call)}}} {c['requests']}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, json_path) -> Tuple[Path, Path]:
+        """Write ``json_path`` and a Prometheus textfile next to it (``.prom``)."""
+        json_path = Path(json_path)
+        name = json_path.name[:-len('.json')] if json_path.name.endswith('.json') else json_path.name
+        prom_path = json_path.with_name(name + '.prom')
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(json_path, json.dumps(self.to_dict(), indent=2))
+        _write_atomic(prom_path, self.to_prometheus())
+        return json_path, prom_path
+
+    def summary(self) -> str:
+        """Table of the per-call metrics, plus totals."""
+        calls = self.snapshot()
+        if not calls:
+            return "Metrics: no requests"
+        header = ['call', 'requests', 'MB', 'p50 ms', 'p99 ms', 'retries', '429s', 'errors',
+                  'throttle s', 'parse s']
+        rows = []
+        for call, c in calls.items():
+            rows.append([
+                call, f"{c['requests']:,}", f"{c['bytes'] / 1e6:.2f}",
+                f"{c['latency']['p50'] * 1000:.0f}", f"{c['latency']['p99'] * 1000:.0f}",
+                str(c['retries']), str(c['throttled_429']), str(c['errors']),
+                f"{c['throttle_wait_seconds']:.1f}", f"{c['parse_seconds']:.2f}",
+            ])
+        totals = self.to_dict()['totals']
+        rows.append([
+            'total', f"{totals['requests']:,.0f}", f"{totals['bytes'] / 1e6:.2f}", '', '',
+            f"{totals['retries']:.0f}", f"{totals['throttled_429']:.0f}", f"{totals['errors']:.0f}",
+            f"{totals['throttle_wait_seconds']:.1f}", f"{totals['parse_seconds']:.2f}",
+        ])
+        widths = [max(len(r[i]) for r in [header] + rows) for i in range(len(header))]
+        out = [f"Request metrics ({self.client}):"]
+        for row in [header] + rows:
+            out.append("  " + "  ".join(cell.ljust(w) if i == 0 else cell.rjust(w)
+                                        for i, (cell, w) in enumerate(zip(row, widths))))
+        for call, c in calls.items():
+            if c['page_sizes']:
+                sizes = ', '.join(f"{size}x{n}" for size, n in c['page_sizes'].items())
+                shrinks = f" ({c['page_shrinks']} shrunk after a timeout)" if c['page_shrinks'] else ''
+                out.append(f"  {call} page sizes (LIMIT x pages): {sizes}{shrinks}")
+        return '\n'.join(out)
+
+
+def _write_atomic(path: Path, text: str):
+    # The textfile collector may read at any moment; never expose a half-written file
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def default_metrics_path(output: Optional[str]) -> Path:
+    """``<output>.metrics.json`` next to an export, else ./forum_metrics.json."""
+    if not output:
+        return Path('forum_metrics.json')
+    output = Path(output)
+    return output.with_name(output.name + '.metrics.json')
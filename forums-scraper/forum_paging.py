@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Adaptive page sizes for LiQL listings.
+
+A fixed ``LIMIT 100`` is wrong both ways: a page of ideas with their
+body HTML can be several hundred KB and slow enough to time out, while a
+metadata-only page is a few KB and could hold ten times as many topics
+(fewer requests, fewer rate-limiter tokens). ``PageSizer`` picks the LIMIT
+of each page of one listing from how the previous pages went:
+
+- after each page, the size that would have taken ``target_seconds`` of
+  server time and ``target_bytes`` of payload (whichever is smaller),
+  growing at most ``GROWTH``-fold per page;
+- after a page that timed out or failed with a 502/504 (``is_page_timeout``),
+  half the size - the caller re-requests the same cursor, so nothing is
+  skipped or read twice - and never again more than 3/4 of the size that
+  failed, so the listing settles instead of timing out every other page;
+- always between ``MIN_PAGE_SIZE`` and ``MAX_PAGE_SIZE`` (LiQL's LIMIT
+  ceiling).
+
+``PageSizer.fixed(100)`` keeps the old behaviour (and gives up on the
+first timeout). Either way the LIMIT of every page is recorded in the
+client's RequestMetrics. Pages served from the response cache carry no
+timing and leave the size alone; since the LIMIT is part of the cache key,
+adaptive runs reuse fewer cached pages than fixed ones.
+
+The clients send adaptive listing pages without retrying timeouts
+(``Transport.get(retry_timeouts=False)``, a scraper session with no read
+retries) while the page can still shrink, so a page that is too big is
+shrunk after one timeout rather than after a full round of retries, and
+doesn't trip the circuit breaker. Failed pages that get shrunk are counted
+as shrinks, not as errors; at the smallest size timeouts are retried as usual.
+
+Usage:
+    sizer = PageSizer(metrics=metrics)
+    while True:
+        limit = sizer.next_size(wanted)
+        shrinkable = sizer.can_shrink
+        try:
+            page, response = fetch(cursor, limit, retry_timeouts=not shrinkable)
+        except requests.RequestException as e:
+            if shrinkable and is_page_timeout(e):
+                sizer.shrink()
+                continue  # same cursor, smaller page
+            raise
+        sizer.observe_response(len(page.items), response)
+        cursor = page.next_cursor
+"""
+
+from typing import Any, Dict, List, Optional
+
+import requests
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+
+from forum_metrics import RequestMetrics
+from forum_transport import PAGE_TIMEOUT_STATUSES, TransportError
+
+DEFAULT_PAGE_SIZE = 100  # the fixed LIMIT both clients used to send
+MIN_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 1000  # LiQL rejects larger LIMITs
+PAGE_STEP = 10  # sizes are rounded down to a multiple of this, so queries repeat
+GROWTH = 2.0  # at most double the size from one page to the next
+TARGET_SECONDS = 5.0  # server time per page; well inside the clients' 30s read timeout
+TARGET_BYTES = 1_000_000  # decoded payload per page
+
+
+def is_page_timeout(error: BaseException) -> bool:
+    """
+    True if a failed page request might succeed with a smaller LIMIT: a read
+    timeout or a 502/504, also when it surfaces wrapped (urllib3's
+    MaxRetryError, forum_transport's TransportError).
+    """
+    if isinstance(error, requests.ReadTimeout):
+        return True
+    if isinstance(error, TransportError):
+        return error.reason == 'ReadTimeout' or error.reason in {
+            f"HTTP {code}" for code in PAGE_TIMEOUT_STATUSES}
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in PAGE_TIMEOUT_STATUSES
+    if isinstance(error, requests.ConnectionError):
+        cause = error.args[0] if error.args else None
+        return isinstance(cause, MaxRetryError) and isinstance(cause.reason, ReadTimeoutError)
+    return False
+
+
+class PageSizer:
+    """LIMIT of the next page of one listing (one sizer per cursor walk)."""
+
+    def __init__(self, initial: int = DEFAULT_PAGE_SIZE, minimum: int = MIN_PAGE_SIZE,
+                 maximum: int = MAX_PAGE_SIZE, target_seconds: float = TARGET_SECONDS,
+                 target_bytes: int = TARGET_BYTES, metrics: Optional[RequestMetrics] = None,
+                 kind: str = 'search'):
+        """
+        Args:
+            initial: LIMIT of the first page
+            minimum, maximum: Bounds of the LIMIT (equal for a fixed size)
+            target_seconds: Server time a page should take (time to the response headers)
+            target_bytes: Decoded response size a page should have
+            metrics: Where each page's LIMIT and each shrink are recorded
+            kind: Call type the metrics are recorded under
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.metrics = metrics
+        self.kind = kind
+        self.ceiling = maximum  # lowered below sizes that timed out
+        self.size = self._clamp(initial)
+        self.sizes: List[int] = []  # LIMIT of every page requested
+        self.shrinks = 0
+
+    @classmethod
+    def fixed(cls, size: int = DEFAULT_PAGE_SIZE, metrics: Optional[RequestMetrics] = None,
+              kind: str = 'search') -> 'PageSizer':
+        return cls(size, size, size, metrics=metrics, kind=kind)
+
+    @property
+    def adaptive(self) -> bool:
+        return self.minimum < self.maximum
+
+    @property
+    def can_shrink(self) -> bool:
+        """False at the smallest size (and always for a fixed one): retry timeouts as usual."""
+        return self.size > self.minimum
+
+    def _clamp(self, size: float) -> int:
+        size = int(size)
+        if size >= PAGE_STEP:
+            size -= size % PAGE_STEP
+        return max(self.minimum, min(self.ceiling, size))
+
+    def next_size(self, wanted: Optional[int] = None) -> int:
+        """LIMIT for the next request; never more than ``wanted`` (items still needed)."""
+        size = self.size if wanted is None else max(1, min(self.size, wanted))
+        self.sizes.append(size)
+        if self.metrics:
+            self.metrics.observe_page_size(self.kind, size)
+        return size
+
+    def observe(self, items: int, seconds: float, nbytes: int):
+        """Resize after a page of ``items`` took ``seconds`` and ``nbytes``."""
+        if items <= 0 or not self.adaptive:
+            return
+        fit = min(self.target_seconds * items / max(seconds, 1e-3),
+                  self.target_bytes * items / max(nbytes, 1))
+        self.size = self._clamp(min(fit, self.size * GROWTH))
+
+    def observe_response(self, items: int, response):
+        """observe() a ``requests.Response`` that carried ``items`` (None: served from cache)."""
+        if response is not None:
+            self.observe(items, response.elapsed.total_seconds(), len(response.content))
+
+    def shrink(self) -> bool:
+        """Halve the size after a page timed out; False if it can't get smaller."""
+        if not self.can_shrink:
+            return False
+        self.ceiling = max(self.minimum, self.size * 3 // 4)
+        self.size = self._clamp(self.size // 2)
+        self.shrinks += 1
+        if self.metrics:
+            self.metrics.observe_page_shrink(self.kind)
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        return {'pages': len(self.sizes), 'sizes': self.sizes, 'shrinks': self.shrinks,
+                'next': self.size, 'ceiling': self.ceiling}
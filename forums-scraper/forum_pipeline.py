@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Pipelining helpers for the crawlers: overlap network, CPU and disk.
+
+A crawl is three kinds of work - waiting on the API, turning HTML into
+text, and writing output. Run back-to-back on one thread the total is
+their sum; these helpers let each run while the others do:
+
+- ``prefetch``  runs a generator on a background thread, up to ``depth``
+                items ahead (e.g. request page k+1 as soon as page k's
+                cursor is known)
+- ``map_stage`` applies a function on an executor (a process pool for
+                CPU-bound parsing) with a bounded number of items in
+                flight, yielding results in input order
+- ``interleave`` runs several generators at once (e.g. one cursor per
+                time shard of a board), yielding items as they arrive
+- ``WriteBehindSink`` moves sink writes to a writer thread behind a
+                bounded queue
+
+All queues are bounded, so a slow stage applies back-pressure instead of
+buffering the whole board in memory. Errors in any stage are re-raised in
+the consumer.
+
+Usage:
+    pages = prefetch(fetch_pages(), depth=2)
+    with ProcessPoolExecutor() as pool:
+        for page in map_stage(normalize_page, pages, pool, depth=4):
+            for record in page:
+                sink.write(record)
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Iterable, Iterator, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_DONE = object()
+_POLL = 0.1  # seconds between checks for a cancelled consumer
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up once the consumer has gone away."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def prefetch(iterable: Iterable[T], depth: int = 2) -> Iterator[T]:
+    """
+    Iterate ``iterable`` on a background thread, at most ``depth`` items ahead.
+
+    Closing the returned generator (or breaking out of the loop) stops the
+    producer after its current item.
+    """
+    q: queue.Queue = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if not _put(q, (True, item), stop):
+                    return
+            _put(q, (True, _DONE), stop)
+        except BaseException as e:  # handed to the consumer
+            _put(q, (False, e), stop)
+
+    threading.Thread(target=produce, name='prefetch', daemon=True).start()
+    try:
+        while True:
+            ok, item = q.get()
+            if not ok:
+                raise item
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def map_stage(fn: Callable[[T], R], iterable: Iterable[T], executor: Executor,
+              depth: int = 2) -> Iterator[R]:
+    """``map(fn, iterable)`` on ``executor`` with up to ``depth`` calls in flight, in order."""
+    window: deque = deque()
+    try:
+        for item in iterable:
+            window.append(executor.submit(fn, item))
+            if len(window) >= depth:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+    finally:
+        for future in window:
+            future.cancel()
+
+
+def interleave(iterables: Sequence[Iterable[T]], workers: int,
+               depth: int = 2) -> Iterator[Tuple[int, T]]:
+    """
+    Iterate ``iterables`` on up to ``workers`` threads at once, yielding
+    (index of the iterable, item) in arrival order.
+
+    A thread that finishes its iterable takes the next unstarted one. At most
+    ``depth`` items per thread wait for the consumer; closing the returned
+    generator stops every thread after its current item.
+    """
+    q: queue.Queue = queue.Queue(maxsize=max(1, depth * workers))
+    stop = threading.Event()
+    pending = deque(enumerate(iterables))
+    lock = threading.Lock()
+
+    def produce():
+        try:
+            while not stop.is_set():
+                with lock:
+                    if not pending:
+                        break
+                    index, iterable = pending.popleft()
+                for item in iterable:
+                    if not _put(q, (True, (index, item)), stop):
+                        return
+            _put(q, (True, _DONE), stop)
+        except BaseException as e:  # handed to the consumer
+            _put(q, (False, e), stop)
+
+    threads = [threading.Thread(target=produce, name=f'interleave-{n}', daemon=True)
+               for n in range(max(1, min(workers, len(pending))))]
+    for thread in threads:
+        thread.start()
+    running = len(threads)
+    try:
+        while running:
+            ok, item = q.get()
+            if not ok:
+                raise item
+            if item is _DONE:
+                running -= 1
+                continue
+            yield item
+    finally:
+        stop.set()
+
+
+class WriteBehindSink:
+    """
+    Wrap a ``forum_sinks``/``forum_columnar`` sink so writes happen on a
+    writer thread. ``write`` only blocks when ``depth`` records are queued.
+    """
+
+    def __init__(self, sink, depth: int = 1000):
+        self.sink = sink
+        self.count = 0  # records accepted (the writer may still be behind)
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)
+        self._error = None
+        self._thread = threading.Thread(target=self._drain, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while True:
+            record = self._queue.get()
+            if record is _DONE:
+                return
+            if self._error is None:
+                try:
+                    self.sink.write(record)
+                except BaseException as e:
+                    self._error = e  # keep draining so producers never block
+
+    def _check(self):
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def path(self):
+        return self.sink.path
+
+    def write(self, record):
+        self._check()
+        self._queue.put(record)
+        self.count += 1
+
+    def flush(self):
+        """Records are written by the writer thread as soon as it gets to them."""
+
+    def _finish_writes(self):
+        if self._thread.is_alive():
+            self._queue.put(_DONE)
+            self._thread.join()
+
+    def close(self, final_path=None):
+        self._finish_writes()
+        self._check()
+        return self.sink.close(final_path)
+
+    def abort(self):
+        self._finish_writes()
+        self.sink.abort()
+
+    def discard(self):
+        self._finish_writes()
+        self.sink.discard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Field-projection profiles for LiQL message queries.
+
+A profile names how much of each message a run needs; it builds both the
+SELECT list and (through ``Projection.has``) what the normalizers fill in,
+so payload size and parse time follow the run instead of the worst case:
+
+    minimal      ranking and filtering: id, subject, kudos, reply count, status
+    metrics      + url, post time, views, author, conversation id/solved
+    full         + body HTML
+    full+labels  + labels
+
+Usage:
+    projection = Projection('metrics')
+    query = f"SELECT {projection.select()} FROM messages WHERE ..."
+    if projection.has('body'):
+        record['body_text'] = html_to_text(item.body)
+
+Clients that have no use for some fields pass ``available`` and only those
+are selected (e.g. the board exporter never selects author.id).
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+FIELD_GROUPS: Dict[str, Tuple[str, ...]] = {
+    'ranking': ('id', 'subject', 'kudos.sum(weight)', 'conversation.messages_count',
+                'status.key', 'status.name'),
+    'metadata': ('view_href', 'post_time', 'metrics.views', 'author.login', 'author.id',
+                 'conversation.id', 'conversation.solved'),
+    'body': ('body',),
+    'labels': ('labels',),
+}
+
+PROFILES: Dict[str, Tuple[str, ...]] = {
+    'minimal': ('ranking',),
+    'metrics': ('ranking', 'metadata'),
+    'full': ('ranking', 'metadata', 'body'),
+    'full+labels': ('ranking', 'metadata', 'body', 'labels'),
+}
+
+
+class Projection:
+    """The LiQL fields of one profile, restricted to what a client can use."""
+
+    def __init__(self, profile: str = 'full', available: Optional[Iterable[str]] = None):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile: {profile} (expected one of {', '.join(PROFILES)})")
+        self.profile = profile
+        self.groups = PROFILES[profile]
+        usable = set(available) if available is not None else None
+        self.fields: List[str] = [
+            name for group in self.groups for name in FIELD_GROUPS[group]
+            if usable is None or name in usable
+        ]
+
+    def has(self, field: str) -> bool:
+        """True if the LiQL ``field`` (e.g. 'body', 'status.name') is selected."""
+        return field in self.fields
+
+    def select(self) -> str:
+        return ', '.join(self.fields)
+
+    def __repr__(self):
+        return f"Projection({self.profile!r}, {len(self.fields)} fields)"
+
+    def __eq__(self, other):
+        return isinstance(other, Projection) and self.fields == other.fields
+
+    def __hash__(self):
+        return hash(tuple(self.fields))
+
+
+def label_texts(raw) -> List[str]:
+    """Label names of a forum_schema.Message (``labels`` is a Khoros collection)."""
+    return [label.text for label in raw.labels.items if label.text]
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Adaptive token-bucket rate limiter for Khoros API calls.
+
+Replaces the fixed ``time.sleep(delay)`` throttling in both forum clients:
+
+- a sustained rate plus a burst allowance (token bucket), so time already
+  spent waiting on a slow response counts toward the budget;
+- AIMD adaptation: a 429 halves the effective rate and honors
+  ``Retry-After``, successes slowly restore it;
+- coordination across threads (a lock) and across scraper processes on
+  the same host (a ``flock``-ed state file in the temp directory).
+
+Usage:
+    limiter = RateLimiter(rate=2.0, burst=4)
+    limiter.acquire()                 # blocks until a token is available
+    response = session.get(url)
+    if response.status_code == 429:
+        limiter.penalize(parse_retry_after(response.headers.get('Retry-After')))
+    else:
+        limiter.reward()
+"""
+
+import json
+import math
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process coordination only
+    fcntl = None
+
+
+DEFAULT_RATE = 2.0  # requests per second, same pace as the old 0.5s delay
+DEFAULT_BURST = 4
+DEFAULT_BACKOFF = 5.0  # seconds to pause on a 429 without Retry-After
+MIN_FACTOR = 1 / 16  # never slow down below rate/16
+RECOVERY_STEP = 0.05  # additive increase per successful request
+
+
+def default_state_path(host: str = 'forums.autodesk.com') -> Path:
+    """
+    Per-host state file shared by every scraper process on this machine.
+
+    ``host`` may also be a base URL (``http://127.0.0.1:8765``); its host and
+    port name the file, so a stub server never shares a bucket with the real site.
+    """
+    if '://' in host:
+        host = urlsplit(host).netloc
+    name = re.sub(r'[^A-Za-z0-9.-]', '_', host) or 'default'
+    return Path(tempfile.gettempdir()) / f"khoros-ratelimit-{name}.json"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Token bucket with 429 backoff, shared by threads and processes."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 state_path: Optional[Path] = None):
+        """
+        Args:
+            rate: Sustained requests per second (``math.inf`` disables throttling)
+            burst: Tokens that may accumulate while idle
+            state_path: Shared state file for cross-process coordination;
+                None keeps the bucket private to this process
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.state_path = Path(state_path) if state_path and fcntl else None
+        self._lock = threading.Lock()
+        self._state = {
+            'tokens': float(self.burst),
+            'updated': time.time(),
+            'blocked_until': 0.0,
+            'factor': 1.0,
+        }
+
+    @classmethod
+    def from_delay(cls, delay: float, **kwargs) -> "RateLimiter":
+        """Build a limiter equivalent to sleeping ``delay`` seconds per request."""
+        return cls(rate=1 / delay if delay > 0 else math.inf, **kwargs)
+
+    @property
+    def effective_rate(self) -> float:
+        return self.rate * self._state['factor']
+
+    # -- public API -----------------------------------------------------------
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns the seconds spent waiting."""
+        if math.isinf(self.rate):
+            # Unthrottled, but a 429's Retry-After still applies
+            pause = self._state['blocked_until'] - time.time()
+            if pause > 0:
+                time.sleep(pause)
+                return pause
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._locked_state() as state:
+                now = time.time()
+                self._refill(state, now)
+                if now >= state['blocked_until'] and state['tokens'] >= 1:
+                    state['tokens'] -= 1
+                    return waited
+                rate = max(self.rate * state['factor'], 1e-6)
+                wait = max(state['blocked_until'] - now, (1 - state['tokens']) / rate, 0.001)
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Record a 429: pause everyone and halve the effective rate."""
+        with self._locked_state() as state:
+            now = time.time()
+            pause = retry_after if retry_after is not None else DEFAULT_BACKOFF
+            state['blocked_until'] = max(state['blocked_until'], now + pause)
+            state['factor'] = max(MIN_FACTOR, state['factor'] / 2)
+            state['tokens'] = 0.0
+            state['updated'] = now
+
+    def reward(self):
+        """Record a successful request: creep back toward the configured rate."""
+        with self._locked_state() as state:
+            if state['factor'] < 1.0:
+                state['factor'] = min(1.0, state['factor'] + RECOVERY_STEP)
+
+    # -- internals ------------------------------------------------------------
+
+    def _refill(self, state: dict, now: float):
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(self.burst, state['tokens'] + elapsed * self.rate * state['factor'])
+        state['updated'] = now
+
+    def _locked_state(self):
+        return _SharedState(self)
+
+
+class _SharedState:
+    """Context manager yielding the bucket state under thread + file locks."""
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+        self.handle = None
+
+    def __enter__(self) -> dict:
+        limiter = self.limiter
+        limiter._lock.acquire()
+        if not limiter.state_path:
+            return limiter._state
+        try:
+            limiter.state_path.parent.mkdir(parents=True, exist_ok=True)
+            self.handle = open(limiter.state_path, 'a+', encoding='utf-8')
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+            self.handle.seek(0)
+            raw = self.handle.read()
+            loaded = json.loads(raw) if raw else None
+            if isinstance(loaded, dict):
+                limiter._state.update(loaded)
+        except (OSError, ValueError):
+            # A corrupt or unreadable state file must never stop a crawl
+            pass
+        except BaseException:
+            self._release()
+            raise
+        return limiter._state
+
+    def __exit__(self, *exc):
+        try:
+            if self.handle:
+                self.handle.seek(0)
+                self.handle.truncate()
+                json.dump(self.limiter._state, self.handle)
+                self.handle.flush()
+        except OSError:
+            pass
+        finally:
+            self._release()
+        return False
+
+    def _release(self):
+        try:
+            if self.handle:
+                fcntl.flock(self.handle, fcntl.LOCK_UN)
+                self.handle.close()
+        finally:
+            self.handle = None
+            self.limiter._lock.release()
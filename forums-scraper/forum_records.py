@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory storage for scraped records.
+
+A list of dicts pays for a hash table per record and a separate object per
+value, and an idea holds its body twice (body_html and the body_text
+derived from it). ``RecordStore`` keeps records column by column instead:
+
+- integers and booleans in ``array`` columns (8 bytes / 1 byte a value)
+- repetitive strings (authors, statuses, boards) as integer codes into
+  one table of distinct, interned values
+- HTML bodies once; the text column is derived from them when a record
+  is read (a text that doesn't match the derivation is kept as is)
+- nested lists (idea replies) as one child store plus offsets
+
+Records go in and come out as plain dicts with the same keys in the same
+order (fields a record did not have stay absent), so a store can be fed
+by the crawlers and streamed into any forum_sinks / forum_columnar sink.
+
+Usage:
+    store = idea_store(to_text=strip_html)
+    for idea in fetch_all_ideas():
+        store.append(idea)
+    store.write_to(JsonArraySink("ideas.json"))
+
+    kudos, ids = store.column('kudos'), store.column('id')
+    for i in sorted(range(len(store)), key=lambda i: (-kudos[i], ids[i])):
+        sink.write(store[i])
+
+    by_id = store.keyed('id')          # read-only mapping: id -> record dict
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from forum_html import html_to_text
+
+_MISSING = object()  # the record had no such key
+
+# Column kinds: 'str', 'category', 'int', 'bool', 'object', ('text', <html column>),
+# or a dict of kinds for a nested list of records
+Kind = Union[str, Tuple[str, str], Dict[str, Any]]
+
+REPLY_KINDS: Dict[str, Kind] = {
+    'id': 'str',
+    'author': 'category',
+    'author_id': 'category',
+    'body_html': 'str',
+    'body_text': ('text', 'body_html'),
+    'post_time': 'str',
+    'kudos': 'int',
+}
+
+# acc_ideas_scraper_v2.normalize_idea records (+ replies)
+IDEA_KINDS: Dict[str, Kind] = {
+    'id': 'str',
+    'title': 'str',
+    'body_html': 'str',
+    'body_text': ('text', 'body_html'),
+    'url': 'str',
+    'post_date': 'str',
+    'author_username': 'category',
+    'author_id': 'category',
+    'kudos': 'int',
+    'views': 'int',
+    'reply_count': 'int',
+    'status_key': 'category',
+    'status_name': 'category',
+    'conversation_id': 'str',
+    'labels': 'object',
+    'replies': REPLY_KINDS,
+}
+
+# autodesk_forum_api.ForumMessage records (asdict)
+MESSAGE_KINDS: Dict[str, Kind] = {
+    'id': 'str',
+    'subject': 'str',
+    'url': 'str',
+    'kudos': 'int',
+    'views': 'int',
+    'replies': 'int',
+    'status': 'category',
+    'post_date': 'str',
+    'author': 'category',
+    'body_text': 'str',
+    'solved': 'bool',
+    'labels': 'category',
+    'board_id': 'category',
+    'scraped_at': 'str',
+}
+
+
+# =============================================================================
+# Columns
+# =============================================================================
+
+class _ObjectColumn:
+    """Any value, one reference each."""
+
+    def __init__(self, rows: int = 0):
+        self.values: List[Any] = [_MISSING] * rows
+
+    def append(self, value):
+        self.values.append(value)
+
+    def get(self, i: int):
+        return self.values[i]
+
+
+class _CategoryColumn:
+    """Few distinct values: int32 codes into a table of interned values."""
+
+    _MISSING_CODE = -1
+
+    def __init__(self):
+        self.codes = array('i')
+        self.table: List[Any] = []
+        self.lookup: Dict[Any, int] = {}
+
+    def append(self, value):
+        if value is _MISSING:
+            self.codes.append(self._MISSING_CODE)
+            return
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.table)
+            self.table.append(sys.intern(value) if isinstance(value, str) else value)
+        self.codes.append(code)
+
+    def get(self, i: int):
+        code = self.codes[i]
+        return _MISSING if code == self._MISSING_CODE else self.table[code]
+
+
+class _IntColumn:
+    """int64 values; two reserved values stand for None and missing."""
+
+    _MISSING_VALUE = -2 ** 63
+    _NONE_VALUE = -2 ** 63 + 1
+
+    def __init__(self):
+        self.values = array('q')
+
+    def append(self, value):
+        if value is _MISSING:
+            value = self._MISSING_VALUE
+        elif value is None:
+            value = self._NONE_VALUE
+        elif not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError(f"expected an int, got {value!r}")
+        self.values.append(value)
+
+    def get(self, i: int):
+        value = self.values[i]
+        if value == self._MISSING_VALUE:
+            return _MISSING
+        return None if value == self._NONE_VALUE else value
+
+
+class _BoolColumn:
+    """One byte a value: 0/1, -1 = None, -2 = missing."""
+
+    def __init__(self):
+        self.values = array('b')
+
+    def append(self, value):
+        if value is _MISSING:
+            self.values.append(-2)
+        elif value is None:
+            self.values.append(-1)
+        elif isinstance(value, bool):
+            self.values.append(int(value))
+        else:
+            raise TypeError(f"expected a bool, got {value!r}")
+
+    def get(self, i: int):
+        value = self.values[i]
+        return _MISSING if value == -2 else None if value == -1 else bool(value)
+
+
+class _TextColumn:
+    """Plain text derived from an HTML column on read; only mismatches are stored."""
+
+    def __init__(self, source: Any, to_text: Callable[[str], str]):
+        self.source = source
+        self.to_text = to_text
+        self.rows = 0
+        self.stored: Dict[int, Any] = {}  # row -> text that isn't to_text(html), or _MISSING
+
+    def append(self, value):
+        html_content = self.source.get(self.rows)
+        if html_content is _MISSING:
+            derived = _MISSING
+        else:
+            derived = self.to_text(html_content) if isinstance(html_content, str) else None
+        if value != derived:
+            self.stored[self.rows] = value
+        self.rows += 1
+
+    def get(self, i: int):
+        if i in self.stored:
+            return self.stored[i]
+        html_content = self.source.get(i)
+        if html_content is _MISSING:
+            return _MISSING
+        return self.to_text(html_content) if isinstance(html_content, str) else None
+
+
+class _NestedColumn:
+    """A list of records per row, kept in one child store."""
+
+    def __init__(self, store: 'RecordStore'):
+        self.store = store
+        self.starts = array('q')
+        self.lengths = array('i')  # -1 = missing, -2 = None
+
+    def append(self, value):
+        self.starts.append(len(self.store))
+        if value is _MISSING or value is None:
+            self.lengths.append(-2 if value is None else -1)
+            return
+        for item in value:
+            self.store.append(item)
+        self.lengths.append(len(value))
+
+    def get(self, i: int):
+        length = self.lengths[i]
+        if length < 0:
+            return _MISSING if length == -1 else None
+        start = self.starts[i]
+        return [self.store[j] for j in range(start, start + length)]
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class RecordStore:
+    """Column-wise records; ``kinds`` maps each known field to its column kind."""
+
+    def __init__(self, kinds: Dict[str, Kind], to_text: Callable[[str], str] = html_to_text):
+        self.to_text = to_text
+        self.rows = 0
+        self.columns: Dict[str, Any] = {}
+        for name, kind in kinds.items():
+            self.columns[name] = self._column(kind)
+
+    def _column(self, kind: Kind):
+        if isinstance(kind, dict):
+            return _NestedColumn(RecordStore(kind, self.to_text))
+        if isinstance(kind, tuple) and kind[0] == 'text':
+            if kind[1] not in self.columns:
+                raise ValueError(f"text column derived from {kind[1]!r} must come after it")
+            return _TextColumn(self.columns[kind[1]], self.to_text)
+        columns = {'str': _ObjectColumn, 'object': _ObjectColumn, 'category': _CategoryColumn,
+                   'int': _IntColumn, 'bool': _BoolColumn}
+        if kind not in columns:
+            raise ValueError(f"Unknown column kind: {kind!r}")
+        return columns[kind]()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def append(self, record: Dict[str, Any]):
+        """
+        Add a record. Fields no kind was given for, and columns that get a value
+        their kind can't hold (e.g. a str in an int column), are kept as plain objects.
+        """
+        for name in record:
+            if name not in self.columns:
+                self.columns[name] = _ObjectColumn(self.rows)
+        for name, column in self.columns.items():
+            value = record.get(name, _MISSING)
+            try:
+                column.append(value)
+            except TypeError:
+                self.columns[name] = column = self._as_objects(column)
+                column.append(value)
+        self.rows += 1
+
+    def _as_objects(self, column) -> _ObjectColumn:
+        plain = _ObjectColumn()
+        plain.values = [column.get(i) for i in range(self.rows)]
+        return plain
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        """Materialize record ``i`` as a new dict."""
+        if not -self.rows <= i < self.rows:
+            raise IndexError(i)
+        i %= self.rows
+        record = {}
+        for name, column in self.columns.items():
+            value = column.get(i)
+            if value is not _MISSING:
+                record[name] = value
+        return record
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.rows):
+            yield self[i]
+
+    def column(self, name: str) -> List[Any]:
+        """Every row's value of one field (None where a record lacked it)."""
+        column = self.columns.get(name)
+        if column is None:
+            return [None] * self.rows
+        values = (column.get(i) for i in range(self.rows))
+        return [None if value is _MISSING else value for value in values]
+
+    def keyed(self, name: str = 'id') -> 'KeyedRecords':
+        return KeyedRecords(self, name)
+
+    def write_to(self, sink, transform: Optional[Callable[[Dict], Dict]] = None) -> int:
+        """Stream every record (optionally transformed) into a sink; returns the count."""
+        for record in self:
+            sink.write(transform(record) if transform else record)
+        return self.rows
+
+
+class KeyedRecords(Mapping):
+    """Read-only ``{key: record}`` view of a store; records are built on access."""
+
+    def __init__(self, store: RecordStore, name: str):
+        self.store = store
+        self.rows = {key: i for i, key in enumerate(store.column(name)) if key is not None}
+
+    def __getitem__(self, key) -> Dict[str, Any]:
+        return self.store[self.rows[key]]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, key) -> bool:
+        return key in self.rows
+
+
+def idea_store(to_text: Callable[[str], str] = html_to_text) -> RecordStore:
+    """Store for normalize_idea records; ``to_text`` is the scraper's HTML-to-text."""
+    return RecordStore(IDEA_KINDS, to_text)
+
+
+def message_store() -> RecordStore:
+    """Store for ForumMessage records."""
+    return RecordStore(MESSAGE_KINDS)
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Declared shapes of the Khoros API responses the clients read.
+
+Responses used to be decoded into generic dicts and walked with chains
+like ``.get('kudos', {}).get('sum', {}).get('weight', 0)``, so a field
+Khoros renamed or retyped quietly became a zero. Here each shape is
+declared once (message, reply, node, count and their response envelopes)
+and a response body is decoded straight into it:
+
+- with msgspec installed, in one pass from bytes to frozen structs: no
+  intermediate dicts, and undeclared fields are skipped, not built
+- otherwise the JSON is parsed (orjson or json) and checked and converted
+  into the same classes by a small pure-Python validator
+
+Either way, a missing or null field gets its declared default at decode
+time, and a value of the wrong type raises ``SchemaError`` with its path
+(``$.data.items[3].kudos.sum.weight``). Structs are immutable; use
+``replace()`` to derive a changed copy.
+
+Usage:
+    response = decode(body, MessageResponse)
+    for message in response.data.items:
+        print(message.id, message.kudos.sum.weight, message.status.name)
+
+    message = convert(render_message(topic, fields), Message)   # from a dict
+"""
+
+import typing
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+from forum_sinks import json_decoder
+
+T = TypeVar('T')
+
+
+class SchemaError(ValueError):
+    """A response does not have its declared shape (or is not JSON at all)."""
+
+
+# Per struct class: field type hints, and (field, default) of each nullable
+# field whose default isn't None
+_HINTS: Dict[type, Dict[str, Any]] = {}
+_NULL_DEFAULTS: Dict[type, Tuple[Tuple[str, Any], ...]] = {}
+
+
+def _is_optional(hint) -> bool:
+    return typing.get_origin(hint) is typing.Union and type(None) in typing.get_args(hint)
+
+
+def _hints(cls) -> Dict[str, Any]:
+    hints = _HINTS.get(cls)
+    if hints is None:
+        hints = _HINTS[cls] = typing.get_type_hints(cls)
+    return hints
+
+
+def _null_defaults(cls) -> Tuple[Tuple[str, Any], ...]:
+    defaults = _NULL_DEFAULTS.get(cls)
+    if defaults is None:
+        hints = _hints(cls)
+        defaults = _NULL_DEFAULTS[cls] = tuple(
+            (name, default) for name, default in struct_defaults(cls).items()
+            if default is not None and _is_optional(hints[name])
+        )
+    return defaults
+
+
+# =============================================================================
+# Struct base: msgspec, or a pure-Python equivalent
+# =============================================================================
+
+if msgspec is not None:
+
+    class Struct(msgspec.Struct, frozen=True):
+        """Immutable record; a null field takes its default."""
+
+        def __post_init__(self):
+            for name, default in _null_defaults(type(self)):
+                if getattr(self, name) is None:
+                    msgspec.structs.force_setattr(self, name, default)
+
+    def struct_defaults(cls) -> Dict[str, Any]:
+        fields, defaults = cls.__struct_fields__, cls.__struct_defaults__
+        return dict(zip(fields[len(fields) - len(defaults):], defaults))
+
+    def replace(struct: T, **changes) -> T:
+        return msgspec.structs.replace(struct, **changes)
+
+    def to_builtins(value: Any) -> Any:
+        """Structs (also nested in lists/dicts) as plain dicts, for json.dump."""
+        return msgspec.to_builtins(value)
+
+else:
+
+    class _StructMeta(type):
+        """Turns annotated class attributes into slots with defaults, like msgspec.Struct."""
+
+        def __new__(mcs, name, bases, namespace):
+            defaults: Dict[str, Any] = {}
+            for base in reversed(bases):
+                defaults.update(getattr(base, '_defaults', {}))
+            for field in namespace.get('__annotations__', {}):
+                if field not in namespace:
+                    raise TypeError(f"{name}.{field} needs a default")
+                defaults[field] = namespace.pop(field)
+            namespace['__slots__'] = tuple(field for field in namespace.get('__annotations__', {}))
+            cls = super().__new__(mcs, name, bases, namespace)
+            cls._defaults = defaults
+            cls.__struct_fields__ = tuple(defaults)
+            return cls
+
+    class Struct(metaclass=_StructMeta):
+        """Immutable record; a null field takes its default."""
+
+        def __init__(self, **values):
+            for name, default in self._defaults.items():
+                object.__setattr__(self, name, values.pop(name, default))
+            if values:
+                raise TypeError(f"Unexpected field(s) for {type(self).__name__}: {', '.join(values)}")
+            for name, default in _null_defaults(type(self)):
+                if getattr(self, name) is None:
+                    object.__setattr__(self, name, default)
+
+        def __setattr__(self, name, value):
+            raise AttributeError(f"immutable type: {type(self).__name__!r}")
+
+        def _values(self) -> tuple:
+            return tuple(getattr(self, name) for name in self.__struct_fields__)
+
+        def __eq__(self, other):
+            return type(self) is type(other) and self._values() == other._values()
+
+        def __hash__(self):
+            return hash(self._values())
+
+        def __repr__(self):
+            fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__struct_fields__)
+            return f"{type(self).__name__}({fields})"
+
+        def __reduce__(self):
+            return _rebuild, (type(self), self._values())
+
+    def _rebuild(cls, values: tuple):
+        return cls(**dict(zip(cls.__struct_fields__, values)))
+
+    def struct_defaults(cls) -> Dict[str, Any]:
+        return dict(cls._defaults)
+
+    def replace(struct: T, **changes) -> T:
+        values = {name: getattr(struct, name) for name in struct.__struct_fields__}
+        values.update(changes)
+        return type(struct)(**values)
+
+    def to_builtins(value: Any) -> Any:
+        """Structs (also nested in lists/dicts) as plain dicts, for json.dump."""
+        if isinstance(value, Struct):
+            return {name: to_builtins(getattr(value, name)) for name in value.__struct_fields__}
+        if isinstance(value, (list, tuple)):
+            return [to_builtins(item) for item in value]
+        if isinstance(value, dict):
+            return {key: to_builtins(item) for key, item in value.items()}
+        return value
+
+
+# =============================================================================
+# Decoding
+# =============================================================================
+
+_DECODERS: Dict[type, Any] = {}
+
+
+def decode(body: bytes, schema: Type[T]) -> T:
+    """Decode a JSON response body into ``schema``; raises ``SchemaError``."""
+    if msgspec is not None:
+        decoder = _DECODERS.get(schema)
+        if decoder is None:
+            decoder = _DECODERS[schema] = msgspec.json.Decoder(schema)
+        try:
+            return decoder.decode(body)
+        except msgspec.ValidationError as e:
+            raise SchemaError(f"{schema.__name__}: {e}") from None
+        except msgspec.DecodeError as e:
+            raise SchemaError(f"{schema.__name__}: not valid JSON ({e})") from None
+    try:
+        data = json_decoder()(body)
+    except ValueError as e:
+        raise SchemaError(f"{schema.__name__}: not valid JSON ({e})") from None
+    return convert(data, schema)
+
+
+def convert(data: Any, schema: Type[T]) -> T:
+    """Build ``schema`` from already-parsed JSON (e.g. a dict); raises ``SchemaError``."""
+    if msgspec is not None:
+        try:
+            return msgspec.convert(data, schema)
+        except msgspec.ValidationError as e:
+            raise SchemaError(f"{schema.__name__}: {e}") from None
+    try:
+        return _convert(data, schema)
+    except _Mismatch as e:
+        path = '$' + ''.join(reversed(e.path))
+        raise SchemaError(f"{schema.__name__}: Expected `{e.expected}`, got `{e.got}` - at `{path}`") from None
+
+
+def _json_type(value) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, dict):
+        return 'object'
+    if isinstance(value, (list, tuple)):
+        return 'array'
+    return type(value).__name__
+
+
+def _type_name(hint) -> str:
+    if _is_optional(hint):
+        inner = next(arg for arg in typing.get_args(hint) if arg is not type(None))
+        return f"{_type_name(inner)} | null"
+    if typing.get_origin(hint) in (list, tuple):
+        return 'array'
+    if isinstance(hint, type) and issubclass(hint, Struct):
+        return 'object'
+    return getattr(hint, '__name__', str(hint))
+
+
+class _Mismatch(Exception):
+    """A value of the wrong type; the path is collected on the way back up."""
+
+    def __init__(self, expected: str, value):
+        self.expected = expected
+        self.got = _json_type(value)
+        self.path: List[str] = []
+
+
+def _mismatch(hint, value, nullable: bool) -> _Mismatch:
+    return _Mismatch(_type_name(hint) + (' | null' if nullable else ''), value)
+
+
+_CONVERTERS: Dict[Any, Any] = {}
+
+
+def _convert(value, hint):
+    """The pure-Python decoder: check ``value`` against ``hint`` and build structs."""
+    converter = _CONVERTERS.get(hint)
+    if converter is None:
+        converter = _CONVERTERS[hint] = _converter(hint)
+    return converter(value)
+
+
+def _converter(hint):
+    """Converter function for one type hint, built once per hint."""
+    nullable = _is_optional(hint)
+    if nullable:
+        hint = next(arg for arg in typing.get_args(hint) if arg is not type(None))
+    origin = typing.get_origin(hint)
+
+    if isinstance(hint, type) and issubclass(hint, Struct):
+        hints = _hints(hint)
+        fields = tuple((name, default, hints[name]) for name, default in struct_defaults(hint).items())
+        nulls = dict(_null_defaults(hint))
+        not_null = {name for name, _, field_hint in fields if not _is_optional(field_hint)}
+        new = object.__new__
+        set_field = object.__setattr__
+
+        def convert_struct(value):
+            if type(value) is not dict:
+                if value is None and nullable:
+                    return None
+                raise _mismatch(hint, value, nullable)
+            struct = new(hint)
+            for name, default, field_hint in fields:
+                raw = value.get(name)
+                if raw is not None:
+                    try:
+                        raw = _convert(raw, field_hint)
+                    except _Mismatch as e:
+                        e.path.append(f".{name}")
+                        raise
+                elif name not in value:
+                    raw = default
+                elif name in not_null:
+                    error = _Mismatch(_type_name(field_hint), None)
+                    error.path.append(f".{name}")
+                    raise error
+                else:
+                    raw = nulls.get(name, default)
+                set_field(struct, name, raw)
+            return struct
+        return convert_struct
+
+    if origin in (list, tuple):
+        item_hint = typing.get_args(hint)[0]
+
+        def convert_array(value):
+            if type(value) is not list:
+                if value is None and nullable:
+                    return None
+                raise _mismatch(hint, value, nullable)
+            items = []
+            for i, item in enumerate(value):
+                try:
+                    items.append(_convert(item, item_hint))
+                except _Mismatch as e:
+                    e.path.append(f"[{i}]")
+                    raise
+            return origin(items)
+        return convert_array
+
+    if hint is Any:
+        return lambda value: value
+    if hint in (bool, int, str):
+        # Exact types: bool is an int in Python, but not in JSON
+        def convert_scalar(value):
+            if type(value) is not hint and not (value is None and nullable):
+                raise _mismatch(hint, value, nullable)
+            return value
+        return convert_scalar
+    raise TypeError(f"Unsupported schema type: {hint!r}")
+
+
+def response_status(response) -> Tuple[str, str]:
+    """(status, message) of a decoded response, typed or plain JSON."""
+    if isinstance(response, Response):
+        return response.status, response.message
+    return response.get('status', ''), response.get('message', '')
+
+
+# =============================================================================
+# Message shapes: LiQL messages collection and REST /messages/{id}
+# =============================================================================
+# Every field is optional: a query only returns what it SELECTs, and the
+# defaults are what the normalizers always substituted for a missing field.
+
+class KudosSum(Struct):
+    weight: Optional[int] = 0
+
+
+class Kudos(Struct):
+    """kudos.sum(weight)"""
+    sum: Optional[KudosSum] = KudosSum()
+
+
+class Metrics(Struct):
+    views: Optional[int] = 0
+
+
+class Author(Struct):
+    login: Optional[str] = None
+    id: Optional[str] = None
+
+
+class Status(Struct):
+    key: Optional[str] = None
+    name: Optional[str] = None
+
+
+class Conversation(Struct):
+    id: Optional[str] = None
+    messages_count: Optional[int] = 0  # the topic itself included
+    solved: Optional[bool] = False
+
+
+class Ref(Struct):
+    """Reference to another object (board.id, parent.id)."""
+    id: Optional[str] = None
+
+
+class Label(Struct):
+    text: Optional[str] = ''
+
+
+class Labels(Struct):
+    items: Optional[Tuple[Label, ...]] = ()
+
+
+class Message(Struct):
+    """A topic starter (or any message) from the messages collection."""
+    id: Optional[str] = None
+    subject: Optional[str] = None
+    body: Optional[str] = ''
+    view_href: Optional[str] = None
+    post_time: Optional[str] = None
+    author: Optional[Author] = Author()
+    kudos: Optional[Kudos] = Kudos()
+    metrics: Optional[Metrics] = Metrics()
+    conversation: Optional[Conversation] = Conversation()
+    status: Optional[Status] = Status()
+    labels: Optional[Labels] = Labels()
+    board: Optional[Ref] = Ref()
+
+    @property
+    def reply_count(self) -> int:
+        return max(self.conversation.messages_count - 1, 0)
+
+
+class Reply(Struct):
+    """A reply, as selected by parent.id queries."""
+    id: Optional[str] = None
+    body: Optional[str] = ''
+    post_time: Optional[str] = None
+    author: Optional[Author] = Author()
+    kudos: Optional[Kudos] = Kudos()
+    parent: Optional[Ref] = Ref()
+
+
+# =============================================================================
+# Node and count shapes
+# =============================================================================
+
+class Node(Struct):
+    """A category or board from the nodes collection."""
+    id: Optional[str] = ''
+    title: Optional[str] = ''
+    node_type: Optional[str] = None
+    conversation_style: Optional[str] = None
+    parent: Optional[Ref] = Ref()
+
+
+class CountData(Struct):
+    count: Optional[int] = 0
+
+
+# =============================================================================
+# Response envelopes
+# =============================================================================
+
+class Response(Struct):
+    """Fields every API response has; ``status`` is 'success' or 'error'."""
+    status: Optional[str] = ''
+    message: Optional[str] = ''
+
+
+class MessagePage(Struct):
+    items: Optional[Tuple[Message, ...]] = ()
+    next_cursor: Optional[str] = None
+
+
+class ReplyPage(Struct):
+    items: Optional[Tuple[Reply, ...]] = ()
+    next_cursor: Optional[str] = None
+
+
+class NodePage(Struct):
+    items: Optional[Tuple[Node, ...]] = ()
+
+
+class MessageResponse(Response):
+    data: Optional[MessagePage] = MessagePage()
+
+
+class ReplyResponse(Response):
+    data: Optional[ReplyPage] = ReplyPage()
+
+
+class NodeResponse(Response):
+    data: Optional[NodePage] = NodePage()
+
+
+class CountResponse(Response):
+    data: Optional[CountData] = CountData()
+
+
+class SingleMessageResponse(Response):
+    """REST GET /messages/{id}."""
+    data: Optional[Message] = Message()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Time-sharded crawls of a single board.
+
+Cursor pagination is sequential - each page needs the previous page's
+cursor - so one board is crawled one request latency per page, however
+many connections the client has. A sharded crawl splits the board's
+topics into disjoint post_time ranges of about the same size and walks
+every range with its own cursor, concurrently:
+
+    [..., t1)  [t1, t2)  ...  [tn-1, ...)
+
+The outer shards are open-ended, so topics posted while the crawl runs
+are not lost. Shards are planned with ``count(*)`` queries only: the
+largest shard is split at the time that halves it, found by bisecting
+post_time, until there are enough shards.
+
+Shards overlap nowhere, but a topic whose post_time changes mid-crawl can
+be seen by two of them, so merged output is deduplicated by id.
+
+Usage:
+    def count(start, end):
+        return api.query(LiQLQuery.message_count(board_id, TimeShard(start, end).where()))['data']['count']
+
+    for shard in plan_shards(count, oldest_post, newest_post, shards=8):
+        query = f"SELECT ... WHERE board.id = '{board_id}' AND depth = 0{shard.where()} ..."
+"""
+
+import heapq
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# count(start, end) -> topics with start <= post_time < end (None = unbounded)
+CountFn = Callable[[Optional[str], Optional[str]], int]
+
+DEFAULT_TOLERANCE = 0.1  # accept a split within 10% of the shard's half
+DEFAULT_PROBES = 8  # count queries per split at most
+RESOLUTION = timedelta(seconds=1)  # never split a range narrower than this
+
+
+@dataclass(frozen=True)
+class TimeShard:
+    """Topics with ``start <= post_time < end``; a None bound is open."""
+    start: Optional[str] = None
+    end: Optional[str] = None
+    count: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.start or '-'}..{self.end or '-'}"
+
+    def where(self) -> str:
+        """LiQL conditions for this range, to append to a WHERE clause."""
+        clause = ''
+        if self.start:
+            clause += f" AND post_time >= '{self.start}'"
+        if self.end:
+            clause += f" AND post_time < '{self.end}'"
+        return clause
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(asdict(self), key=self.key)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TimeShard':
+        return cls(data.get('start'), data.get('end'), data.get('count', 0))
+
+
+def format_time(value: datetime) -> str:
+    """post_time literal in the API's own format (UTC, milliseconds)."""
+    return value.astimezone(timezone.utc).isoformat(timespec='milliseconds')
+
+
+def _to_millis(value: datetime) -> datetime:
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _bisect(count: CountFn, shard: TimeShard, lo: datetime, hi: datetime,
+            tolerance: float, probes: int) -> Optional[Tuple[datetime, int]]:
+    """(split time, topics before it) that best halves ``shard``; None if it can't be split."""
+    target = shard.count / 2
+    best = None
+    for _ in range(probes):
+        if hi - lo < 2 * RESOLUTION:
+            break
+        mid = _to_millis(lo + (hi - lo) / 2)
+        left = count(shard.start, format_time(mid))
+        if 0 < left < shard.count and (best is None or abs(left - target) < abs(best[1] - target)):
+            best = (mid, left)
+        if abs(left - target) <= tolerance * shard.count:
+            break
+        if left < target:
+            lo = mid
+        else:
+            hi = mid
+    return best
+
+
+def plan_shards(count: CountFn, oldest: datetime, newest: datetime, shards: int,
+                tolerance: float = DEFAULT_TOLERANCE, probes: int = DEFAULT_PROBES) -> List[TimeShard]:
+    """
+    Split the topics posted between ``oldest`` and ``newest`` into up to
+    ``shards`` ranges of similar size, in post_time order.
+
+    Costs one count for the total plus at most ``probes`` per split. Fewer
+    shards come back when the topics can't be split further (e.g. a board
+    with fewer topics than shards, or many topics at the same instant).
+    """
+    total = count(None, None)
+    whole = TimeShard(None, None, total)
+    if shards <= 1 or total < 2:
+        return [whole]
+
+    # Largest shard first; lo/hi are the post_time span the shard can contain
+    heap = [(-total, 0, _to_millis(oldest), _to_millis(newest) + RESOLUTION, whole)]
+    final: List[TimeShard] = []
+    sequence = 1
+    while heap and len(heap) + len(final) < shards:
+        _, _, lo, hi, shard = heapq.heappop(heap)
+        split = _bisect(count, shard, lo, hi, tolerance, probes)
+        if split is None:
+            final.append(shard)
+            continue
+        mid, left = split
+        boundary = format_time(mid)
+        for part, part_lo, part_hi in ((TimeShard(shard.start, boundary, left), lo, mid),
+                                       (TimeShard(boundary, shard.end, shard.count - left), mid, hi)):
+            heapq.heappush(heap, (-part.count, sequence, part_lo, part_hi, part))
+            sequence += 1
+    return sorted(final + [entry[-1] for entry in heap], key=lambda shard: shard.start or '')
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Streaming record writers for board exports.
+
+Each sink writes records as they are produced and flushes every
+``flush_every`` records (one API page by default), so memory stays flat
+however large the board is. Output goes to ``<path>.part`` and is renamed
+into place by ``close()``; a crashed run leaves the ``.part`` file behind
+instead of a truncated file that looks complete.
+
+A ``.gz`` or ``.zst`` suffix after the format (``ideas.jsonl.zst``,
+``ideas.json.gz``, ``board.csv.gz``) compresses the output as it is
+written; ``read_records`` reads any of them back the same way. zstd needs
+the zstandard package (``pip install zstandard``).
+
+JSON is encoded with orjson or msgspec when one is installed (much faster
+than the json module, same output); records they can't encode fall back
+to json.
+
+Usage:
+    with open_sink("data/acc_ideas.jsonl.zst") as sink:
+        for idea in fetch_all_ideas():
+            sink.write(idea)
+
+    for idea in read_records("data/acc_ideas.jsonl.zst"):
+        ...
+"""
+
+import csv
+import gzip
+import io
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+DEFAULT_FLUSH_EVERY = 100  # one API page
+COMPRESSION_SUFFIXES = ('.gz', '.zst')
+GZIP_LEVEL = 6  # zlib's default; 9 is several times slower for ~1% smaller files
+ZSTD_LEVEL = 3
+
+
+# =============================================================================
+# Compression
+# =============================================================================
+
+def split_suffix(path) -> Tuple[str, str]:
+    """(format suffix, compression suffix): ('.jsonl', '.zst') for ideas.jsonl.zst,
+    ('.csv', '') for board.csv."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in COMPRESSION_SUFFIXES:
+        return Path(path.stem).suffix.lower(), suffix
+    return suffix, ''
+
+
+def require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("zstd compression needs zstandard: pip install zstandard")
+
+
+def open_stream(path, mode: str = 'r', compression: Optional[str] = None, text: bool = True):
+    """
+    Open ``path`` for reading ('r') or writing ('w'), (de)compressing according to
+    ``compression`` ('.gz', '.zst', '' for none; default: from the path's suffix).
+    Text streams are UTF-8 with newline translation off, as the csv module needs.
+    """
+    if compression is None:
+        compression = split_suffix(path)[1]
+    if compression == '.gz':
+        stream = gzip.open(path, mode + 'b', compresslevel=GZIP_LEVEL)
+    elif compression == '.zst':
+        require_zstandard()
+        raw = open(path, mode + 'b')
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw)
+        else:
+            # Buffered for readline/iteration, which the decompressor itself lacks
+            stream = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    elif compression:
+        raise ValueError(f"Unsupported compression: {compression}")
+    else:
+        stream = open(path, mode + 'b')
+    return io.TextIOWrapper(stream, encoding='utf-8', newline='') if text else stream
+
+
+# =============================================================================
+# JSON encoding
+# =============================================================================
+
+def _json_encoder(indent: Optional[int]) -> Callable[[Any], bytes]:
+    separators = (',', ':') if indent is None else (',', ': ')
+    return lambda record: json.dumps(record, indent=indent, separators=separators,
+                                     ensure_ascii=False).encode('utf-8')
+
+
+def available_encoders() -> List[str]:
+    """Installed JSON encoders, fastest first."""
+    return [name for name, module in (('orjson', orjson), ('msgspec', msgspec), ('json', json))
+            if module is not None]
+
+
+def json_encoder(name: Optional[str] = None, indent: Optional[int] = None) -> Callable[[Any], bytes]:
+    """
+    Record -> UTF-8 JSON: compact (``indent=None``, no spaces) or laid out exactly
+    like ``json.dumps(indent=2)``. ``name`` picks the encoder (default: fastest
+    installed); msgspec is only used for compact output, and only orjson indents.
+    """
+    name = name or available_encoders()[0]
+    if name not in available_encoders():
+        raise ValueError(f"JSON encoder {name} is not installed (available: {', '.join(available_encoders())})")
+    fallback = _json_encoder(indent)
+    if name == 'orjson' and indent in (None, 2):
+        options = orjson.OPT_INDENT_2 if indent == 2 else 0
+        fast = lambda record: orjson.dumps(record, option=options)
+    elif name == 'msgspec' and indent is None:
+        fast = msgspec.json.Encoder().encode
+    else:
+        return fallback
+
+    def encode(record) -> bytes:
+        try:
+            return fast(record)
+        except (TypeError, ValueError, OverflowError):
+            return fallback(record)  # e.g. non-str keys, ints beyond 64 bits
+
+    return encode
+
+
+def json_decoder() -> Callable[[bytes], Any]:
+    """JSON text -> value, with the fastest installed decoder."""
+    if orjson is not None:
+        return orjson.loads
+    if msgspec is not None:
+        return msgspec.json.Decoder().decode
+    return json.loads
+
+
+# =============================================================================
+# Sinks
+# =============================================================================
+
+
+class RecordSink:
+    """Base class: buffered, atomically renamed output file."""
+
+    text = True  # False: _write gets a binary stream
+
+    def __init__(self, path, flush_every: int = DEFAULT_FLUSH_EVERY):
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + '.part')
+        self.compression = split_suffix(self.path)[1]
+        self.flush_every = flush_every
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._open()
+
+    def _open(self):
+        return open_stream(self.part_path, 'w', self.compression, text=self.text)
+
+    def write(self, record: Dict[str, Any]):
+        self._write(record)
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.flush()
+
+    def _write(self, record: Dict[str, Any]):
+        raise NotImplementedError
+
+    def flush(self):
+        self._file.flush()
+
+    def _finish(self):
+        """Write any trailer before the file is closed."""
+
+    def close(self, final_path=None) -> Path:
+        """Finish the file and move it to ``final_path`` (default: ``path``)."""
+        if self._file.closed:
+            return self.path
+        self._finish()
+        self._file.close()
+        if final_path is not None:
+            self.path = Path(final_path)
+        self.part_path.replace(self.path)
+        return self.path
+
+    def abort(self):
+        """Stop writing but keep the ``.part`` file for inspection."""
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self):
+        """Stop writing and delete the ``.part`` file."""
+        self.abort()
+        if self.part_path.exists():
+            self.part_path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class CsvSink(RecordSink):
+    """CSV rows; the header comes from ``fieldnames`` or the first record."""
+
+    def __init__(self, path, fieldnames: Optional[List[str]] = None, **kwargs):
+        self.fieldnames = fieldnames
+        self._writer = None
+        super().__init__(path, **kwargs)
+
+    def _write(self, record):
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames or list(record.keys()),
+                                          extrasaction='ignore')
+            self._writer.writeheader()
+        self._writer.writerow(record)
+
+
+class JsonLinesSink(RecordSink):
+    """One compact JSON object per line."""
+
+    text = False
+
+    def __init__(self, path, encoder: Optional[str] = None, **kwargs):
+        self.encode = json_encoder(encoder)
+        super().__init__(path, **kwargs)
+
+    def _write(self, record):
+        self._file.write(self.encode(record) + b'\n')
+
+
+class JsonArraySink(RecordSink):
+    """A JSON array, byte-identical to ``json.dump(records, f, indent=indent, ensure_ascii=False)``."""
+
+    text = False
+
+    def __init__(self, path, indent: Optional[int] = 2, encoder: Optional[str] = None, **kwargs):
+        self.indent = indent
+        self.encode = json_encoder(encoder, indent) if indent is not None else self._dumps
+        super().__init__(path, **kwargs)
+
+    @staticmethod
+    def _dumps(record) -> bytes:
+        return json.dumps(record, ensure_ascii=False).encode('utf-8')
+
+    def _write(self, record):
+        data = self.encode(record)
+        if self.indent is None:
+            self._file.write((b'[' if self.count == 0 else b', ') + data)
+            return
+        pad = b' ' * self.indent
+        self._file.write(b'[\n' if self.count == 0 else b',\n')
+        self._file.write(pad + data.replace(b'\n', b'\n' + pad))
+
+    def _finish(self):
+        if self.count == 0:
+            self._file.write(b'[]')
+        else:
+            self._file.write(b'\n]' if self.indent is not None else b']')
+
+
+def open_sink(path, **kwargs) -> RecordSink:
+    """Pick a sink from the file extension (.csv, .jsonl/.ndjson, .json; optionally + .gz/.zst)."""
+    suffix = split_suffix(path)[0]
+    if suffix == '.csv':
+        return CsvSink(path, **kwargs)
+    if suffix in ('.jsonl', '.ndjson'):
+        return JsonLinesSink(path, **kwargs)
+    if suffix == '.json':
+        return JsonArraySink(path, **kwargs)
+    raise ValueError(f"Unsupported output format: {path}")
+
+
+# =============================================================================
+# Reading back
+# =============================================================================
+
+def read_records(path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a .csv, .jsonl/.ndjson or .json file (optionally
+    .gz/.zst compressed). JSON Lines and CSV are read a record at a time; a
+    JSON array is parsed whole, and each record is released once yielded.
+    """
+    suffix = split_suffix(path)[0]
+    decode = json_decoder()
+    if suffix == '.csv':
+        with open_stream(path) as f:
+            yield from csv.DictReader(f)
+    elif suffix in ('.jsonl', '.ndjson'):
+        with open_stream(path, text=False) as f:
+            for line in f:
+                if line.strip():
+                    yield decode(line)
+    elif suffix == '.json':
+        with open_stream(path, text=False) as f:
+            records = decode(f.read())
+        records.reverse()
+        while records:
+            yield records.pop()
+    else:
+        raise ValueError(f"Unsupported input format: {path}")
+
+
+class RunningStats:
+    """End-of-run summary aggregates, computed without keeping the records."""
+
+    def __init__(self, head: int = 10):
+        self.head_size = head
+        self.count = 0
+        self.replies_fetched = 0
+        self.statuses: Counter = Counter()
+        self.head: List[Dict[str, Any]] = []
+
+    def add(self, idea: Dict[str, Any]):
+        self.count += 1
+        replies = idea.get("replies") or []
+        self.replies_fetched += len(replies)
+        self.statuses[idea.get("status_name") or "Unknown"] += 1
+        if len(self.head) < self.head_size:
+            # Keep only what the summary prints, not bodies
+            self.head.append({
+                "title": idea.get("title") or "",
+                "kudos": idea.get("kudos", 0),
+                "reply_count": idea.get("reply_count", 0),
+                "status_name": idea.get("status_name"),
+                "first_reply_author": replies[0].get("author") if replies else None,
+            })
@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+Local Khoros API stand-in
+
+Serves a synthetic (or CSV-seeded) corpus over the two endpoints the
+scrapers use, so throughput can be measured without touching
+forums.autodesk.com:
+
+    GET /api/2.0/search?q={LiQL}
+    GET /api/2.0/messages/{id}
+
+Supports the LiQL subset used by the toolkit: SELECT/FROM/WHERE (=, >, >=,
+<, <=, IN joined by AND), ORDER BY, LIMIT, CURSOR and count(*).
+
+Usage:
+    # Serve the ACC corpus scaled to 40k topics with 50ms latency
+    python forum_stub_server.py --seed acc_ideas_data/*.csv --size 40000 --latency 0.05
+
+    # Big pages are slow: +2ms per KB of response (try the clients' --adaptive-pages)
+    python forum_stub_server.py --size 40000 --kb-latency 0.002
+
+    # Point the clients at it (unthrottled, not sharing the real site's rate budget)
+    python autodesk_forum_api.py --base-url http://127.0.0.1:8765 --rate 1000 --rate-state "" \
+        export -b acc-ideas-en -o out.csv
+    python acc_ideas_scraper_v2.py --all --base-url http://127.0.0.1:8765 --rate 1000 --rate-state ""
+
+    # Throughput of the scrapers against an in-process stub
+    python forum_benchmark.py throughput --sizes 4000 40000
+"""
+
+import argparse
+import base64
+import csv
+import glob
+import gzip
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+DEFAULT_BOARD = "acc-ideas-en"
+STATUSES = [
+    ("accepted", "Gathering Support"),
+    ("delivered", "Delivered"),
+    ("needs_info", "Needs More Info"),
+    ("already_offered", "Already Offered"),
+    ("archived", "Archived"),
+]
+LABELS = ("Docs", "Build", "Cost", "Design Collaboration", "Model Coordination", "Mobile",
+          "Administration", "Integrations")
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+class StubCorpus:
+    """In-memory message corpus with lazily generated replies."""
+
+    def __init__(self, topics: List[Dict[str, Any]], boards: List[str]):
+        self.topics = topics
+        self.by_id = {t['id']: t for t in topics}
+        self.boards = boards
+        self._order_cache: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # -- construction ---------------------------------------------------------
+
+    @classmethod
+    def from_csv(cls, paths: List[str], size: int, boards: List[str]) -> "StubCorpus":
+        rows = []
+        for path in paths:
+            with open(path, newline='', encoding='utf-8') as f:
+                rows.extend(csv.DictReader(f))
+        if not rows:
+            return cls.synthetic(size, boards)
+
+        bodies = [_as_html(row.get('body_text') or '') for row in rows]  # shared by the copies
+        topics = []
+        for n in range(size):
+            row = rows[n % len(rows)]
+            copy = n // len(rows)
+            post_time = _parse_time(row.get('post_date')) or datetime(2020, 1, 1, tzinfo=timezone.utc)
+            if copy:
+                post_time -= timedelta(days=copy, seconds=n % 86400)
+            topics.append({
+                'id': str(int(row['id']) + copy * 100_000_000) if row.get('id', '').isdigit() else str(10_000_000 + n),
+                'subject': row.get('title') or '',
+                'body': bodies[n % len(rows)],
+                'post_time': post_time,
+                'author_login': row.get('author_username') or '',
+                'author_id': row.get('author_id') or '',
+                'kudos': int(float(row.get('kudos') or 0)),
+                'views': int(float(row.get('views') or 0)),
+                'messages_count': int(float(row.get('reply_count') or 0)) + 1,
+                'status_key': row.get('status_key') or '',
+                'status_name': row.get('status_name') or '',
+                'board': boards[n % len(boards)],
+            })
+        return cls(topics, boards)
+
+    @classmethod
+    def synthetic(cls, size: int, boards: List[str], seed: int = 42) -> "StubCorpus":
+        rng = random.Random(seed)
+        start = datetime(2019, 1, 1, tzinfo=timezone.utc)
+        words = ("model sheet export permission viewer markup project user issue "
+                 "folder sync review template report mobile offline api").split()
+        topics = []
+        for n in range(size):
+            key, name = rng.choices(STATUSES, weights=[90, 3, 3, 2, 2])[0]
+            text = ' '.join(rng.choice(words) for _ in range(rng.randint(20, 200)))
+            topics.append({
+                'id': str(10_000_000 + n),
+                'subject': ' '.join(rng.choice(words) for _ in range(6)).capitalize(),
+                'body': _as_html(text),
+                'post_time': start + timedelta(minutes=rng.randint(0, 3_500_000)),
+                'author_login': f"user{rng.randint(1, max(size // 3, 1))}",
+                'author_id': str(rng.randint(1, 9_999_999)),
+                'kudos': int(rng.paretovariate(1.2)) - 1,
+                'views': rng.randint(10, 20000),
+                'messages_count': 1 + min(int(rng.expovariate(0.4)), 60),
+                'status_key': key,
+                'status_name': name,
+                'board': boards[n % len(boards)],
+            })
+        return cls(topics, boards)
+
+    # -- replies --------------------------------------------------------------
+
+    def replies_of(self, parent_id: str) -> List[Dict[str, Any]]:
+        parent = self.by_id.get(parent_id)
+        if not parent:
+            return []
+        replies = []
+        for i in range(parent['messages_count'] - 1):
+            replies.append({
+                'id': f"{parent_id}{i + 1:04d}",
+                'subject': f"Re: {parent['subject']}",
+                'body': f"<p>Reply {i + 1} &amp; +1 for this idea.</p>",
+                'post_time': parent['post_time'] + timedelta(hours=i + 1),
+                'author_login': f"replier{i}",
+                'author_id': str(500_000 + i),
+                'kudos': i % 3,
+                'views': 0,
+                'messages_count': parent['messages_count'],
+                'status_key': '',
+                'status_name': '',
+                'board': parent['board'],
+                'parent': parent_id,
+                'depth': 1,
+            })
+        return replies
+
+    # -- querying -------------------------------------------------------------
+
+    def select(self, conditions: List[tuple], order: Optional[tuple]) -> List[Dict[str, Any]]:
+        key = (tuple(conditions), order)
+        with self._lock:
+            if key in self._order_cache:
+                self._order_cache.move_to_end(key)
+                return self._order_cache[key]
+
+        pool: List[Dict[str, Any]]
+        parents = [v for f, op, v in conditions if f == 'parent.id']
+        if parents:
+            ids = parents[0] if isinstance(parents[0], tuple) else [parents[0]]
+            pool = [r for pid in ids for r in self.replies_of(pid)]
+        else:
+            ids = [v for f, op, v in conditions if f == 'id']
+            if ids:
+                wanted = ids[0] if isinstance(ids[0], tuple) else [ids[0]]
+                pool = [self.by_id[i] for i in wanted if i in self.by_id]
+            else:
+                pool = self.topics
+
+        rows = [m for m in pool if all(_match(m, c) for c in conditions)]
+        if order:
+            field, desc = order
+            rows.sort(key=lambda m: (_field_value(m, field), m['id']), reverse=desc)
+
+        with self._lock:
+            self._order_cache[key] = rows
+            while len(self._order_cache) > 64:
+                self._order_cache.popitem(last=False)
+        return rows
+
+
+def _as_html(text: str) -> str:
+    escaped = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    sentences = [s.strip() for s in escaped.split('. ') if s.strip()]
+    paragraphs = ['. '.join(sentences[i:i + 3]) for i in range(0, len(sentences), 3)] or ['']
+    return ''.join(f"<p>{p}</p>" for p in paragraphs)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _field_value(message: Dict[str, Any], field: str) -> Any:
+    if field in ('kudos.sum(weight)', 'kudos'):
+        return message['kudos']
+    if field == 'metrics.views':
+        return message['views']
+    if field == 'post_time':
+        return message['post_time']
+    if field == 'board.id':
+        return message['board']
+    if field == 'depth':
+        return message.get('depth', 0)
+    if field == 'parent.id':
+        return message.get('parent')
+    if field == 'status.key':
+        return message['status_key']
+    if field == 'id':
+        return message['id']
+    return None
+
+
+def _match(message: Dict[str, Any], condition: tuple) -> bool:
+    field, op, value = condition
+    actual = _field_value(message, field)
+    if field == 'post_time' and not isinstance(value, tuple):
+        value = _parse_time(str(value))
+    if op == 'IN':
+        return actual in value
+    if op == '=':
+        return str(actual) == str(value) if not isinstance(actual, int) else actual == int(value)
+    if actual is None:
+        return False
+    if op == '>':
+        return actual > value
+    if op == '>=':
+        return actual >= value
+    if op == '<':
+        return actual < value
+    if op == '<=':
+        return actual <= value
+    return False
+
+
+# =============================================================================
+# LiQL parsing
+# =============================================================================
+
+QUERY_RE = re.compile(
+    r"^SELECT\s+(?P<fields>.+?)\s+FROM\s+(?P<coll>\w+)"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?"
+    r"(?:\s+ORDER\s+BY\s+(?P<order>.+?))?"
+    r"(?:\s+LIMIT\s+(?P<limit>\d+))?"
+    r"(?:\s+CURSOR\s+'(?P<cursor>[^']*)')?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+COND_RE = re.compile(r"^\s*([\w.()]+)\s*(>=|<=|=|>|<|IN)\s*(.+?)\s*$", re.IGNORECASE)
+
+
+def parse_liql(query: str) -> Dict[str, Any]:
+    match = QUERY_RE.match(' '.join(query.split()))
+    if not match:
+        raise ValueError(f"Unsupported LiQL: {query[:120]}")
+    conditions = []
+    if match.group('where'):
+        for part in re.split(r"\s+AND\s+", match.group('where'), flags=re.IGNORECASE):
+            cond = COND_RE.match(part)
+            if not cond:
+                raise ValueError(f"Unsupported condition: {part}")
+            field, op, raw = cond.groups()
+            op = op.upper()
+            if op == 'IN':
+                value = tuple(v.strip().strip("'") for v in raw.strip('()').split(',') if v.strip())
+            else:
+                value = raw.strip("'")
+            conditions.append((field, op, value))
+    order = None
+    if match.group('order'):
+        parts = match.group('order').split()
+        order = (parts[0], len(parts) > 1 and parts[1].upper() == 'DESC')
+    return {
+        'fields': [f.strip() for f in match.group('fields').split(',')],
+        'collection': match.group('coll').lower(),
+        'conditions': conditions,
+        'order': order,
+        'limit': int(match.group('limit') or 25),
+        'cursor': match.group('cursor'),
+    }
+
+
+def render_message(message: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Shape a corpus message like a Khoros v2 item, restricted to ``fields``."""
+    wanted = set(fields)
+    everything = '*' in wanted
+    out: Dict[str, Any] = {'type': 'message', 'id': message['id']}
+
+    def want(name: str) -> bool:
+        return everything or name in wanted
+
+    if want('subject'):
+        out['subject'] = message['subject']
+    if want('body'):
+        out['body'] = message['body']
+    if want('view_href'):
+        out['view_href'] = f"https://forums.example.test/t5/idea/idi-p/{message['id']}"
+    if want('post_time'):
+        out['post_time'] = message['post_time'].isoformat(timespec='milliseconds')
+    if want('author.login') or want('author.id'):
+        out['author'] = {'type': 'user'}
+        if want('author.login'):
+            out['author']['login'] = message['author_login']
+        if want('author.id'):
+            out['author']['id'] = message['author_id']
+    if want('kudos.sum(weight)'):
+        out['kudos'] = {'sum': {'weight': message['kudos']}}
+    if want('metrics.views'):
+        out['metrics'] = {'type': 'message_metrics', 'views': message['views']}
+    conv = {name.split('.', 1)[1] for name in wanted if name.startswith('conversation.')}
+    if conv or everything:
+        out['conversation'] = {'type': 'conversation'}
+        if everything or 'messages_count' in conv:
+            out['conversation']['messages_count'] = message['messages_count']
+        if everything or 'id' in conv:
+            out['conversation']['id'] = message['id']
+        if everything or 'solved' in conv:
+            out['conversation']['solved'] = False
+    if (want('status.key') or want('status.name')) and message.get('status_key'):
+        out['status'] = {'type': 'message_status'}
+        if want('status.key'):
+            out['status']['key'] = message['status_key']
+        if want('status.name'):
+            out['status']['name'] = message['status_name']
+    if want('parent.id') and message.get('parent'):
+        out['parent'] = {'type': 'message', 'id': message['parent']}
+    if want('board.id'):
+        out['board'] = {'type': 'board', 'id': message['board']}
+    if want('labels'):
+        # 0-2 labels per topic, derived from the id so every run agrees
+        seed = int(message['id']) if message['id'].isdigit() and not message.get('parent') else 0
+        names = [LABELS[(seed + k * 3) % len(LABELS)] for k in range(seed % 3)]
+        items = [{'type': 'label', 'id': name.lower().replace(' ', '_'), 'text': name} for name in names]
+        out['labels'] = {'type': 'labels', 'list_item_type': 'label', 'size': len(items), 'items': items}
+    return out
+
+
+def _encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({'o': offset}).encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))['o'])
+
+
+# =============================================================================
+# HTTP server
+# =============================================================================
+
+class StubConfig:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, max_page_size: int = 1000,
+                 rate_429: float = 0.0, retry_after: float = 1.0, gzip_responses: bool = True,
+                 rate_503: float = 0.0, kb_latency: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.max_page_size = max_page_size
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.gzip_responses = gzip_responses
+        self.rate_503 = rate_503
+        self.kb_latency = kb_latency  # extra seconds per KB of a successful response
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: "StubServer"
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients would wait ~40 ms on a delayed ACK for every response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+        pass
+
+    def do_GET(self):
+        started = time.perf_counter()
+        try:
+            self._handle()
+        finally:
+            with self.server.stats_lock:
+                self.server.latencies.append(time.perf_counter() - started)
+
+    def _handle(self):
+        server = self.server
+        config = server.config
+        with server.stats_lock:
+            server.requests += 1
+
+        if config.latency or config.jitter:
+            time.sleep(config.latency + random.random() * config.jitter)
+
+        if config.rate_429 and random.random() < config.rate_429:
+            with server.stats_lock:
+                server.throttled += 1
+            self._send(429, {'status': 'error', 'message': 'Too Many Requests'},
+                       {'Retry-After': str(max(1, math.ceil(config.retry_after)))})
+            return
+
+        if config.rate_503 and random.random() < config.rate_503:
+            with server.stats_lock:
+                server.failed += 1
+            self._send(503, {'status': 'error', 'message': 'Service Unavailable'})
+            return
+
+        parsed = urlparse(self.path)
+        try:
+            if parsed.path.rstrip('/').endswith('/api/2.0/search'):
+                query = parse_qs(parsed.query).get('q', [''])[0]
+                payload = server.search(query)
+            elif '/api/2.0/messages/' in parsed.path:
+                message_id = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+                message = server.corpus.by_id.get(message_id)
+                if not message:
+                    self._send(404, {'status': 'error', 'message': 'Not found'})
+                    return
+                payload = {'status': 'success', 'data': render_message(message, ['*'])}
+            else:
+                self._send(404, {'status': 'error', 'message': 'Unknown endpoint'})
+                return
+        except ValueError as e:
+            self._send(200, {'status': 'error', 'message': str(e), 'http_code': 400})
+            return
+        self._send(200, payload)
+
+    def _send(self, code: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8')
+        if code == 200 and self.server.config.kb_latency:
+            time.sleep(self.server.config.kb_latency * len(body) / 1000)
+        gz = self.server.config.gzip_responses and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gz:
+            body = gzip.compress(body, compresslevel=1)
+        with self.server.stats_lock:
+            self.server.bytes_sent += len(body)
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if gz:
+            self.send_header('Content-Encoding', 'gzip')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering LiQL queries from a ``StubCorpus``."""
+
+    daemon_threads = True
+
+    def __init__(self, corpus: StubCorpus, config: Optional[StubConfig] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), StubHandler)
+        self.corpus = corpus
+        self.config = config or StubConfig()
+        self.stats_lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.failed = 0
+        self.bytes_sent = 0
+        self.latencies: List[float] = []  # seconds per request, as served
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self) -> Dict[str, Any]:
+        """Return the request counters collected so far and start new ones."""
+        with self.stats_lock:
+            stats = {'requests': self.requests, 'throttled': self.throttled, 'failed': self.failed,
+                     'bytes_sent': self.bytes_sent, 'latencies': self.latencies}
+            self.requests = self.throttled = self.failed = self.bytes_sent = 0
+            self.latencies = []
+        return stats
+
+    def search(self, query: str) -> Dict[str, Any]:
+        q = parse_liql(query)
+        if q['collection'] == 'nodes':
+            return self._nodes(q)
+
+        rows = self.corpus.select(q['conditions'], q['order'])
+        if q['fields'] == ['count(*)']:
+            return {'status': 'success', 'data': {'count': len(rows)}}
+
+        limit = min(q['limit'], self.config.max_page_size)
+        offset = _decode_cursor(q['cursor'])
+        page = rows[offset:offset + limit]
+        data: Dict[str, Any] = {
+            'type': 'messages',
+            'list_item_type': 'message',
+            'size': len(page),
+            'items': [render_message(m, q['fields']) for m in page],
+        }
+        if offset + limit < len(rows):
+            data['next_cursor'] = _encode_cursor(offset + limit)
+        return {'status': 'success', 'message': '', 'http_code': 200, 'data': data}
+
+    def _nodes(self, q: Dict[str, Any]) -> Dict[str, Any]:
+        conditions = {f: v for f, _, v in q['conditions']}
+        items = []
+        if conditions.get('node_type') == 'category':
+            items.append({'type': 'node', 'id': 'category:stub-products', 'title': 'Stub Products',
+                          'node_type': 'category'})
+        else:
+            style = conditions.get('conversation_style', 'idea')
+            for board in self.corpus.boards:
+                board_style = 'idea' if 'idea' in board else 'forum'
+                if conditions.get('node_type') == 'board' or board_style == style:
+                    items.append({'type': 'node', 'id': f'board:{board}', 'title': board.replace('-', ' ').title(),
+                                  'conversation_style': board_style,
+                                  'parent': {'type': 'node', 'id': 'category:stub-products'}})
+        return {'status': 'success',
+                'data': {'type': 'nodes', 'list_item_type': 'node', 'size': len(items), 'items': items}}
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Khoros API stand-in')
+    parser.add_argument('--seed', nargs='*', default=[], help='CSV files to seed the corpus from (globs allowed)')
+    parser.add_argument('--size', type=int, default=4295, help='Number of topics to serve')
+    parser.add_argument('--boards', default=DEFAULT_BOARD, help='Comma-separated board ids')
+    parser.add_argument('--latency', type=float, default=0.0, help='Fixed latency per request (seconds)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency (seconds)')
+    parser.add_argument('--page-size', type=int, default=1000, help='Max items per page')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--rate-503', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--kb-latency', type=float, default=0.0,
+                        help='Extra latency per KB of response body (seconds), so big pages are slow')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    boards = [b.strip() for b in args.boards.split(',') if b.strip()]
+    paths = [p for pattern in args.seed for p in glob.glob(pattern)]
+    corpus = (StubCorpus.from_csv(paths, args.size, boards) if paths
+              else StubCorpus.synthetic(args.size, boards))
+    config = StubConfig(args.latency, args.jitter, args.page_size, args.rate_429, args.retry_after,
+                        rate_503=args.rate_503, kb_latency=args.kb_latency)
+    server = StubServer(corpus, config, args.host, args.port)
+    print(f"Serving {len(corpus.topics):,} topics on {server.base_url}/api/2.0 (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Resilient HTTP transport for the Khoros API clients.
+
+One ``Transport`` per client, shared by all of its threads:
+
+- a keep-alive connection pool sized to the client's concurrency
+- gzip/deflate response compression
+- retries with jittered exponential backoff on connection errors,
+  timeouts, 429 and 5xx, honoring ``Retry-After``; 429s also slow the
+  shared rate limiter
+- a circuit breaker: after several consecutive calls fail even with
+  retries, further calls fail immediately (``CircuitOpenError``) until a
+  cool-down has passed, so an outage stops a crawl instead of trickling
+  through it
+- an optional forum_budget ``Budget`` charged for every attempt, so a
+  crawl stops with ``BudgetExhausted`` at its deadline or request quota
+
+A call that cannot be completed raises ``TransportError`` (a
+``requests.RequestException``). Callers never get an empty page back in
+place of a failed one.
+
+Usage:
+    transport = Transport(limiter, metrics, pool_size=8)
+    response = transport.get(url, kind='search')
+    board = transport.view()  # same pool/limiter/breaker/budget, own requests_sent
+"""
+
+import copy
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from forum_budget import Budget
+from forum_metrics import RequestMetrics
+from forum_ratelimit import RateLimiter, parse_retry_after
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Gateway errors a smaller page may avoid; with retry_timeouts=False they (and read
+# timeouts) go straight back to the caller instead of being retried
+PAGE_TIMEOUT_STATUSES = frozenset({502, 504})
+DEFAULT_ATTEMPTS = 6  # first try + 5 retries
+DEFAULT_BACKOFF = 0.5  # seconds; doubled per retry, then jittered
+MAX_BACKOFF = 30.0
+FAILURE_THRESHOLD = 3  # consecutive failed calls that open the circuit
+RESET_AFTER = 60.0  # seconds the circuit stays open before a trial call
+
+
+class TransportError(requests.RequestException):
+    """A request still failed after every retry."""
+
+    def __init__(self, *args, reason: str = '', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reason = reason  # the last attempt's failure: an exception name or "HTTP <status>"
+
+
+class CircuitOpenError(TransportError):
+    """Calls are refused because recent calls kept failing."""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after ``failure_threshold`` consecutive failed calls;
+    open -> half-open after ``reset_after`` seconds, when one trial call is
+    let through; its success closes the circuit, its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_after: float = RESET_AFTER):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_call(self) -> bool:
+        """
+        Raise ``CircuitOpenError`` unless a call may be attempted now; True if
+        the call is the half-open trial (which must end in record_success,
+        record_failure or release).
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            remaining = self.opened_at + self.reset_after - time.monotonic()
+            if remaining > 0 or self._trial:
+                raise CircuitOpenError(
+                    f"Circuit open after {self.failures} consecutive failed calls "
+                    f"(last: {self.last_error}); not retrying for {max(remaining, 0):.0f}s")
+            self._trial = True  # half-open: this caller is the trial
+            return True
+
+    def release(self):
+        """End a call that neither succeeded nor failed (the caller retries it differently)."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF, cap: float = MAX_BACKOFF) -> float:
+    """"Full jitter" exponential backoff for retry ``attempt`` (1 = first retry)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class Transport:
+    """Pooled, retrying, circuit-breaking GETs for one API client."""
+
+    def __init__(self, limiter: RateLimiter, metrics: RequestMetrics, pool_size: int = 10,
+                 headers: Optional[Dict[str, str]] = None, attempts: int = DEFAULT_ATTEMPTS,
+                 backoff: float = DEFAULT_BACKOFF, timeout: float = 30.0,
+                 breaker: Optional[CircuitBreaker] = None, budget: Optional[Budget] = None):
+        """
+        Args:
+            limiter: Rate limiter every attempt goes through
+            metrics: Where requests, retries, waits and errors are recorded
+            pool_size: Keep-alive connections per host (match the concurrency)
+            headers: Extra session headers (User-Agent, Accept)
+            attempts: Tries per call, including the first
+            backoff: Base of the jittered exponential backoff, seconds
+            timeout: Connect/read timeout per attempt, seconds
+            breaker: Circuit breaker (one per transport by default)
+            budget: Deadline/request quota charged before every attempt (None = unlimited)
+        """
+        self.limiter = limiter
+        self.metrics = metrics
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.budget = budget
+        self.requests_sent = 0
+        self._counter_lock = threading.Lock()
+        self._parents: tuple = ()  # transports this one is a view of
+
+        self.session = requests.Session()
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate', **(headers or {})})
+        # Retries happen here, not in urllib3, so each one is paced, counted and logged
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max(1, pool_size), max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url: str, kind: str, retry_timeouts: bool = True) -> requests.Response:
+        """
+        GET ``url``; returns the first response that is not retryable
+        (2xx, or a 4xx other than 429 for the caller to handle).
+
+        With ``retry_timeouts=False`` a read timeout or a 502/504 raises
+        ``TransportError`` at once, without counting against the circuit
+        breaker - for listing pages the caller re-requests with a smaller LIMIT.
+        """
+        trial = self.breaker.before_call()
+        try:
+            return self._get(url, kind, retry_timeouts)
+        except BaseException:
+            # Whatever ended the call (page timeout, budget, an unexpected error),
+            # a half-open trial must not keep the circuit open for good
+            if trial:
+                self.breaker.release()
+            raise
+
+    def _get(self, url: str, kind: str, retry_timeouts: bool) -> requests.Response:
+        last_error = ''
+        for attempt in range(self.attempts):
+            if attempt:
+                self.metrics.observe_retry(kind)
+            if self.budget:
+                self.budget.charge()
+            self.metrics.observe_wait(kind, self.limiter.acquire())
+            for transport in (self,) + self._parents:
+                with transport._counter_lock:
+                    transport.requests_sent += 1
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException as e:
+                last_error = type(e).__name__
+                if not retry_timeouts and isinstance(e, requests.ReadTimeout):
+                    self._raise_page_timeout(url, kind, last_error)
+                if attempt + 1 < self.attempts:
+                    self._sleep(kind, backoff_delay(attempt + 1, self.backoff))
+                continue
+            self.metrics.observe_response(kind, response, time.perf_counter() - started)
+
+            if response.status_code not in RETRY_STATUSES:
+                self.limiter.reward()
+                self.breaker.record_success()
+                return response
+
+            last_error = f"HTTP {response.status_code}"
+            if not retry_timeouts and response.status_code in PAGE_TIMEOUT_STATUSES:
+                self._raise_page_timeout(url, kind, last_error)
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if response.status_code == 429:
+                # The limiter pauses every thread (and process) until Retry-After
+                self.limiter.penalize(retry_after)
+            elif attempt + 1 < self.attempts:
+                self._sleep(kind, max(retry_after or 0.0, backoff_delay(attempt + 1, self.backoff)))
+
+        self.breaker.record_failure(last_error)
+        endpoint = urlsplit(url)
+        raise TransportError(f"{kind} request to {endpoint.netloc}{endpoint.path} failed "
+                             f"after {self.attempts} attempts ({last_error})", reason=last_error)
+
+    def view(self) -> 'Transport':
+        """
+        This transport (same session, limiter, breaker and budget) with its own
+        ``requests_sent``; its requests also count toward this one's.
+        """
+        view = copy.copy(self)
+        view.requests_sent = 0
+        view._counter_lock = threading.Lock()
+        view._parents = (self,) + self._parents
+        return view
+
+    def _raise_page_timeout(self, url: str, kind: str, error: str):
+        endpoint = urlsplit(url)
+        raise TransportError(f"{kind} request to {endpoint.netloc}{endpoint.path} failed ({error}); "
+                             f"not retried at this page size", reason=error)
+
+    def _sleep(self, kind: str, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+            self.metrics.observe_wait(kind, seconds)
+
+    def close(self):
+        self.session.close()